@@ -0,0 +1,246 @@
+"""HTTP endpoints served by the Reflex backend next to the event websocket."""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import shutil
+import zipfile
+
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.render import filename, get_renderer, parse_request
+from app.render.jobs import JOBS_OUTPUT_DIR, JobQueue
+from app.render import pool
+from app.render.admission import BATCH
+from app.render.pool import POOL_WORKERS, render_async
+from app.states import sessions
+
+# Documents rendering or waiting to be written to the response at once
+BATCH_MAX_IN_FLIGHT = int(os.environ.get("RENDER_BATCH_MAX_IN_FLIGHT", "0")) or 2 * POOL_WORKERS
+BATCH_MAX_LINE_BYTES = 4 * 1024 * 1024
+# Readiness thresholds: renders waiting for a worker, free space for artifacts
+READY_MAX_WAITING = int(os.environ.get("RENDER_READY_MAX_WAITING", "0")) or POOL_WORKERS * 2
+READY_MIN_FREE_MB = int(os.environ.get("RENDER_READY_MIN_FREE_MB", "500"))
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable buffer that ``zipfile`` streams into and we drain per entry."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _BatchResponse(StreamingResponse):
+    """Streaming response whose body iterator also reads the request body.
+
+    The stock response listens for disconnects on ``receive`` while streaming,
+    which would steal body chunks from the NDJSON reader.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+async def _ndjson_lines(request: Request):
+    """Yield non-empty lines of the request body as they arrive."""
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+        if len(pending) > BATCH_MAX_LINE_BYTES:
+            raise ValueError("NDJSON line too long")
+    if pending.strip():
+        yield pending
+
+
+async def _render_line(index: int, line: bytes) -> tuple[int, str, bytes | None, str]:
+    try:
+        doc_type, fmt, data = parse_request(json.loads(line))
+        content = await render_async(doc_type, fmt, data, priority=BATCH)
+        return index, f"{index:05d}_{filename(doc_type, fmt, data)}", content, ""
+    except Exception as e:
+        logging.exception(f"Batch render error on line {index}: {e}")
+        return index, "", None, f"{index}: {e}"
+
+
+async def _stream_zip(request: Request):
+    slots = asyncio.Semaphore(BATCH_MAX_IN_FLIGHT)
+    results: asyncio.Queue = asyncio.Queue()
+    tasks: set[asyncio.Task] = set()
+
+    async def render_one(index: int, line: bytes):
+        results.put_nowait(await _render_line(index, line))
+
+    async def produce():
+        index = 0
+        try:
+            async for line in _ndjson_lines(request):
+                # A slot is only released once the result has been written out,
+                # so a slow client also throttles how much we read and render.
+                await slots.acquire()
+                index += 1
+                task = asyncio.create_task(render_one(index, line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except Exception as e:
+            logging.exception(f"Batch request error: {e}")
+            results.put_nowait((0, "", None, f"request: {e}"))
+        # Lines accepted before a read error still end up in the archive or in
+        # errors.txt, so they are waited for before the end is signalled
+        if tasks:
+            await asyncio.wait(set(tasks))
+        results.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    sink = _ZipSink()
+    errors = []
+    try:
+        # Entries are already compressed PDFs/XLSX, so store them as-is
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as zf:
+            while (result := await results.get()) is not None:
+                index, name, content, error = result
+                if content is not None:
+                    zf.writestr(name, content)
+                    yield sink.drain()
+                else:
+                    errors.append(error)
+                if index:
+                    slots.release()
+            if errors:
+                zf.writestr("errors.txt", "\n".join(errors))
+        yield sink.drain()
+    finally:
+        producer.cancel()
+        for task in list(tasks):
+            task.cancel()
+
+
+async def render_batch(request: Request) -> StreamingResponse:
+    """Render an NDJSON stream of documents into a streamed ZIP archive."""
+    return _BatchResponse(
+        _stream_zip(request),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="documentos.zip"'},
+    )
+
+
+_job_queue: JobQueue | None = None
+
+
+def _jobs() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
+
+
+async def submit_job(request: Request) -> JSONResponse:
+    """Queue one ``{"type", "format", "data"}`` document for the job workers."""
+    try:
+        doc_type, fmt, data = parse_request(await request.json())
+        # Bad data is rejected now rather than after every retry of the job
+        await run_in_threadpool(get_renderer(doc_type).normalize, data)
+    except (ValueError, TypeError, AttributeError) as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    job = await run_in_threadpool(_jobs().submit, doc_type, fmt, data)
+    return JSONResponse(job, status_code=202)
+
+
+async def job_status(request: Request) -> JSONResponse:
+    job = await run_in_threadpool(_jobs().status, request.path_params["job_id"])
+    if job is None:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    return JSONResponse(job)
+
+
+async def job_file(request: Request):
+    job = await run_in_threadpool(_jobs().status, request.path_params["job_id"])
+    if job is None or job["status"] != "done" or not Path(job["result_path"]).exists():
+        return JSONResponse({"error": "not ready"}, status_code=404)
+    path = Path(job["result_path"])
+    return FileResponse(path, filename=path.name)
+
+
+async def metrics(request: Request) -> JSONResponse:
+    return JSONResponse(
+        {
+            "render": {**pool.stats, "in_flight": len(pool._in_flight)},
+            "admission": pool.admission.snapshot(),
+            "workers": pool._pool.stats if pool._pool else {},
+            "breakers": {
+                doc_type: breaker.snapshot() for doc_type, breaker in pool.breakers.items()
+            },
+            "sessions": sessions.stats,
+        }
+    )
+
+
+async def healthz(request: Request) -> JSONResponse:
+    """Liveness: the backend process is up and serving requests."""
+    return JSONResponse({"status": "ok"})
+
+
+def _free_mb(path: str) -> float:
+    target = Path(path).resolve()
+    while not target.exists():
+        target = target.parent
+    return shutil.disk_usage(target).free / (1024 * 1024)
+
+
+async def readyz(request: Request) -> JSONResponse:
+    """Readiness: warm render pool, short render queue and room for artifacts."""
+    waiting = pool.admission.waiting
+    free_mb = await run_in_threadpool(_free_mb, JOBS_OUTPUT_DIR)
+    checks = {
+        "pool_warm": {"ok": pool.is_warm()},
+        "queue": {
+            "ok": waiting < READY_MAX_WAITING,
+            "waiting": waiting,
+            "running": pool.admission.running,
+            "max_waiting": READY_MAX_WAITING,
+        },
+        "disk": {
+            "ok": free_mb >= READY_MIN_FREE_MB,
+            "path": JOBS_OUTPUT_DIR,
+            "free_mb": round(free_mb),
+            "min_free_mb": READY_MIN_FREE_MB,
+        },
+    }
+    ready = all(check["ok"] for check in checks.values())
+    return JSONResponse({"ready": ready, "checks": checks}, status_code=200 if ready else 503)
+
+
+api = Starlette(
+    routes=[
+        Route("/api/render/batch", render_batch, methods=["POST"]),
+        Route("/api/jobs", submit_job, methods=["POST"]),
+        Route("/api/jobs/{job_id}", job_status, methods=["GET"]),
+        Route("/api/jobs/{job_id}/file", job_file, methods=["GET"]),
+        Route("/api/metrics", metrics, methods=["GET"]),
+        Route("/healthz", healthz, methods=["GET"]),
+        Route("/readyz", readyz, methods=["GET"]),
+    ]
+)
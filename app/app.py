@@ -1,4 +1,7 @@
 import reflex as rx
+from app.api import api
+from app.render.pool import lifespan as render_lifespan
+from app.states import sessions
 from app.pages.dashboard import dashboard
 from app.pages.statement import statement_page
 from app.pages.invoice import invoice_page
@@ -15,7 +18,10 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=api,
 )
+app.register_lifespan_task(render_lifespan)
+sessions.install(app)
 app.add_page(dashboard, route="/")
 app.add_page(statement_page, route="/statement")
 app.add_page(invoice_page, route="/invoice")
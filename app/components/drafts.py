@@ -0,0 +1,163 @@
+"""Optimistic line amounts for forms whose totals the server computes.
+
+The server recomputes a row's ``amount`` and the document summary on every
+edit, so without help the preview only catches up after a round-trip. A
+``LineDrafts`` keeps the numbers typed into a row's fields in the browser
+(its *drafts*, by row id and field) as soon as they are typed, and the
+amount and totals shown are worked out from the server's row and summary
+with the drafts laid over them. The math is not repeated here: the line
+amount and summary functions of app.render.totals, which the states use,
+are applied to the vars.
+
+The server stays authoritative: once it has processed a committed value,
+that field's draft is dropped if nothing newer was typed meanwhile, and the
+display falls back to what the server sent. A draft never touches the
+inputs themselves, only what is derived from them.
+"""
+
+import dataclasses
+from collections.abc import Callable
+
+import reflex as rx
+from reflex.event import EventChain
+from reflex.experimental.client_state import ClientStateVar
+from reflex.vars import VarData
+from reflex.vars.function import ArgsFunctionOperationBuilder, FunctionVar
+
+
+def _js(template: str, **vars) -> rx.Var:
+    """A JS expression with ``{name}`` placeholders filled in by ``vars``."""
+    vars = {name: rx.Var.create(var) for name, var in vars.items()}
+    return rx.Var(
+        _js_expr=template.format(**{name: str(var) for name, var in vars.items()}),
+        _var_data=VarData.merge(*(var._get_all_var_data() for var in vars.values())),
+    )
+
+
+class LineDrafts:
+    """Client-side drafts of a form's numeric row fields.
+
+    ``amount`` computes a row's line amount the way the state does, given
+    the row (a var of ``row_type``). ``blanks`` maps each drafted field to the
+    value an empty input stands for; its type comes from ``row_type``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        row_type: type,
+        amount: Callable[[rx.Var], rx.Var],
+        blanks: dict[str, float],
+    ):
+        self.drafts = ClientStateVar.create(f"{name}_drafts", default={})
+        self.amount_fn = ArgsFunctionOperationBuilder.create(
+            args_names=("r",), return_expr=amount(rx.Var("r").to(row_type))
+        )
+        types = {field.name: field.type for field in dataclasses.fields(row_type)}
+        self.numbers = {field: (types[field], blank) for field, blank in blanks.items()}
+        self.set_drafts = self.drafts.set_value().to(FunctionVar)
+
+    def _parse(self, field: str, raw: rx.Var) -> rx.Var:
+        kind, empty = self.numbers[field]
+        return _js(
+            "((v) => (v === '' ? {empty} : {cast}(Number(v))))({raw})",
+            empty=empty,
+            cast=rx.Var("Math.trunc" if kind is int else ""),
+            raw=raw,
+        )
+
+    def amount(self, row: rx.Var) -> rx.Var:
+        """The row's amount, with its drafts applied when it has any."""
+        return _js(
+            "((r, d = {drafts}[r.id]) => (d ? {amount}({{...r, ...d}}) : r.amount))({row})",
+            amount=self.amount_fn,
+            row=row,
+            drafts=self.drafts.value,
+        ).to(float)
+
+    def row(self, row: rx.Var) -> rx.Var:
+        """The row with its drafts and the resulting amount applied."""
+        return _js(
+            "((r, d = {drafts}[r.id]) =>"
+            " (d ? {{...r, ...d, amount: {amount}({{...r, ...d}})}} : r))({row})",
+            amount=self.amount_fn,
+            row=row,
+            drafts=self.drafts.value,
+        ).to(row._var_type)
+
+    def delta(self, rows: rx.Var, patches: rx.Var) -> rx.Var:
+        """How much the drafted rows among ``rows`` change the subtotal.
+
+        Drafted rows on another page are left to the server's figure.
+        """
+        return _js(
+            "Object.entries({drafts}).reduce((sum, [id, d]) => {{"
+            " const r = {patches}[id] ?? {rows}.find((row) => row.id === id);"
+            " return r ? sum + {amount}({{...r, ...d}}) - r.amount : sum;"
+            " }}, 0)",
+            drafts=self.drafts.value,
+            rows=rows,
+            patches=patches,
+            amount=self.amount_fn,
+        ).to(float)
+
+    def summary(
+        self, summary: rx.Var, summarize: Callable, rows: rx.Var, patches: rx.Var, *args
+    ) -> dict[str, rx.Var]:
+        """The server ``summary`` with the drafts among ``rows`` applied.
+
+        ``summarize`` is the function the state computes ``summary`` with,
+        called as ``summarize(subtotal, *args)``; what the drafts' change to
+        the subtotal adds to each figure is worked out with it too.
+        """
+        delta = self.delta(rows, patches)
+        drafted, undrafted = summarize(delta, *args), summarize(0, *args)
+        return {
+            key: (summary[key] + drafted[key] - undrafted[key]).to(float) for key in drafted
+        }
+
+    def on_input(self, row: rx.Var, field: str) -> rx.Var:
+        """Handler recording each keystroke in ``field`` as the row's draft."""
+        return ArgsFunctionOperationBuilder.create(
+            args_names=("_e",),
+            return_expr=self.set_drafts.call(
+                _js(
+                    "{{...{current}, [{id}]: {{...{current}[{id}], [{field}]: {value}}}}}",
+                    current=self.drafts.value,
+                    id=row.id,
+                    field=field,
+                    value=self._parse(field, rx.Var("_e.target.value")),
+                )
+            ),
+        ).to(FunctionVar, EventChain)
+
+    def on_commit(self, row: rx.Var, field: str, on_commit):
+        """Wrap ``on_commit`` to drop the field's draft once the server has it."""
+
+        def commit(value):
+            # The draft being committed is captured now and only dropped if
+            # nothing newer has been typed by the time the server is done
+            settle = _js(
+                "((id, v) => () => {{"
+                " const d = {current}[id];"
+                " if (!d || !Object.is(d[{field}], v)) return;"
+                " const {{ [{field}]: _, ...rest }} = d;"
+                " const {{ [id]: __, ...others }} = {current};"
+                " {set}(Object.keys(rest).length ? {{...others, [id]: rest}} : others);"
+                " }})({id}, {current}[{id}]?.[{field}])",
+                current=self.drafts.value,
+                field=field,
+                set=self.set_drafts,
+                id=row.id,
+            )
+            # Events run in order, so this waits for the server's update
+            return [on_commit(value), rx.call_function(settle)]
+
+        return commit
+
+    def bind(self, row: rx.Var, field: str, on_commit) -> dict:
+        """``field_input`` props drafting ``field`` of ``row`` as it is typed."""
+        return {
+            "on_commit": self.on_commit(row, field, on_commit),
+            "custom_attrs": {"onInput": self.on_input(row, field)},
+        }
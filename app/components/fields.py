@@ -0,0 +1,39 @@
+"""Form inputs that commit edits to the server in batches.
+
+Every document form builds its inputs with ``field_input``. Keystrokes are
+buffered in the browser and sent as a single event per field: in
+``"debounce"`` mode once typing pauses for ``FORM_DEBOUNCE_MS`` (or right
+away on blur or Enter), and in ``"blur"`` mode only when the field loses
+focus. The app-wide mode is read from ``FORM_COMMIT_MODE`` when the frontend
+is compiled; a single input can override it with ``mode``.
+"""
+
+import os
+
+import reflex as rx
+
+DEBOUNCE = "debounce"
+BLUR = "blur"
+
+COMMIT_MODE = os.environ.get("FORM_COMMIT_MODE", DEBOUNCE)
+DEBOUNCE_MS = int(os.environ.get("FORM_DEBOUNCE_MS", "400"))
+
+
+def field_input(
+    value,
+    on_commit: rx.event.EventType,
+    multiline: bool = False,
+    mode: str | None = None,
+    **props,
+) -> rx.Component:
+    """An input (or textarea when ``multiline``) that commits through ``on_commit``."""
+    element = rx.el.textarea if multiline else rx.el.input
+    if (mode or COMMIT_MODE) == BLUR:
+        return element(default_value=value, on_blur=on_commit, **props)
+    return rx.debounce_input(
+        element(value=value, on_change=on_commit, **props),
+        debounce_timeout=DEBOUNCE_MS,
+        force_notify_on_blur=True,
+        # Enter inserts a newline in a textarea rather than committing
+        force_notify_by_enter=not multiline,
+    )
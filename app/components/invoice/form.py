@@ -1,5 +1,18 @@
 import reflex as rx
-from app.states.invoice_state import InvoiceState, InvoiceItem
+from app.components.drafts import LineDrafts
+from app.components.fields import field_input
+from app.components.windowed import pager, windowed_list
+from app.render.totals import invoice_line_amount
+from app.states.invoice_state import ITEM_BLANKS, InvoiceState, InvoiceItem
+from app.states.rows import patched, unpack
+
+# Line amounts shown while typing, ahead of the server's (see InvoiceState._update_item)
+item_drafts = LineDrafts(
+    "invoice",
+    InvoiceItem,
+    amount=lambda r: invoice_line_amount(r.quantity, r.unit_price, r.discount),
+    blanks=ITEM_BLANKS,
+)
 
 
 def form_header(title: str, icon: str) -> rx.Component:
@@ -18,11 +31,11 @@ def input_group(
             label,
             class_name="block text-xs font-medium text-gray-500 mb-1 uppercase tracking-wide",
         ),
-        rx.el.input(
-            on_change=lambda v: InvoiceState.set_field(field_name, v),
+        field_input(
+            value,
+            lambda v: InvoiceState.set_field(field_name, v),
             type=type_,
             class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg focus:outline-none focus:ring-2 focus:ring-emerald-500/20 focus:border-emerald-500 transition-all text-sm",
-            default_value=value,
             placeholder=placeholder,
         ),
     )
@@ -39,10 +52,10 @@ def item_row(item: InvoiceItem, index: int) -> rx.Component:
             rx.el.label(
                 "Código", class_name="text-xs font-medium text-gray-500 mb-1"
             ),
-            rx.el.input(
-                on_change=lambda v: InvoiceState.update_item(index, "code", v),
+            field_input(
+                item.code,
+                lambda v: InvoiceState.update_item(index, "code", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm",
-                default_value=item.code,
                 placeholder="SKU-001",
             ),
         ),
@@ -50,45 +63,51 @@ def item_row(item: InvoiceItem, index: int) -> rx.Component:
             rx.el.label(
                 "Descripción", class_name="text-xs font-medium text-gray-500 mb-1"
             ),
-            rx.el.input(
-                on_change=lambda v: InvoiceState.update_item(index, "description", v),
+            field_input(
+                item.description,
+                lambda v: InvoiceState.update_item(index, "description", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm",
-                default_value=item.description,
             ),
             class_name="col-span-2 md:col-span-2 lg:col-span-2 xl:col-span-3",
         ),
         rx.el.div(
             rx.el.label("Cant.", class_name="text-xs font-medium text-gray-500 mb-1"),
-            rx.el.input(
+            field_input(
+                item.quantity.to_string(),
+                **item_drafts.bind(
+                    item, "quantity", lambda v: InvoiceState.update_item(index, "quantity", v)
+                ),
                 type="number",
-                on_change=lambda v: InvoiceState.update_item(index, "quantity", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm",
-                default_value=item.quantity.to_string(),
             ),
         ),
         rx.el.div(
             rx.el.label("Precio", class_name="text-xs font-medium text-gray-500 mb-1"),
-            rx.el.input(
+            field_input(
+                item.unit_price.to_string(),
+                **item_drafts.bind(
+                    item, "unit_price", lambda v: InvoiceState.update_item(index, "unit_price", v)
+                ),
                 type="number",
-                on_change=lambda v: InvoiceState.update_item(index, "unit_price", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm",
-                default_value=item.unit_price.to_string(),
             ),
         ),
         rx.el.div(
             rx.el.label("Desc.", class_name="text-xs font-medium text-gray-500 mb-1"),
-            rx.el.input(
+            field_input(
+                item.discount.to_string(),
+                **item_drafts.bind(
+                    item, "discount", lambda v: InvoiceState.update_item(index, "discount", v)
+                ),
                 type="number",
-                on_change=lambda v: InvoiceState.update_item(index, "discount", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm",
-                default_value=item.discount.to_string(),
                 step="0.01",
             ),
         ),
         rx.el.div(
             rx.el.label("Total", class_name="text-xs font-medium text-gray-500 mb-1"),
             rx.el.div(
-                f"${item.amount:,.2f}",
+                f"${item_drafts.amount(item):,.2f}",
                 class_name="px-3 py-2 bg-gray-100 border border-gray-200 rounded-lg text-sm text-right font-medium text-gray-700",
             ),
         ),
@@ -187,10 +206,11 @@ def invoice_form() -> rx.Component:
                     "Términos y Condiciones",
                     class_name="block text-xs font-medium text-gray-500 mb-1 uppercase tracking-wide",
                 ),
-                rx.el.textarea(
-                    on_change=lambda v: InvoiceState.set_field("terms_conditions", v),
+                field_input(
+                    InvoiceState.terms_conditions,
+                    lambda v: InvoiceState.set_field("terms_conditions", v),
+                    multiline=True,
                     class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg focus:outline-none focus:ring-2 focus:ring-emerald-500/20 focus:border-emerald-500 transition-all text-sm h-24 resize-none",
-                    default_value=InvoiceState.terms_conditions,
                     placeholder="Pago contra entrega. Validez 30 días. Los precios están expresados en bolívares.",
                 ),
                 class_name="mb-4",
@@ -200,10 +220,11 @@ def invoice_form() -> rx.Component:
                     "Notas Adicionales",
                     class_name="block text-xs font-medium text-gray-500 mb-1 uppercase tracking-wide",
                 ),
-                rx.el.textarea(
-                    on_change=lambda v: InvoiceState.set_field("notes", v),
+                field_input(
+                    InvoiceState.notes,
+                    lambda v: InvoiceState.set_field("notes", v),
+                    multiline=True,
                     class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg focus:outline-none focus:ring-2 focus:ring-emerald-500/20 focus:border-emerald-500 transition-all text-sm h-20 resize-none",
-                    default_value=InvoiceState.notes,
                     placeholder="Notas adicionales...",
                 ),
                 class_name="mb-4",
@@ -224,16 +245,24 @@ def invoice_form() -> rx.Component:
                 ),
                 class_name="flex justify-between items-center mb-4",
             ),
-            rx.el.div(
-                rx.foreach(
-                    InvoiceState.items,
-                    lambda item, idx: rx.box(
-                        item_row(item, idx),
-                        key=item.id,
+            windowed_list(
+                "invoice_form_rows",
+                unpack(InvoiceState.items, InvoiceItem),
+                lambda item, idx: rx.box(
+                    item_row(
+                        patched(item, InvoiceState.item_patches),
+                        InvoiceState.items_offset + idx,
                     ),
+                    key=item.id,
                 ),
+                row_height=100,
                 class_name="space-y-3",
             ),
+            pager(
+                InvoiceState.items_offset,
+                InvoiceState.item_count,
+                InvoiceState.page_items,
+            ),
             class_name="bg-white p-6 rounded-2xl shadow-sm border border-gray-200",
         ),
         class_name="space-y-6",
@@ -1,5 +1,9 @@
 import reflex as rx
+from app.components.invoice.form import item_drafts
+from app.components.windowed import windowed_table
+from app.render.totals import invoice_summary
 from app.states.invoice_state import InvoiceState, InvoiceItem
+from app.states.rows import patched, unpack
 
 
 def preview_item_row(item: InvoiceItem) -> rx.Component:
@@ -36,6 +40,14 @@ def preview_item_row(item: InvoiceItem) -> rx.Component:
 
 
 def invoice_preview() -> rx.Component:
+    # InvoiceState's summary, updated for the rows being typed into
+    summary = item_drafts.summary(
+        InvoiceState.summary,
+        invoice_summary,
+        unpack(InvoiceState.items, InvoiceItem),
+        InvoiceState.item_patches,
+        InvoiceState.tax_rate,
+    )
     return rx.el.div(
         rx.el.div(
             rx.el.div(
@@ -129,32 +141,35 @@ def invoice_preview() -> rx.Component:
                 ),
                 class_name="mb-12 bg-gray-50 p-6 rounded-xl border border-gray-100 inline-block min-w-[300px]",
             ),
-            rx.el.table(
-                rx.el.thead(
-                    rx.el.tr(
-                        rx.el.th(
-                            "DESCRIPCIÓN",
-                            class_name="text-left text-xs font-bold text-gray-400 pb-4 border-b border-gray-200",
-                        ),
-                        rx.el.th(
-                            "CANT.",
-                            class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-20",
-                        ),
-                        rx.el.th(
-                            "PRECIO",
-                            class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-24",
-                        ),
-                        rx.el.th(
-                            "DESC.",
-                            class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-20",
-                        ),
-                        rx.el.th(
-                            "TOTAL",
-                            class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-28",
-                        ),
-                    )
+            windowed_table(
+                "invoice_preview_rows",
+                unpack(InvoiceState.items, InvoiceItem),
+                lambda item, _: preview_item_row(
+                    item_drafts.row(patched(item, InvoiceState.item_patches))
+                ),
+                row_height=56,
+                header=rx.el.tr(
+                    rx.el.th(
+                        "DESCRIPCIÓN",
+                        class_name="text-left text-xs font-bold text-gray-400 pb-4 border-b border-gray-200",
+                    ),
+                    rx.el.th(
+                        "CANT.",
+                        class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-20",
+                    ),
+                    rx.el.th(
+                        "PRECIO",
+                        class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-24",
+                    ),
+                    rx.el.th(
+                        "DESC.",
+                        class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-20",
+                    ),
+                    rx.el.th(
+                        "TOTAL",
+                        class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-28",
+                    ),
                 ),
-                rx.el.tbody(rx.foreach(InvoiceState.items, preview_item_row)),
                 class_name="w-full mb-8",
             ),
             rx.el.div(
@@ -164,7 +179,7 @@ def invoice_preview() -> rx.Component:
                             "Subtotal", class_name="text-sm font-medium text-gray-500"
                         ),
                         rx.el.span(
-                            f"${InvoiceState.subtotal:.2f}",
+                            f"${summary['subtotal']:.2f}",
                             class_name="text-sm font-semibold text-gray-900",
                         ),
                         class_name="flex justify-between mb-2",
@@ -175,7 +190,7 @@ def invoice_preview() -> rx.Component:
                             class_name="text-sm font-medium text-gray-500",
                         ),
                         rx.el.span(
-                            f"${InvoiceState.tax_amount:.2f}",
+                            f"${summary['tax_amount']:.2f}",
                             class_name="text-sm font-semibold text-gray-900",
                         ),
                         class_name="flex justify-between mb-4 pb-4 border-b border-gray-100",
@@ -185,7 +200,7 @@ def invoice_preview() -> rx.Component:
                             "Total", class_name="text-lg font-bold text-gray-900"
                         ),
                         rx.el.span(
-                            f"${InvoiceState.total:.2f}",
+                            f"${summary['total']:.2f}",
                             class_name="text-lg font-bold text-emerald-600",
                         ),
                         class_name="flex justify-between",
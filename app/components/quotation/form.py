@@ -1,7 +1,20 @@
 """Quotation form component."""
 
 import reflex as rx
-from app.states.quotation_state import QuotationItem, QuotationState
+from app.components.drafts import LineDrafts
+from app.components.fields import field_input
+from app.components.windowed import pager, windowed_list
+from app.render.totals import quotation_line_amount
+from app.states.quotation_state import ITEM_BLANKS, QuotationItem, QuotationState
+from app.states.rows import patched, unpack
+
+# Line amounts shown while typing, ahead of the server's (see QuotationState._update_item)
+item_drafts = LineDrafts(
+    "quotation",
+    QuotationItem,
+    amount=lambda r: quotation_line_amount(r.quantity, r.unit_price, r.discount),
+    blanks=ITEM_BLANKS,
+)
 
 
 def form_header(title: str, icon: str) -> rx.Component:
@@ -28,12 +41,12 @@ def input_group(
             label_text,
             class_name="block text-xs font-medium text-gray-500 mb-1 uppercase tracking-wide",
         ),
-        rx.el.input(
-            on_change=lambda v: QuotationState.set_field(field_name, v),
+        field_input(
+            value,
+            lambda v: QuotationState.set_field(field_name, v),
             type=type_,
             required=required,
             class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500 transition-all text-sm",
-            default_value=value,
             placeholder=placeholder,
         ),
     )
@@ -54,10 +67,10 @@ def item_row(item: QuotationItem, index: int) -> rx.Component:
                 "Descripción*",
                 class_name="block text-xs font-medium text-gray-500 mb-1",
             ),
-            rx.el.input(
-                on_change=lambda v: QuotationState.update_item(index, "description", v),
+            field_input(
+                item.description,
+                lambda v: QuotationState.update_item(index, "description", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500",
-                default_value=item.description,
                 placeholder="Servicio de logística",
             ),
             class_name="col-span-2 md:col-span-2 lg:col-span-2 xl:col-span-3",
@@ -68,12 +81,14 @@ def item_row(item: QuotationItem, index: int) -> rx.Component:
                 "Cantidad",
                 class_name="block text-xs font-medium text-gray-500 mb-1",
             ),
-            rx.el.input(
+            field_input(
+                item.quantity.to_string(),
+                **item_drafts.bind(
+                    item, "quantity", lambda v: QuotationState.update_item(index, "quantity", v)
+                ),
                 type="number",
                 min="1",
-                on_change=lambda v: QuotationState.update_item(index, "quantity", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500",
-                default_value=item.quantity.to_string(),
             ),
         ),
         # Unit Price
@@ -82,13 +97,15 @@ def item_row(item: QuotationItem, index: int) -> rx.Component:
                 "Precio Unit.",
                 class_name="block text-xs font-medium text-gray-500 mb-1",
             ),
-            rx.el.input(
+            field_input(
+                item.unit_price.to_string(),
+                **item_drafts.bind(
+                    item, "unit_price", lambda v: QuotationState.update_item(index, "unit_price", v)
+                ),
                 type="number",
                 step="0.01",
                 min="0",
-                on_change=lambda v: QuotationState.update_item(index, "unit_price", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500",
-                default_value=item.unit_price.to_string(),
             ),
         ),
         # Discount
@@ -97,13 +114,15 @@ def item_row(item: QuotationItem, index: int) -> rx.Component:
                 "Descuento",
                 class_name="block text-xs font-medium text-gray-500 mb-1",
             ),
-            rx.el.input(
+            field_input(
+                item.discount.to_string(),
+                **item_drafts.bind(
+                    item, "discount", lambda v: QuotationState.update_item(index, "discount", v)
+                ),
                 type="number",
                 step="0.01",
                 min="0",
-                on_change=lambda v: QuotationState.update_item(index, "discount", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500",
-                default_value=item.discount.to_string(),
             ),
         ),
         # Total (Read-only)
@@ -112,7 +131,7 @@ def item_row(item: QuotationItem, index: int) -> rx.Component:
                 "Total", class_name="block text-xs font-medium text-gray-500 mb-1"
             ),
             rx.el.div(
-                f"${item.amount:.2f}",
+                f"${item_drafts.amount(item):.2f}",
                 class_name="px-3 py-2 bg-purple-50 border border-purple-200 rounded-lg text-sm text-right font-bold text-purple-700",
             ),
         ),
@@ -121,10 +140,10 @@ def item_row(item: QuotationItem, index: int) -> rx.Component:
             rx.el.label(
                 "Notas", class_name="block text-xs font-medium text-gray-500 mb-1"
             ),
-            rx.el.input(
-                on_change=lambda v: QuotationState.update_item(index, "notes", v),
+            field_input(
+                item.notes,
+                lambda v: QuotationState.update_item(index, "notes", v),
                 class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500",
-                default_value=item.notes,
                 placeholder="Nota opcional",
             ),
             class_name="col-span-2 md:col-span-2 lg:col-span-3 xl:col-span-4",
@@ -212,16 +231,24 @@ def quotation_form() -> rx.Component:
         # Line Items Section
         rx.el.div(
             form_header("Servicios / Productos", "package"),
-            rx.el.div(
-                rx.foreach(
-                    QuotationState.items,
-                    lambda item, idx: rx.box(
-                        item_row(item, idx),
-                        key=item.id,
+            windowed_list(
+                "quotation_form_rows",
+                unpack(QuotationState.items, QuotationItem),
+                lambda item, idx: rx.box(
+                    item_row(
+                        patched(item, QuotationState.item_patches),
+                        QuotationState.items_offset + idx,
                     ),
+                    key=item.id,
                 ),
+                row_height=150,
                 class_name="space-y-3 mb-4",
             ),
+            pager(
+                QuotationState.items_offset,
+                QuotationState.item_count,
+                QuotationState.page_items,
+            ),
             rx.el.button(
                 rx.icon("plus", class_name="w-4 h-4"),
                 "Agregar Item",
@@ -265,10 +292,11 @@ def quotation_form() -> rx.Component:
                     "Notas",
                     class_name="block text-xs font-medium text-gray-500 mb-1",
                 ),
-                rx.el.textarea(
-                    on_change=lambda v: QuotationState.set_field("notes", v),
+                field_input(
+                    QuotationState.notes,
+                    lambda v: QuotationState.set_field("notes", v),
+                    multiline=True,
                     class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500",
-                    default_value=QuotationState.notes,
                     placeholder="Notas adicionales para el cliente...",
                     rows=3,
                 ),
@@ -279,10 +307,11 @@ def quotation_form() -> rx.Component:
                     "Términos de Pago",
                     class_name="block text-xs font-medium text-gray-500 mb-1",
                 ),
-                rx.el.textarea(
-                    on_change=lambda v: QuotationState.set_field("payment_terms", v),
+                field_input(
+                    QuotationState.payment_terms,
+                    lambda v: QuotationState.set_field("payment_terms", v),
+                    multiline=True,
                     class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500",
-                    default_value=QuotationState.payment_terms,
                     placeholder="50% adelantado, 50% contra entrega...",
                     rows=2,
                 ),
@@ -293,12 +322,11 @@ def quotation_form() -> rx.Component:
                     "Términos y Condiciones",
                     class_name="block text-xs font-medium text-gray-500 mb-1",
                 ),
-                rx.el.textarea(
-                    on_change=lambda v: QuotationState.set_field(
-                        "terms_conditions", v
-                    ),
+                field_input(
+                    QuotationState.terms_conditions,
+                    lambda v: QuotationState.set_field("terms_conditions", v),
+                    multiline=True,
                     class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-purple-500/20 focus:border-purple-500",
-                    default_value=QuotationState.terms_conditions,
                     placeholder="Términos y condiciones generales...",
                     rows=2,
                 ),
@@ -1,7 +1,11 @@
 """Quotation preview component."""
 
 import reflex as rx
+from app.components.quotation.form import item_drafts
+from app.components.windowed import windowed_table
+from app.render.totals import quotation_summary
 from app.states.quotation_state import QuotationItem, QuotationState
+from app.states.rows import patched, unpack
 
 
 def preview_header() -> rx.Component:
@@ -142,45 +146,58 @@ def item_table_row(item: QuotationItem) -> rx.Component:
 
 def items_table() -> rx.Component:
     """Create the items table."""
-    return rx.el.table(
-        rx.el.thead(
-            rx.el.tr(
-                rx.el.th(
-                    "DESCRIPCIÓN",
-                    class_name="text-left text-xs font-bold text-gray-400 pb-4 border-b border-gray-200",
-                ),
-                rx.el.th(
-                    "CANT.",
-                    class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-20",
-                ),
-                rx.el.th(
-                    "PRECIO",
-                    class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-24",
-                ),
-                rx.el.th(
-                    "DESC.",
-                    class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-20",
-                ),
-                rx.el.th(
-                    "TOTAL",
-                    class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-28",
-                ),
-            )
+    return windowed_table(
+        "quotation_preview_rows",
+        unpack(QuotationState.items, QuotationItem),
+        lambda item, _: item_table_row(
+            item_drafts.row(patched(item, QuotationState.item_patches))
+        ),
+        row_height=56,
+        header=rx.el.tr(
+            rx.el.th(
+                "DESCRIPCIÓN",
+                class_name="text-left text-xs font-bold text-gray-400 pb-4 border-b border-gray-200",
+            ),
+            rx.el.th(
+                "CANT.",
+                class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-20",
+            ),
+            rx.el.th(
+                "PRECIO",
+                class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-24",
+            ),
+            rx.el.th(
+                "DESC.",
+                class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-20",
+            ),
+            rx.el.th(
+                "TOTAL",
+                class_name="text-right text-xs font-bold text-gray-400 pb-4 border-b border-gray-200 w-28",
+            ),
         ),
-        rx.el.tbody(rx.foreach(QuotationState.items, item_table_row)),
         class_name="w-full mb-8",
     )
 
 
 def totals_section() -> rx.Component:
     """Create the totals section."""
+    # QuotationState's summary, updated for the rows being typed into
+    summary = item_drafts.summary(
+        QuotationState.summary,
+        quotation_summary,
+        unpack(QuotationState.items, QuotationItem),
+        QuotationState.item_patches,
+        QuotationState.tax_rate,
+        QuotationState.shipping_cost,
+        QuotationState.discount_global,
+    )
     return rx.el.div(
         rx.el.div(
             # Subtotal
             rx.el.div(
                 rx.el.span("Subtotal", class_name="text-sm font-medium text-gray-500"),
                 rx.el.span(
-                    f"${QuotationState.subtotal:.2f}",
+                    f"${summary['subtotal']:.2f}",
                     class_name="text-sm font-semibold text-gray-900",
                 ),
                 class_name="flex justify-between mb-2",
@@ -208,7 +225,7 @@ def totals_section() -> rx.Component:
                         class_name="text-sm font-medium text-gray-500",
                     ),
                     rx.el.span(
-                        f"${QuotationState.tax_amount:.2f}",
+                        f"${summary['tax_amount']:.2f}",
                         class_name="text-sm font-semibold text-gray-900",
                     ),
                     class_name="flex justify-between mb-2",
@@ -230,7 +247,7 @@ def totals_section() -> rx.Component:
             rx.el.div(
                 rx.el.span("TOTAL", class_name="text-lg font-bold text-gray-900"),
                 rx.el.span(
-                    f"${QuotationState.total:.2f}",
+                    f"${summary['total']:.2f}",
                     class_name="text-lg font-bold text-purple-600",
                 ),
                 class_name="flex justify-between",
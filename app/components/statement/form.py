@@ -1,5 +1,8 @@
 import reflex as rx
+from app.components.fields import field_input
+from app.components.windowed import pager, windowed_list
 from app.states.statement_state import StatementState, Transaction
+from app.states.rows import patched, unpack
 
 
 def form_section_header(title: str, icon: str) -> rx.Component:
@@ -22,12 +25,12 @@ def input_field(
             label,
             class_name="block text-xs font-medium text-gray-500 mb-1 uppercase tracking-wide",
         ),
-        rx.el.input(
-            on_change=on_change,
+        field_input(
+            value,
+            on_change,
             type=type_,
             placeholder=placeholder,
             class_name="w-full px-3 py-2 bg-gray-50 border border-gray-200 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500/20 focus:border-blue-500 transition-all text-sm",
-            default_value=value,
         ),
         class_name="flex-1",
     )
@@ -194,16 +197,24 @@ def statement_form() -> rx.Component:
                 ),
                 class_name="flex items-center justify-between mb-4",
             ),
-            rx.el.div(
-                rx.foreach(
-                    StatementState.transactions,
-                    lambda t, i: rx.box(
-                        transaction_row(t, i),
-                        key=t.id,
+            windowed_list(
+                "statement_form_rows",
+                unpack(StatementState.transactions, Transaction),
+                lambda t, i: rx.box(
+                    transaction_row(
+                        patched(t, StatementState.transaction_patches),
+                        StatementState.transactions_offset + i,
                     ),
+                    key=t.id,
                 ),
+                row_height=110,
                 class_name="space-y-3",
             ),
+            pager(
+                StatementState.transactions_offset,
+                StatementState.transaction_count,
+                StatementState.page_transactions,
+            ),
             class_name="bg-white p-6 rounded-2xl shadow-sm border border-gray-200",
         ),
         class_name="space-y-6",
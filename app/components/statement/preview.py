@@ -1,5 +1,7 @@
 import reflex as rx
+from app.components.windowed import windowed_table
 from app.states.statement_state import StatementState, Transaction
+from app.states.rows import patched, unpack
 
 
 def preview_header() -> rx.Component:
@@ -187,26 +189,26 @@ def aging_table() -> rx.Component:
                     ),
                     rx.el.td(
                         rx.text(
-                            StatementState.aging_buckets["current"],
+                            StatementState.summary["current"],
                             format_string=",.2f",
                         ),
                         class_name="p-2 text-right text-[10px] border border-gray-300",
                     ),
                     rx.el.td(
                         rx.text(
-                            StatementState.aging_buckets["30"], format_string=",.2f"
+                            StatementState.summary["30"], format_string=",.2f"
                         ),
                         class_name="p-2 text-right text-[10px] border border-gray-300",
                     ),
                     rx.el.td(
                         rx.text(
-                            StatementState.aging_buckets["60"], format_string=",.2f"
+                            StatementState.summary["60"], format_string=",.2f"
                         ),
                         class_name="p-2 text-right text-[10px] border border-gray-300",
                     ),
                     rx.el.td(
                         rx.text(
-                            StatementState.aging_buckets["90"], format_string=",.2f"
+                            StatementState.summary["90"], format_string=",.2f"
                         ),
                         class_name="p-2 text-right text-[10px] border border-gray-300",
                     ),
@@ -217,7 +219,7 @@ def aging_table() -> rx.Component:
         rx.el.div(
             rx.el.span("TOTAL DEBIDO USD...", class_name="font-bold text-xs mr-2"),
             rx.el.span(
-                rx.text(StatementState.total_due, format_string=",.2f"),
+                rx.text(StatementState.summary["total_due"], format_string=",.2f"),
                 class_name="font-bold text-sm",
             ),
             class_name="flex justify-end items-center border-t-2 border-black pt-2",
@@ -235,11 +237,14 @@ def statement_preview() -> rx.Component:
                 f"A CONTINUACION LE MOSTRAMOS UNA LISTA DE NOTAS DE ENTREGA PENDIENTES DE PAGO A {StatementState.statement_date}",
                 class_name="text-xs font-bold mb-4",
             ),
-            rx.el.table(
-                rx.el.thead(transaction_table_header()),
-                rx.el.tbody(
-                    rx.foreach(StatementState.transactions, transaction_table_row)
+            windowed_table(
+                "statement_preview_rows",
+                unpack(StatementState.transactions, Transaction),
+                lambda t, _: transaction_table_row(
+                    patched(t, StatementState.transaction_patches)
                 ),
+                row_height=33,
+                header=transaction_table_header(),
                 class_name="w-full border-collapse mb-6",
             ),
             aging_table(),
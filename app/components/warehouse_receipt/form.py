@@ -1,5 +1,8 @@
 import reflex as rx
+from app.components.fields import field_input
+from app.components.windowed import pager, windowed_list
 from app.states.warehouse_receipt_state import WarehouseReceiptState, PackageDimension
+from app.states.rows import patched, unpack
 
 
 def form_header(title: str, icon: str) -> rx.Component:
@@ -18,11 +21,11 @@ def input_group(
             label,
             class_name="block text-xs font-medium text-gray-600 mb-1.5 uppercase tracking-wide font-semibold",
         ),
-        rx.el.input(
-            on_change=lambda v: WarehouseReceiptState.set_field(field_name, v),
+        field_input(
+            value,
+            lambda v: WarehouseReceiptState.set_field(field_name, v),
             type=type_,
             class_name="w-full px-4 py-3 bg-white border border-gray-300 rounded-xl focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-orange-500 transition-all duration-200 text-sm placeholder-gray-400 shadow-sm hover:shadow-md hover:border-gray-400",
-            default_value=value,
             placeholder=placeholder,
         ),
     )
@@ -39,61 +42,51 @@ def dimension_row(dimension: PackageDimension, index: int) -> rx.Component:
             rx.el.label(
                 "Bultos", class_name="text-xs font-medium text-gray-600 mb-1.5 font-semibold"
             ),
-            rx.el.input(
+            field_input(
+                dimension.bultos.to_string(),
+                lambda v: WarehouseReceiptState.update_dimension(index, "bultos", v),
                 type="number",
-                on_change=lambda v: WarehouseReceiptState.update_dimension(
-                    index, "bultos", v
-                ),
                 class_name="w-full px-3 py-2.5 bg-white border border-gray-300 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-orange-500 transition-all shadow-sm hover:shadow-md",
-                default_value=dimension.bultos.to_string(),
             ),
         ),
         rx.el.div(
             rx.el.label("Largo", class_name="text-xs font-medium text-gray-600 mb-1.5 font-semibold"),
-            rx.el.input(
+            field_input(
+                dimension.largo.to_string(),
+                lambda v: WarehouseReceiptState.update_dimension(index, "largo", v),
                 type="number",
                 step="0.1",
-                on_change=lambda v: WarehouseReceiptState.update_dimension(
-                    index, "largo", v
-                ),
                 class_name="w-full px-3 py-2.5 bg-white border border-gray-300 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-orange-500 transition-all shadow-sm hover:shadow-md",
-                default_value=dimension.largo.to_string(),
             ),
         ),
         rx.el.div(
             rx.el.label("Ancho", class_name="text-xs font-medium text-gray-600 mb-1.5 font-semibold"),
-            rx.el.input(
+            field_input(
+                dimension.ancho.to_string(),
+                lambda v: WarehouseReceiptState.update_dimension(index, "ancho", v),
                 type="number",
                 step="0.1",
-                on_change=lambda v: WarehouseReceiptState.update_dimension(
-                    index, "ancho", v
-                ),
                 class_name="w-full px-3 py-2.5 bg-white border border-gray-300 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-orange-500 transition-all shadow-sm hover:shadow-md",
-                default_value=dimension.ancho.to_string(),
             ),
         ),
         rx.el.div(
             rx.el.label("Alto", class_name="text-xs font-medium text-gray-600 mb-1.5 font-semibold"),
-            rx.el.input(
+            field_input(
+                dimension.alto.to_string(),
+                lambda v: WarehouseReceiptState.update_dimension(index, "alto", v),
                 type="number",
                 step="0.1",
-                on_change=lambda v: WarehouseReceiptState.update_dimension(
-                    index, "alto", v
-                ),
                 class_name="w-full px-3 py-2.5 bg-white border border-gray-300 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-orange-500 transition-all shadow-sm hover:shadow-md",
-                default_value=dimension.alto.to_string(),
             ),
         ),
         rx.el.div(
             rx.el.label("Pounds", class_name="text-xs font-medium text-gray-600 mb-1.5 font-semibold"),
-            rx.el.input(
+            field_input(
+                dimension.pounds.to_string(),
+                lambda v: WarehouseReceiptState.update_dimension(index, "pounds", v),
                 type="number",
                 step="0.1",
-                on_change=lambda v: WarehouseReceiptState.update_dimension(
-                    index, "pounds", v
-                ),
                 class_name="w-full px-3 py-2.5 bg-white border border-gray-300 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-orange-500 transition-all shadow-sm hover:shadow-md",
-                default_value=dimension.pounds.to_string(),
             ),
         ),
         rx.el.div(
@@ -107,26 +100,22 @@ def dimension_row(dimension: PackageDimension, index: int) -> rx.Component:
         ),
         rx.el.div(
             rx.el.label("PT", class_name="text-xs font-medium text-gray-600 mb-1.5 font-semibold"),
-            rx.el.input(
+            field_input(
+                dimension.pt.to_string(),
+                lambda v: WarehouseReceiptState.update_dimension(index, "pt", v),
                 type="number",
                 step="0.1",
-                on_change=lambda v: WarehouseReceiptState.update_dimension(
-                    index, "pt", v
-                ),
                 class_name="w-full px-3 py-2.5 bg-white border border-gray-300 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-orange-500 transition-all shadow-sm hover:shadow-md",
-                default_value=dimension.pt.to_string(),
             ),
         ),
         rx.el.div(
             rx.el.label(
                 "Referencia", class_name="text-xs font-medium text-gray-600 mb-1.5 font-semibold"
             ),
-            rx.el.input(
-                on_change=lambda v: WarehouseReceiptState.update_dimension(
-                    index, "referencia", v
-                ),
+            field_input(
+                dimension.referencia,
+                lambda v: WarehouseReceiptState.update_dimension(index, "referencia", v),
                 class_name="w-full px-3 py-2.5 bg-white border border-gray-300 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-orange-500 transition-all shadow-sm hover:shadow-md",
-                default_value=dimension.referencia,
             ),
         ),
         class_name="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-4 xl:grid-cols-5 gap-4 items-start p-6 bg-white border border-gray-200 rounded-xl shadow-sm hover:shadow-lg transition-all duration-200",
@@ -210,16 +199,24 @@ def warehouse_receipt_form() -> rx.Component:
         rx.el.div(
             # Dimensions table section
             form_header("Dimensiones de Paquetes", "box"),
-            rx.el.div(
-                rx.foreach(
-                    WarehouseReceiptState.dimensions,
-                    lambda dim, idx: rx.box(
-                        dimension_row(dim, idx),
-                        key=dim.id,
+            windowed_list(
+                "warehouse_receipt_form_rows",
+                unpack(WarehouseReceiptState.dimensions, PackageDimension),
+                lambda dim, idx: rx.box(
+                    dimension_row(
+                        patched(dim, WarehouseReceiptState.dimension_patches),
+                        WarehouseReceiptState.dimensions_offset + idx,
                     ),
+                    key=dim.id,
                 ),
+                row_height=100,
                 class_name="space-y-3 mb-4",
             ),
+            pager(
+                WarehouseReceiptState.dimensions_offset,
+                WarehouseReceiptState.dimension_count,
+                WarehouseReceiptState.page_dimensions,
+            ),
             rx.el.button(
                 rx.icon("plus", class_name="w-4 h-4"),
                 "Agregar Dimensión",
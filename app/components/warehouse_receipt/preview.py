@@ -1,5 +1,7 @@
 import reflex as rx
+from app.components.windowed import windowed_table
 from app.states.warehouse_receipt_state import WarehouseReceiptState, PackageDimension
+from app.states.rows import patched, unpack
 
 
 def preview_header() -> rx.Component:
@@ -45,7 +47,7 @@ def summary_box() -> rx.Component:
                 class_name="text-[10px] font-bold text-gray-500 uppercase mb-1",
             ),
             rx.el.div(
-                WarehouseReceiptState.total_bultos.to_string(),
+                WarehouseReceiptState.summary["total_bultos"].to_string(),
                 class_name="text-base font-bold text-gray-900",
             ),
             class_name="p-3 bg-orange-50 rounded-lg border border-orange-200 text-center",
@@ -57,7 +59,7 @@ def summary_box() -> rx.Component:
             ),
             rx.el.div(
                 rx.text(
-                    WarehouseReceiptState.calculated_peso_bruto, format_string=",.2f"
+                    WarehouseReceiptState.summary["calculated_peso_bruto"], format_string=",.2f"
                 ),
                 " pound(s)",
                 class_name="text-base font-bold text-gray-900",
@@ -70,7 +72,7 @@ def summary_box() -> rx.Component:
                 class_name="text-[10px] font-bold text-gray-500 uppercase mb-1",
             ),
             rx.el.div(
-                rx.text(WarehouseReceiptState.calculated_volumen, format_string=",.3f"),
+                rx.text(WarehouseReceiptState.summary["calculated_volumen"], format_string=",.3f"),
                 " cubic feet",
                 class_name="text-base font-bold text-gray-900",
             ),
@@ -268,48 +270,49 @@ def dimensions_table() -> rx.Component:
             "Dimensiones de Paquetes",
             class_name="text-sm font-bold text-gray-700 mb-2",
         ),
-        rx.el.table(
-            rx.el.thead(
-                rx.el.tr(
-                    rx.el.th(
-                        "Bultos",
-                        class_name="text-left text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
-                    ),
-                    rx.el.th(
-                        "Largo",
-                        class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
-                    ),
-                    rx.el.th(
-                        "Ancho",
-                        class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
-                    ),
-                    rx.el.th(
-                        "Alto",
-                        class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
-                    ),
-                    rx.el.th(
-                        "Pounds",
-                        class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
-                    ),
-                    rx.el.th(
-                        "Cubic Feet",
-                        class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
-                    ),
-                    rx.el.th(
-                        "PT",
-                        class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
-                    ),
-                    rx.el.th(
-                        "Referencia",
-                        class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
-                    ),
-                )
+        windowed_table(
+            "warehouse_receipt_preview_rows",
+            unpack(WarehouseReceiptState.dimensions, PackageDimension),
+            lambda dim, _: rx.fragment(
+                dimension_table_row(
+                    patched(dim, WarehouseReceiptState.dimension_patches)
+                ),
+                key=dim.id,
             ),
-            rx.el.tbody(
-                rx.foreach(
-                    WarehouseReceiptState.dimensions,
-                    lambda dim: rx.fragment(dimension_table_row(dim), key=dim.id),
-                )
+            row_height=37,
+            header=rx.el.tr(
+                rx.el.th(
+                    "Bultos",
+                    class_name="text-left text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
+                ),
+                rx.el.th(
+                    "Largo",
+                    class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
+                ),
+                rx.el.th(
+                    "Ancho",
+                    class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
+                ),
+                rx.el.th(
+                    "Alto",
+                    class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
+                ),
+                rx.el.th(
+                    "Pounds",
+                    class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
+                ),
+                rx.el.th(
+                    "Cubic Feet",
+                    class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
+                ),
+                rx.el.th(
+                    "PT",
+                    class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
+                ),
+                rx.el.th(
+                    "Referencia",
+                    class_name="text-center text-xs font-bold text-gray-600 pb-2 px-3 border-b border-gray-300",
+                ),
             ),
             class_name="w-full border-collapse mb-6",
         ),
@@ -0,0 +1,133 @@
+"""Windowed rendering of long row lists.
+
+``windowed_list`` and ``windowed_table`` mount only the rows scrolled into
+view, plus ``OVERSCAN`` rows on either side, inside a scroll container.
+Spacers stand in for the rows above and below, so a 3,000-row statement
+mounts a few dozen rows instead of all of them. The first visible row is
+tracked in the browser, so scrolling never reaches the server.
+
+Rows are assumed to be about ``row_height`` pixels tall. The estimate only
+sizes the spacers, so taller rows just make the scrollbar less exact.
+
+``pager`` steps through lists the server sends one page at a time.
+"""
+
+from typing import Callable
+
+import reflex as rx
+from reflex.event import EventChain
+from reflex.experimental.client_state import ClientStateVar
+from reflex.vars.function import ArgsFunctionOperationBuilder, FunctionVar
+
+from app.states.rows import PAGE_SIZE
+
+# Rows mounted beyond the visible ones on each side
+OVERSCAN = 10
+
+RowRenderer = Callable[[rx.Var, rx.Var], rx.Component]
+
+
+def _window(
+    name: str,
+    rows: rx.Var,
+    render_fn: RowRenderer,
+    row_height: int,
+    visible: int,
+    spacer: Callable[..., rx.Component],
+) -> tuple[list[rx.Component], rx.Var]:
+    first = ClientStateVar.create(f"{name}_first_row", default=0)
+    start = rx.cond(first.value > OVERSCAN, first.value - OVERSCAN, 0).to(int)
+    count = visible + 2 * OVERSCAN
+    below = rows.length() - start - count
+    below = rx.cond(below > 0, below, 0).to(int)
+    children = [
+        spacer(style={"height": f"{start * row_height}px"}),
+        # The index passed on is the row's position in the full list
+        rx.foreach(rows[start : start + count], lambda row, i: render_fn(row, start + i)),
+        spacer(style={"height": f"{below * row_height}px"}),
+    ]
+    # Record the first visible row; React skips re-rendering while it stays put
+    on_scroll = ArgsFunctionOperationBuilder.create(
+        args_names=("_e",),
+        return_expr=first.set_value()
+        .to(FunctionVar)
+        .call(rx.Var(f"Math.floor(_e.target.scrollTop / {row_height})")),
+    ).to(FunctionVar, EventChain)
+    return children, on_scroll
+
+
+def windowed_list(
+    name: str,
+    rows: rx.Var,
+    render_fn: RowRenderer,
+    row_height: int,
+    visible: int = 12,
+    class_name: str = "",
+) -> rx.Component:
+    """Scrollable list rendering ``render_fn(row, index)`` for the visible rows.
+
+    ``name`` must be unique per list on the page.
+    """
+    children, on_scroll = _window(name, rows, render_fn, row_height, visible, rx.el.div)
+    return rx.el.div(
+        *children,
+        on_scroll=on_scroll,
+        class_name=f"max-h-[70vh] overflow-y-auto {class_name}",
+    )
+
+
+def windowed_table(
+    name: str,
+    rows: rx.Var,
+    render_fn: RowRenderer,
+    row_height: int,
+    header: rx.Component,
+    visible: int = 40,
+    class_name: str = "",
+) -> rx.Component:
+    """Scrollable table with a sticky ``header`` row and windowed body rows."""
+    children, on_scroll = _window(name, rows, render_fn, row_height, visible, rx.el.tr)
+    return rx.el.div(
+        rx.el.table(
+            rx.el.thead(header, class_name="sticky top-0 bg-white"),
+            rx.el.tbody(*children),
+            class_name=class_name,
+        ),
+        on_scroll=on_scroll,
+        class_name="max-h-[70vh] overflow-y-auto",
+    )
+
+
+def pager(
+    offset: rx.Var, count: rx.Var, on_page: Callable[[int], rx.event.EventType]
+) -> rx.Component:
+    """Previous/next controls for a list paged on the server (see app.states.rows).
+
+    Hidden while every row fits on one page.
+    """
+    last = rx.cond(offset + PAGE_SIZE < count, offset + PAGE_SIZE, count)
+    button_class = "p-1.5 rounded-lg text-gray-500 hover:bg-gray-100 disabled:opacity-40 disabled:hover:bg-transparent transition-colors"
+    return rx.cond(
+        count > PAGE_SIZE,
+        rx.el.div(
+            rx.el.button(
+                rx.icon("chevron-left", class_name="w-4 h-4"),
+                on_click=on_page(-1),
+                disabled=offset == 0,
+                class_name=button_class,
+                title="Página anterior",
+            ),
+            rx.el.span(
+                f"Filas {offset + 1}–{last} de {count}",
+                class_name="text-sm text-gray-500",
+            ),
+            rx.el.button(
+                rx.icon("chevron-right", class_name="w-4 h-4"),
+                on_click=on_page(1),
+                disabled=offset + PAGE_SIZE >= count,
+                class_name=button_class,
+                title="Página siguiente",
+            ),
+            class_name="flex items-center justify-end gap-2 mt-4",
+        ),
+    )
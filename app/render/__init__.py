@@ -0,0 +1,92 @@
+"""Document renderers shared by the web states, the batch API and workers.
+
+Each document type lives in its own module exposing ``normalize``,
+``build_pdf`` and ``build_excel``. Payloads are plain dicts using the same
+field names as the matching Reflex state, so this package only depends on
+ReportLab and openpyxl and never imports Reflex. The builders import those
+libraries themselves, so importing a renderer for its field defaults (as the
+states do) costs nothing until a document is actually rendered.
+"""
+
+import hashlib
+import importlib
+import json
+import uuid
+from pathlib import Path
+
+# Document type -> (filename prefix, payload field used in the filename)
+DOCUMENT_TYPES = {
+    "statement": ("Statement", "account_number"),
+    "invoice": ("NotaDeEntrega", "invoice_number"),
+    "quotation": ("Cotizacion", "quote_number"),
+    "warehouse_receipt": ("ReciboAlmacen", "receipt_number"),
+}
+
+# Output format -> builder function name in the document module
+FORMATS = {
+    "pdf": "build_pdf",
+    "xlsx": "build_excel",
+}
+
+ASSET_DIRS = (Path(".web/public"), Path(__file__).resolve().parents[2] / "assets")
+
+
+def get_renderer(doc_type: str):
+    """Import the renderer module for a document type on first use."""
+    if doc_type not in DOCUMENT_TYPES:
+        raise ValueError(f"Unknown document type: {doc_type}")
+    return importlib.import_module(f"{__name__}.{doc_type}")
+
+
+def parse_request(payload: dict) -> tuple[str, str, dict]:
+    """Validate a ``{"type", "format", "data"}`` document request."""
+    doc_type = payload.get("type")
+    fmt = payload.get("format", "pdf")
+    if doc_type not in DOCUMENT_TYPES:
+        raise ValueError(f"Unknown document type: {doc_type}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    data = payload.get("data") or {}
+    if not isinstance(data, dict):
+        raise ValueError("Document data must be a JSON object")
+    return doc_type, fmt, data
+
+
+def render(doc_type: str, fmt: str, data: dict) -> bytes:
+    """Render a document payload to PDF or XLSX bytes."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    module = get_renderer(doc_type)
+    return getattr(module, FORMATS[fmt])(module.normalize(data))
+
+
+def idempotency_key(doc_type: str, fmt: str, data: dict) -> str:
+    """Stable hash of a document request; identical payloads share one render."""
+    canonical = json.dumps(
+        {"type": doc_type, "format": fmt, "data": data},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def filename(doc_type: str, fmt: str, data: dict) -> str:
+    prefix, key = DOCUMENT_TYPES[doc_type]
+    return f"{prefix}_{data.get(key, '')}_{uuid.uuid4().hex[:6]}.{fmt}"
+
+
+def asset_path(url: str) -> Path | None:
+    """Resolve a public asset URL (e.g. ``/nosglobal-logo.png``) on disk.
+
+    The compiled ``.web/public`` copy is preferred; the source ``assets``
+    folder is used when rendering outside a built Reflex app.
+    """
+    if not url:
+        return None
+    for base in ASSET_DIRS:
+        path = base / url.lstrip("/")
+        if path.exists():
+            return path
+    return None
@@ -0,0 +1,5 @@
+import sys
+
+from app.render.cli import main
+
+sys.exit(main())
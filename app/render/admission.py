@@ -0,0 +1,100 @@
+"""Admission control for renders on the shared pool.
+
+At most ``max_running`` renders are handed to the pool at once; everything
+else waits in a priority queue where interactive exports are served before
+batch work. Interactive requests are rejected immediately with
+``Overloaded`` when their queue is full or the session already has
+``max_per_session`` renders pending, so a burst degrades into a quick
+"retry shortly" instead of slowing every user down. Batch requests are
+never rejected: each batch request already bounds its own in-flight renders
+and simply waits behind interactive work.
+"""
+
+import asyncio
+import heapq
+import itertools
+from collections import Counter
+
+INTERACTIVE = 0
+BATCH = 1
+
+
+class Overloaded(Exception):
+    """Raised when a render is rejected because the server is saturated."""
+
+    def __init__(self):
+        super().__init__("Servidor ocupado, intente de nuevo en unos segundos.")
+
+
+class Admission:
+    def __init__(self, max_running: int, max_queue: int, max_per_session: int):
+        self.max_running = max_running
+        self.max_queue = max_queue
+        self.max_per_session = max_per_session
+        self.running = 0
+        self._waiting: list[tuple[int, int, asyncio.Future]] = []
+        # Queued interactive turns, and queue entries whose turn was given up
+        self._interactive_waiting: set[asyncio.Future] = set()
+        self._abandoned = 0
+        self._order = itertools.count()
+        self._sessions: Counter[str] = Counter()
+        self.stats = {"admitted": 0, "rejected": 0}
+
+    def reserve(self, session: str | None = None, priority: int = INTERACTIVE) -> asyncio.Future:
+        """Reserve a render slot and return a future that resolves when it is granted.
+
+        Raises ``Overloaded`` right away instead of queueing when an
+        interactive request would exceed the queue or per-session limit.
+        """
+        if priority == INTERACTIVE:
+            if session is not None and self._sessions[session] >= self.max_per_session:
+                self.stats["rejected"] += 1
+                raise Overloaded()
+            if (
+                self.running >= self.max_running
+                and len(self._interactive_waiting) >= self.max_queue
+            ):
+                self.stats["rejected"] += 1
+                raise Overloaded()
+        if session is not None:
+            self._sessions[session] += 1
+        self.stats["admitted"] += 1
+        turn = asyncio.get_running_loop().create_future()
+        if self.running < self.max_running and not self._waiting:
+            self.running += 1
+            turn.set_result(None)
+        else:
+            heapq.heappush(self._waiting, (priority, next(self._order), turn))
+            if priority == INTERACTIVE:
+                self._interactive_waiting.add(turn)
+        return turn
+
+    def release(self, turn: asyncio.Future, session: str | None = None):
+        """Give back a slot from ``reserve`` (granted or not) and wake the next waiter."""
+        if session is not None:
+            self._sessions[session] -= 1
+            if self._sessions[session] <= 0:
+                del self._sessions[session]
+        if not turn.done() or turn.cancelled():
+            # Never started: it stops counting as waiting now, and its queue
+            # entry is dropped lazily
+            turn.cancel()
+            self._interactive_waiting.discard(turn)
+            self._abandoned += 1
+            return
+        self.running -= 1
+        while self._waiting and self.running < self.max_running:
+            _, _, waiter = heapq.heappop(self._waiting)
+            if waiter.cancelled():
+                self._abandoned -= 1
+                continue
+            self._interactive_waiting.discard(waiter)
+            self.running += 1
+            waiter.set_result(None)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting) - self._abandoned
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "running": self.running, "waiting": self.waiting}
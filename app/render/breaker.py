@@ -0,0 +1,104 @@
+"""Per-document-type circuit breakers for pool renders.
+
+Each document type keeps the outcome of its last ``window`` renders. When
+at least ``min_calls`` of them are recorded and the failure rate (errors and
+timeouts) reaches ``failure_ratio``, the breaker opens and new renders of
+that type are rejected immediately with ``CircuitOpen`` for ``cooldown``
+seconds. After that a single trial render is let through (half-open); its
+success closes the breaker and its failure opens it again.
+"""
+
+import time
+from collections import deque
+
+from app.render.admission import Overloaded
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+LABELS = {
+    "statement": "estados de cuenta",
+    "invoice": "notas de entrega",
+    "quotation": "cotizaciones",
+    "warehouse_receipt": "recibos de almacén",
+}
+
+
+class CircuitOpen(Overloaded):
+    """Raised when a document type is temporarily disabled after repeated failures."""
+
+    def __init__(self, doc_type: str):
+        Exception.__init__(
+            self,
+            f"La generación de {LABELS.get(doc_type, doc_type)} está suspendida "
+            "temporalmente por fallas repetidas. Intente de nuevo en unos minutos.",
+        )
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        doc_type: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        cooldown: float = 30.0,
+    ):
+        self.doc_type = doc_type
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.stats = {"rejected": 0, "opened": 0}
+
+    def allow(self):
+        """Raise ``CircuitOpen`` unless a new render of this type may start."""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return
+        if self.state == HALF_OPEN and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return
+        self.stats["rejected"] += 1
+        raise CircuitOpen(self.doc_type)
+
+    def abandon(self):
+        """Forget an allowed render that never started (e.g. rejected by admission)."""
+        if self.state == HALF_OPEN:
+            self.trial_in_flight = False
+
+    def record(self, ok: bool):
+        if self.state == HALF_OPEN:
+            self.trial_in_flight = False
+            if ok:
+                self.state = CLOSED
+                self.outcomes.clear()
+            else:
+                self._open()
+            return
+        self.outcomes.append(ok)
+        failures = self.outcomes.count(False)
+        if (
+            self.state == CLOSED
+            and len(self.outcomes) >= self.min_calls
+            and failures / len(self.outcomes) >= self.failure_ratio
+        ):
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.stats["opened"] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            **self.stats,
+            "state": self.state,
+            "failures": self.outcomes.count(False),
+            "calls": len(self.outcomes),
+        }
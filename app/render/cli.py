@@ -0,0 +1,188 @@
+"""Command-line renderer: ``python -m app.render [FILE ...]``.
+
+Reads document requests (``{"type", "format", "data"}``) as NDJSON or as a
+JSON object/array from files or stdin and writes one PDF/XLSX per request.
+With ``--merge FILE`` the rendered PDFs are also combined, in input order,
+into one printable file with a bookmark per document. Only the standard
+library is imported up front; ReportLab and openpyxl are
+loaded by the worker that renders the first document of each type, and
+Reflex is never imported.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from app.render import DOCUMENT_TYPES, filename, parse_request, render
+
+
+def iter_requests(stream):
+    """Yield ``(payload, error)`` pairs from an NDJSON or JSON text stream.
+
+    NDJSON is read line by line so arbitrarily large inputs stream through.
+    Unless the first line is a complete JSON object, the whole stream is
+    parsed as a single JSON object or array instead (``json.dump`` writes an
+    array on one line).
+    """
+    first = ""
+    for first in stream:
+        if first.strip():
+            break
+    if not first.strip():
+        return
+    try:
+        payload = json.loads(first)
+    except json.JSONDecodeError:
+        payload = None
+    if not isinstance(payload, dict):
+        try:
+            payload = json.loads(first + stream.read())
+        except json.JSONDecodeError as e:
+            yield None, e
+            return
+        for item in payload if isinstance(payload, list) else [payload]:
+            yield item, None
+        return
+    yield payload, None
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield None, e
+
+
+def render_to_file(doc_type: str, fmt: str, data: dict, output_dir: str) -> str:
+    """Render one document and write it; runs inside a pool worker."""
+    path = Path(output_dir) / filename(doc_type, fmt, data)
+    path.write_bytes(render(doc_type, fmt, data))
+    return str(path)
+
+
+def _open_inputs(paths: list[str]):
+    if not paths or paths == ["-"]:
+        yield sys.stdin
+        return
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            yield f
+
+
+def document_title(doc_type: str, data: dict) -> str:
+    prefix, key = DOCUMENT_TYPES[doc_type]
+    return f"{prefix} {data.get(key, '')}".strip()
+
+
+def run(paths: list[str], output_dir: str, workers: int, merge: str | None = None) -> int:
+    """Render every request in ``paths`` and return the number of failures."""
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    failures = 0
+    # (input position, bookmark title, rendered path) of every PDF to merge
+    rendered: list[tuple[int, str, str]] = []
+
+    def collect(position: int, title: str, path: str):
+        print(path)
+        if merge and path.endswith(".pdf"):
+            rendered.append((position, title, path))
+
+    def requests():
+        nonlocal failures
+        for stream in _open_inputs(paths):
+            for index, (payload, error) in enumerate(iter_requests(stream), 1):
+                try:
+                    if error:
+                        raise error
+                    yield parse_request(payload)
+                except (ValueError, AttributeError) as e:
+                    failures += 1
+                    print(f"{getattr(stream, 'name', '-')}:{index}: {e}", file=sys.stderr)
+
+    if workers <= 1:
+        for position, (doc_type, fmt, data) in enumerate(requests()):
+            try:
+                path = render_to_file(doc_type, fmt, data, output_dir)
+            except Exception as e:
+                failures += 1
+                print(f"{doc_type}: {e}", file=sys.stderr)
+                continue
+            collect(position, document_title(doc_type, data), path)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        jobs = (
+            (
+                (position, doc_type, document_title(doc_type, data)),
+                (doc_type, fmt, data, output_dir),
+            )
+            for position, (doc_type, fmt, data) in enumerate(requests())
+        )
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (position, doc_type, title), future in run_bounded(
+                pool, render_to_file, jobs, workers * 4
+            ):
+                try:
+                    path = future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"{doc_type}: {e}", file=sys.stderr)
+                    continue
+                collect(position, title, path)
+
+    if merge and rendered:
+        from app.render.merge import merge_in_parts
+
+        rendered.sort()
+        for path, documents, pages in merge_in_parts(
+            ((title, path) for _, title, path in rendered), merge
+        ):
+            print(f"{path}: {documents} documentos, {pages} páginas", file=sys.stderr)
+    return failures
+
+
+def run_bounded(pool, fn, jobs, max_pending: int):
+    """Submit ``fn(*args)`` for each ``(key, args)`` job and yield ``(key, future)`` as they finish.
+
+    At most ``max_pending`` jobs are outstanding at once, so memory stays
+    flat for inputs with thousands of documents.
+    """
+    from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+
+    pending = {}
+    for key, args in jobs:
+        pending[pool.submit(fn, *args)] = key
+        if len(pending) >= max_pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future
+    for future in as_completed(list(pending)):
+        yield pending.pop(future), future
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.render",
+        description="Render statement, invoice, quotation and warehouse receipt documents.",
+    )
+    parser.add_argument(
+        "inputs", nargs="*", help="JSON/NDJSON files with document requests (default: stdin)"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default=".", help="directory for the generated files"
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="render worker processes (1 renders in-process)",
+    )
+    parser.add_argument(
+        "--merge",
+        metavar="FILE",
+        help="also merge the rendered PDFs, in input order, into FILE with bookmarks",
+    )
+    args = parser.parse_args(argv)
+    failures = run(args.inputs, args.output_dir, args.workers, args.merge)
+    return 1 if failures else 0
@@ -0,0 +1,17 @@
+"""Per-type render deadlines shared by the render pool and the job workers.
+
+Seconds a render may run once a worker starts it, overridable with e.g.
+``RENDER_DEADLINE_QUOTATION=10``; a render past its deadline is killed.
+"""
+
+import os
+
+DEADLINES = {
+    doc_type: float(os.environ.get(f"RENDER_DEADLINE_{doc_type.upper()}", default))
+    for doc_type, default in {
+        "statement": 60,
+        "invoice": 30,
+        "quotation": 30,
+        "warehouse_receipt": 30,
+    }.items()
+}
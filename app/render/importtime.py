@@ -0,0 +1,68 @@
+"""Measure cold import times of the modules on the startup path.
+
+Usage::
+
+    python -m app.render.importtime [-n 5]
+
+Each module is imported in a fresh interpreter, ``-n`` times, and the best
+time is reported, so regressions in what the server, the CLI and the render
+workers pull in at startup are easy to spot.
+"""
+
+import argparse
+import subprocess
+import sys
+
+MODULES = [
+    "app.render",
+    "app.render.cli",
+    "app.render.statement",
+    "app.render.invoice",
+    "app.render.quotation",
+    "app.render.warehouse_receipt",
+    "reportlab.platypus",
+    "openpyxl",
+    "app.render.preload",
+    "reflex",
+    "app.states.statement_state",
+    "app.states.invoice_state",
+    "app.states.quotation_state",
+    "app.states.warehouse_receipt_state",
+]
+
+_PROBE = (
+    "import time, importlib\n"
+    "t = time.perf_counter()\n"
+    "importlib.import_module({module!r})\n"
+    "print(time.perf_counter() - t)\n"
+)
+
+
+def measure(module: str, runs: int) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        best = min(best, float(out.strip().splitlines()[-1]))
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.render.importtime",
+        description="Report the cold import time of startup-critical modules.",
+    )
+    parser.add_argument("modules", nargs="*", default=MODULES, help="modules to measure")
+    parser.add_argument("-n", "--runs", type=int, default=3, help="runs per module (best is kept)")
+    args = parser.parse_args(argv)
+    for module in args.modules:
+        print(f"{measure(module, args.runs) * 1000:8.1f} ms  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
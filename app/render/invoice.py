@@ -0,0 +1,320 @@
+"""Invoice (Nota de entrega) PDF and Excel layouts."""
+
+import io
+
+from app.render.totals import as_float, invoice_totals
+
+DEFAULTS = {
+    "from_name": "Nosglobal Logistic",
+    "from_address": "Av. Principal 1000, Torre A, Piso 5",
+    "from_details": "Caracas, Distrito Capital, 1010",
+    "from_email": "info@nosglobal.com",
+    "from_phone": "+58 424-4966616",
+    "to_name": "",
+    "to_company": "",
+    "to_address": "",
+    "to_details": "",
+    "from_tax_id": "J-123456789",
+    "to_tax_id": "",
+    "payment_method": "",
+    "bank_account": "",
+    "bank_name": "",
+    "terms_conditions": "",
+    "notes": "",
+    "authorized_by": "",
+    "logo_url": "/nosglobal-logo.png",
+    "invoice_number": "",
+    "invoice_date": "",
+    "due_date": "",
+    "items": [],
+    "tax_rate": 0.0,
+}
+
+ITEM_DEFAULTS = {
+    "code": "",
+    "description": "",
+    "quantity": 1,
+    "unit_price": 0.0,
+    "discount": 0.0,
+    "tax_rate": 0.0,
+}
+
+
+def normalize(data: dict) -> dict:
+    """Fill in defaults and recompute line amounts of an invoice payload."""
+    doc = {**DEFAULTS, **data}
+    doc["tax_rate"] = as_float(doc["tax_rate"])
+    items = []
+    for item in doc["items"] or []:
+        item = {**ITEM_DEFAULTS, **item}
+        item["quantity"] = int(as_float(item["quantity"]))
+        item["unit_price"] = as_float(item["unit_price"])
+        item["discount"] = as_float(item["discount"])
+        item["tax_rate"] = as_float(item["tax_rate"])
+        item["amount"] = item["quantity"] * (item["unit_price"] - item["discount"])
+        items.append(item)
+    doc["items"] = items
+    return doc
+
+
+def build_pdf(doc: dict) -> bytes:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    buffer = io.BytesIO()
+    pdf = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        rightMargin=40,
+        leftMargin=40,
+        topMargin=40,
+        bottomMargin=40,
+    )
+    elements = []
+    styles = getSampleStyleSheet()
+    totals = invoice_totals(doc["items"], doc["tax_rate"])
+    header_data = [
+        [
+            Paragraph(
+                f"<b>{doc['from_name']}</b><br/>{doc['from_address']}<br/>{doc['from_details']}<br/>RIF/Cédula: {doc['from_tax_id']}<br/>{doc['from_email']}<br/>{doc['from_phone']}",
+                styles["Normal"],
+            ),
+            Paragraph(
+                f"<font size=16><b>NOTA DE ENTREGA</b></font><br/><br/><b>No:</b> {doc['invoice_number']}<br/><b>Fecha:</b> {doc['invoice_date']}<br/><b>Vence:</b> {doc['due_date']}",
+                styles["Normal"],
+            ),
+        ]
+    ]
+    t_header = Table(header_data, colWidths=[4 * inch, 3 * inch])
+    t_header.setStyle(
+        TableStyle(
+            [
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+            ]
+        )
+    )
+    elements.append(t_header)
+    elements.append(Spacer(1, 30))
+    elements.append(Paragraph("<b>ENTREGAR A:</b>", styles["Heading4"]))
+    elements.append(
+        Paragraph(
+            f"{doc['to_name']}<br/>{doc['to_company']}<br/>{doc['to_address']}<br/>{doc['to_details']}<br/>RIF/Cédula: {doc['to_tax_id']}",
+            styles["Normal"],
+        )
+    )
+    elements.append(Spacer(1, 30))
+    data = [["CÓDIGO", "DESCRIPCIÓN", "CANT.", "PRECIO", "DESC.", "TOTAL"]]
+    for item in doc["items"]:
+        description_text = f"{item['code']} - {item['description']}" if item["code"] else item["description"]
+        discount_text = f"${item['discount']:.2f}" if item["discount"] > 0 else "-"
+        data.append(
+            [
+                Paragraph(item["code"] if item["code"] else "-", styles["Normal"]),
+                Paragraph(description_text, styles["Normal"]),
+                str(item["quantity"]),
+                f"${item['unit_price']:,.2f}",
+                discount_text,
+                f"${item['amount']:,.2f}",
+            ]
+        )
+    t_items = Table(
+        data, colWidths=[0.8 * inch, 2.5 * inch, 0.8 * inch, 1 * inch, 0.8 * inch, 1.2 * inch]
+    )
+    t_items.setStyle(
+        TableStyle(
+            [
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, 0), 9),
+                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+                ("LINEBELOW", (0, 0), (-1, 0), 1, colors.black),
+                ("ALIGN", (2, 0), (-1, -1), "RIGHT"),
+                ("ALIGN", (0, 0), (0, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.gray),
+                ("TEXTCOLOR", (4, 1), (4, -1), colors.red),  # Discount column in red
+            ]
+        )
+    )
+    elements.append(t_items)
+    elements.append(Spacer(1, 20))
+    totals_data = [
+        ["Subtotal:", f"${totals['subtotal']:,.2f}"],
+        [f"Impuestos ({doc['tax_rate']}%):", f"${totals['tax_amount']:,.2f}"],
+        ["Total:", f"${totals['total']:,.2f}"],
+    ]
+    t_totals = Table(totals_data, colWidths=[4.75 * inch, 1.25 * inch])
+    t_totals.setStyle(
+        TableStyle(
+            [
+                ("ALIGN", (0, 0), (-1, -1), "RIGHT"),
+                ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, -1), (-1, -1), 12),
+                ("LINEABOVE", (0, -1), (-1, -1), 1, colors.black),
+                ("TOPPADDING", (0, -1), (-1, -1), 10),
+            ]
+        )
+    )
+    elements.append(t_totals)
+    elements.append(Spacer(1, 30))
+
+    # Payment Information Section
+    if doc["payment_method"]:
+        elements.append(Paragraph("<b>INFORMACIÓN DE PAGO:</b>", styles["Heading4"]))
+        payment_info = f"Método: {doc['payment_method']}<br/>"
+        if doc["bank_name"]:
+            payment_info += f"Banco: {doc['bank_name']}<br/>"
+        if doc["bank_account"]:
+            payment_info += f"Cuenta: {doc['bank_account']}"
+        elements.append(Paragraph(payment_info, styles["Normal"]))
+        elements.append(Spacer(1, 20))
+
+    # Terms and Conditions Section
+    if doc["terms_conditions"]:
+        elements.append(Paragraph("<b>TÉRMINOS Y CONDICIONES:</b>", styles["Heading4"]))
+        elements.append(Paragraph(doc["terms_conditions"], styles["Normal"]))
+        elements.append(Spacer(1, 20))
+
+    # Notes Section
+    if doc["notes"]:
+        elements.append(Paragraph("<b>NOTAS:</b>", styles["Heading4"]))
+        elements.append(Paragraph(doc["notes"], styles["Normal"]))
+        elements.append(Spacer(1, 20))
+
+    # Authorization Section
+    if doc["authorized_by"]:
+        elements.append(Paragraph("<b>AUTORIZACIÓN:</b>", styles["Heading4"]))
+        auth_data = [
+            ["", ""],
+            [f"Autorizado por: {doc['authorized_by']}", "Firma:"],
+            ["", ""],
+        ]
+        t_auth = Table(auth_data, colWidths=[3 * inch, 3 * inch])
+        t_auth.setStyle(
+            TableStyle(
+                [
+                    ("ALIGN", (0, 1), (0, 1), "LEFT"),
+                    ("ALIGN", (1, 1), (1, 1), "CENTER"),
+                    ("FONTNAME", (0, 1), (-1, 1), "Helvetica-Bold"),
+                    ("LINEBELOW", (1, 1), (1, 1), 1, colors.black),
+                    ("BOTTOMPADDING", (1, 1), (1, 1), 20),
+                ]
+            )
+        )
+        elements.append(t_auth)
+
+    pdf.build(elements)
+    return buffer.getvalue()
+
+
+def build_excel(doc: dict) -> bytes:
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Nota de entrega"
+    totals = invoice_totals(doc["items"], doc["tax_rate"])
+    title_font = Font(bold=True, size=16)
+    header_font = Font(bold=True)
+    gray_fill = PatternFill(
+        start_color="EEEEEE", end_color="EEEEEE", fill_type="solid"
+    )
+    ws["A1"] = doc["from_name"]
+    ws["A1"].font = title_font
+    ws["A2"] = doc["from_address"]
+    ws["A3"] = doc["from_details"]
+    ws["A4"] = doc["from_email"]
+    ws["A5"] = f"RIF/Cédula: {doc['from_tax_id']}"
+    ws["A6"] = doc["from_phone"]
+    ws["E1"] = "NOTA DE ENTREGA"
+    ws["E1"].font = title_font
+    ws["E2"] = f"No: {doc['invoice_number']}"
+    ws["E3"] = f"Fecha: {doc['invoice_date']}"
+    ws["E4"] = f"Vence: {doc['due_date']}"
+    ws["A8"] = "ENTREGAR A:"
+    ws["A8"].font = header_font
+    ws["A9"] = doc["to_name"]
+    ws["A10"] = doc["to_company"]
+    ws["A11"] = doc["to_address"]
+    ws["A12"] = doc["to_details"]
+    ws["A13"] = f"RIF/Cédula: {doc['to_tax_id']}"
+    row = 15
+    headers = ["Código", "Descripción", "Cantidad", "Precio Unitario", "Descuento", "Total"]
+    for col, text in enumerate(headers, 1):
+        cell = ws.cell(row=row, column=col, value=text)
+        cell.font = header_font
+        cell.fill = gray_fill
+    row += 1
+    for item in doc["items"]:
+        ws.cell(row=row, column=1, value=item["code"] if item["code"] else "-")
+        description = f"{item['code']} - {item['description']}" if item["code"] else item["description"]
+        ws.cell(row=row, column=2, value=description)
+        ws.cell(row=row, column=3, value=item["quantity"])
+        ws.cell(row=row, column=4, value=item["unit_price"])
+        ws.cell(row=row, column=5, value=item["discount"] if item["discount"] > 0 else 0)
+        ws.cell(row=row, column=6, value=item["amount"])
+        row += 1
+    row += 2
+    ws.cell(row=row, column=4, value="Subtotal:").font = header_font
+    ws.cell(row=row, column=5, value=totals["subtotal"])
+    ws.cell(row=row, column=6, value=totals["subtotal"])
+    row += 1
+    ws.cell(
+        row=row, column=4, value=f"Impuestos ({doc['tax_rate']}%):"
+    ).font = header_font
+    ws.cell(row=row, column=5, value=totals["tax_amount"])
+    ws.cell(row=row, column=6, value=totals["tax_amount"])
+    row += 1
+    ws.cell(row=row, column=4, value="TOTAL:").font = header_font
+    ws.cell(row=row, column=5, value=totals["total"])
+    ws.cell(row=row, column=6, value=totals["total"]).font = Font(bold=True)
+
+    # Add payment information if available
+    if doc["payment_method"]:
+        row += 2
+        ws.cell(row=row, column=1, value="INFORMACIÓN DE PAGO:").font = header_font
+        row += 1
+        ws.cell(row=row, column=1, value=f"Método: {doc['payment_method']}")
+        if doc["bank_name"]:
+            row += 1
+            ws.cell(row=row, column=1, value=f"Banco: {doc['bank_name']}")
+        if doc["bank_account"]:
+            row += 1
+            ws.cell(row=row, column=1, value=f"Cuenta: {doc['bank_account']}")
+
+    # Add terms and conditions if available
+    if doc["terms_conditions"]:
+        row += 2
+        ws.cell(row=row, column=1, value="TÉRMINOS Y CONDICIONES:").font = header_font
+        row += 1
+        ws.cell(row=row, column=1, value=doc["terms_conditions"])
+
+    # Add notes if available
+    if doc["notes"]:
+        row += 2
+        ws.cell(row=row, column=1, value="NOTAS:").font = header_font
+        row += 1
+        ws.cell(row=row, column=1, value=doc["notes"])
+
+    # Add authorization if available
+    if doc["authorized_by"]:
+        row += 2
+        ws.cell(row=row, column=1, value="AUTORIZACIÓN:").font = header_font
+        row += 1
+        ws.cell(row=row, column=1, value=f"Autorizado por: {doc['authorized_by']}")
+        row += 1
+        ws.cell(row=row, column=1, value="Firma:")
+
+    ws.column_dimensions["A"].width = 40
+    ws.column_dimensions["B"].width = 30
+    ws.column_dimensions["C"].width = 12
+    ws.column_dimensions["D"].width = 15
+    ws.column_dimensions["E"].width = 15
+    ws.column_dimensions["F"].width = 15
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
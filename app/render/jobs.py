@@ -0,0 +1,272 @@
+"""Durable export job queue stored in SQLite.
+
+Usage::
+
+    python -m app.render.jobs -o exportes/ -j 4
+
+Jobs are submitted by the web backend (``POST /api/jobs``) and pulled by
+worker processes started with the command above. Each job is keyed by a
+hash of its ``(type, format, data)`` payload, so submitting the same
+document twice returns the existing job instead of rendering it again.
+
+A worker leases one job at a time for ``LEASE_SECONDS`` and renders it in a
+supervised render process (see app.render.workers) that is killed once the
+document type's deadline passes. The lease is renewed while the render is
+within its deadline; if the worker dies mid-render the lease expires and
+another worker picks the job up. Failed and timed-out renders are retried
+with exponential backoff up to ``MAX_ATTEMPTS`` times. The database runs in
+WAL mode so the backend can poll job status while workers write.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+from app.render import DOCUMENT_TYPES, idempotency_key, render
+from app.render.deadlines import DEADLINES
+from app.render.workers import WorkerPool
+
+JOBS_DB = os.environ.get("RENDER_JOBS_DB", "jobs.sqlite3")
+JOBS_OUTPUT_DIR = os.environ.get("RENDER_JOBS_OUTPUT_DIR", "exports")
+# Longer than any render deadline, and only renewed until the render's deadline,
+# so a lease lapses when its worker is gone or stuck
+LEASE_SECONDS = float(
+    os.environ.get("RENDER_JOBS_LEASE_SECONDS", max(DEADLINES.values()) + 30)
+)
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 300.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    doc_type TEXT NOT NULL,
+    fmt TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_until REAL,
+    worker TEXT,
+    result_path TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+"""
+
+STATUS_FIELDS = ("id", "doc_type", "fmt", "status", "attempts", "result_path", "error", "updated_at")
+
+
+def backoff(attempts: int) -> float:
+    return min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+
+
+class JobQueue:
+    """SQLite-backed queue; safe to share between threads and processes."""
+
+    def __init__(self, path: str = JOBS_DB):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; autocommit so every statement is its own
+        # short transaction and readers never block the workers.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, doc_type: str, fmt: str, data: dict) -> dict:
+        """Queue a render unless the same payload already has a live or finished job."""
+        job_id = idempotency_key(doc_type, fmt, data)
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO jobs (id, doc_type, fmt, payload, available_at, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (id) DO UPDATE SET status = 'queued', attempts = 0, error = NULL,"
+            " available_at = excluded.available_at, updated_at = excluded.updated_at"
+            " WHERE jobs.status = 'failed'",
+            (job_id, doc_type, fmt, json.dumps(data, default=str), now, now, now),
+        )
+        return self.status(job_id)
+
+    def status(self, job_id: str) -> dict | None:
+        row = self._connect().execute(
+            f"SELECT {', '.join(STATUS_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def lease(self, worker: str, limit: int = 1) -> list[dict]:
+        """Claim up to ``limit`` ready jobs (or jobs whose lease expired)."""
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = 'lease expired', updated_at = ?"
+            " WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+            (now, now, MAX_ATTEMPTS),
+        )
+        rows = conn.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?,"
+            " worker = ?, updated_at = ?"
+            " WHERE id IN (SELECT id FROM jobs"
+            "   WHERE (status = 'queued' AND available_at <= ?)"
+            "      OR (status = 'running' AND lease_until < ?)"
+            "   ORDER BY available_at LIMIT ?)"
+            " RETURNING id, doc_type, fmt, payload, attempts",
+            (now + LEASE_SECONDS, worker, now, now, now, limit),
+        ).fetchall()
+        return [{**dict(row), "data": json.loads(row["payload"])} for row in rows]
+
+    def renew(self, job_id: str, worker: str) -> bool:
+        """Extend a running job's lease; False once another worker has taken it."""
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET lease_until = ?, updated_at = ?"
+            " WHERE id = ? AND worker = ? AND status = 'running'",
+            (now + LEASE_SECONDS, now, job_id, worker),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker: str, result_path: str):
+        self._connect().execute(
+            "UPDATE jobs SET status = 'done', result_path = ?, error = NULL,"
+            " lease_until = NULL, updated_at = ? WHERE id = ? AND worker = ?",
+            (result_path, time.time(), job_id, worker),
+        )
+
+    def fail(self, job_id: str, worker: str, attempts: int, error: str):
+        """Schedule a retry with backoff, or mark the job failed for good."""
+        now = time.time()
+        if attempts >= MAX_ATTEMPTS:
+            status, available_at = "failed", now
+        else:
+            status, available_at = "queued", now + backoff(attempts)
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, available_at = ?, error = ?, lease_until = NULL,"
+            " updated_at = ? WHERE id = ? AND worker = ?",
+            (status, available_at, error, now, job_id, worker),
+        )
+
+    def depth(self) -> int:
+        """Number of jobs queued or running."""
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchone()[0]
+
+
+def result_name(job: dict) -> str:
+    prefix, key = DOCUMENT_TYPES[job["doc_type"]]
+    return f"{prefix}_{job['data'].get(key, '')}_{job['id'][:8]}.{job['fmt']}"
+
+
+def run_job(queue: JobQueue, renderers: WorkerPool, worker: str, out: Path, job: dict):
+    """Render one leased job under its type's deadline and record the outcome."""
+    deadline = DEADLINES[job["doc_type"]]
+    expires = time.monotonic() + deadline
+    rendered = threading.Event()
+
+    def heartbeat():
+        while not rendered.wait(LEASE_SECONDS / 3) and time.monotonic() < expires:
+            if not queue.renew(job["id"], worker):
+                return
+
+    threading.Thread(target=heartbeat, daemon=True).start()
+    try:
+        path = out / result_name(job)
+        content = renderers.submit_with_timeout(
+            deadline, render, job["doc_type"], job["fmt"], job["data"]
+        ).result()
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logging.exception(f"Job {job['id'][:8]} failed (attempt {job['attempts']}): {e}")
+        queue.fail(job["id"], worker, job["attempts"], str(e))
+        return
+    finally:
+        rendered.set()
+    queue.complete(job["id"], worker, str(path.resolve()))
+
+
+def work(db_path: str, output_dir: str, poll_interval: float = 0.2):
+    """Worker loop: lease, render, record; stops after the current job on SIGTERM."""
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    queue = JobQueue(db_path)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    # One render process, replaced whenever a render is killed at its deadline
+    renderers = WorkerPool(1, timeout=max(DEADLINES.values()), prestart=True)
+    try:
+        while not stopping:
+            jobs = queue.lease(worker)
+            if not jobs:
+                time.sleep(poll_interval)
+                continue
+            run_job(queue, renderers, worker, out, jobs[0])
+    finally:
+        renderers.shutdown()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.render.jobs",
+        description="Run worker processes for the SQLite export job queue.",
+    )
+    parser.add_argument("--db", default=JOBS_DB, help="SQLite job database")
+    parser.add_argument(
+        "-o", "--output-dir", default=JOBS_OUTPUT_DIR, help="folder for the generated files"
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    JobQueue(args.db)  # create the schema before the workers race for it
+    processes = [
+        multiprocessing.Process(target=work, args=(args.db, args.output_dir))
+        for _ in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    logging.info(f"{args.workers} procesos atendiendo la cola {args.db}")
+
+    def stop(*_):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for process in processes:
+        process.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
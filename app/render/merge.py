@@ -0,0 +1,128 @@
+"""Merge rendered PDFs into one printable file with bookmarks and page labels.
+
+Usage::
+
+    python -m app.render.merge -o dia.pdf recibo1.pdf nota2.pdf estado3.pdf
+
+Each source document gets an outline entry pointing to its first page and a
+page label range (``<title> - 1``, ``<title> - 2``...) so viewers show which
+document a page belongs to. Sources are opened one at a time and released
+once their pages have been copied, so callers can feed them from a
+generator of paths instead of keeping every rendered document in memory.
+
+The merged document itself is held in memory until it is written, so
+where that is too much ``MERGE_MAX_DOCUMENTS`` can be set to have
+``merge_in_parts`` start a new file after that many documents (``dia.pdf``
+becomes ``dia-1.pdf``, ``dia-2.pdf``...). By default everything goes into
+one file.
+"""
+
+import argparse
+import io
+import itertools
+import os
+import sys
+from pathlib import Path
+from typing import Iterable
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    NameObject,
+    NumberObject,
+    TextStringObject,
+)
+
+# Documents per merged file, 0 for a single file however many there are
+MERGE_MAX_DOCUMENTS = int(os.environ.get("RENDER_MERGE_MAX_DOCUMENTS", "0"))
+
+
+def merge_pdfs(documents: Iterable[tuple[str, str | Path | bytes]], output) -> int:
+    """Concatenate ``(title, source)`` PDFs into ``output`` and return the page count.
+
+    ``source`` is a path or the PDF bytes; ``output`` is a path or a
+    writable binary stream.
+    """
+    writer = PdfWriter()
+    page_labels = ArrayObject()
+    for title, source in documents:
+        reader = PdfReader(io.BytesIO(source) if isinstance(source, bytes) else source)
+        start = len(writer.pages)
+        for page in reader.pages:
+            writer.add_page(page)
+        if len(writer.pages) == start:
+            continue
+        writer.add_outline_item(title, start)
+        page_labels.extend(
+            [
+                NumberObject(start),
+                DictionaryObject(
+                    {
+                        NameObject("/S"): NameObject("/D"),
+                        NameObject("/P"): TextStringObject(f"{title} - "),
+                        NameObject("/St"): NumberObject(1),
+                    }
+                ),
+            ]
+        )
+    if page_labels:
+        writer._root_object[NameObject("/PageLabels")] = DictionaryObject(
+            {NameObject("/Nums"): page_labels}
+        )
+    writer.page_mode = "/UseOutlines"
+    writer.write(output)
+    return len(writer.pages)
+
+
+def merge_in_parts(
+    documents: Iterable[tuple[str, str | Path | bytes]],
+    output: str | Path,
+    max_documents: int = MERGE_MAX_DOCUMENTS,
+) -> list[tuple[Path, int, int]]:
+    """Merge ``documents`` into ``output``, split every ``max_documents`` documents.
+
+    Returns ``(path, documents, pages)`` for each file written. With no
+    limit (0), or when everything fits in one file, that file is ``output``
+    itself; otherwise the parts are numbered after it (``dia-1.pdf``,
+    ``dia-2.pdf``...).
+    """
+    output = Path(output)
+    documents = iter(documents)
+    parts = []
+    chunk = list(itertools.islice(documents, max_documents or None))
+    while chunk:
+        following = list(itertools.islice(documents, max_documents or None))
+        if following or parts:
+            path = output.with_name(f"{output.stem}-{len(parts) + 1}{output.suffix}")
+        else:
+            path = output
+        parts.append((path, len(chunk), merge_pdfs(chunk, path)))
+        chunk = following
+    return parts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.render.merge",
+        description="Merge PDF documents into one file with a bookmark per document.",
+    )
+    parser.add_argument("inputs", nargs="+", help="PDF files, in order")
+    parser.add_argument("-o", "--output", required=True, help="merged PDF to write")
+    parser.add_argument(
+        "--max-documents",
+        type=int,
+        default=MERGE_MAX_DOCUMENTS,
+        help="start a new numbered file after this many documents (default: no limit)",
+    )
+    args = parser.parse_args(argv)
+    parts = merge_in_parts(
+        ((Path(path).stem, path) for path in args.inputs), args.output, args.max_documents
+    )
+    for path, documents, pages in parts:
+        print(f"{path}: {documents} documentos, {pages} páginas", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Process pool that renders documents off the event loop."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+
+from app.render import DOCUMENT_TYPES, get_renderer, idempotency_key, render
+from app.render.admission import INTERACTIVE, Admission
+from app.render.breaker import CircuitBreaker
+from app.render.deadlines import DEADLINES
+from app.render.workers import WorkerPool
+
+POOL_WORKERS = int(os.environ.get("RENDER_POOL_WORKERS", "0")) or os.cpu_count() or 1
+# Interactive renders allowed to wait for a worker before new ones are rejected
+RENDER_MAX_QUEUE = int(os.environ.get("RENDER_MAX_QUEUE", "0")) or 4 * POOL_WORKERS
+RENDER_MAX_PER_SESSION = int(os.environ.get("RENDER_MAX_PER_SESSION", "2"))
+
+# Worker recycling and limits, see app.render.workers
+WORKER_MAX_JOBS = int(os.environ.get("RENDER_WORKER_MAX_JOBS", "500"))
+WORKER_MAX_RSS_MB = int(os.environ.get("RENDER_WORKER_MAX_RSS_MB", "512"))
+WORKER_MEMORY_LIMIT_MB = int(os.environ.get("RENDER_WORKER_MEMORY_LIMIT_MB", "2048"))
+JOB_CPU_SECONDS = int(os.environ.get("RENDER_JOB_CPU_SECONDS", "60"))
+JOB_TIMEOUT = float(os.environ.get("RENDER_JOB_TIMEOUT", "120"))
+# Start every worker at startup and render sample documents in it first
+RENDER_WARMUP = os.environ.get("RENDER_WARMUP", "1") not in ("0", "false", "no")
+
+admission = Admission(POOL_WORKERS, RENDER_MAX_QUEUE, RENDER_MAX_PER_SESSION)
+breakers = {doc_type: CircuitBreaker(doc_type) for doc_type in DOCUMENT_TYPES}
+
+_pool: WorkerPool | None = None
+
+# Renders currently on the pool, keyed by request hash, shared by every
+# caller asking for the same document while it is in flight.
+_in_flight: dict[str, asyncio.Future] = {}
+
+# warmup_seconds is None until the pool has warmed up
+stats = {"renders": 0, "coalesced": 0, "warmup_seconds": None}
+
+
+def get_pool() -> WorkerPool:
+    """Return the shared render pool, starting it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = WorkerPool(
+            POOL_WORKERS,
+            max_jobs=WORKER_MAX_JOBS,
+            max_rss_mb=WORKER_MAX_RSS_MB,
+            memory_limit_mb=WORKER_MEMORY_LIMIT_MB,
+            cpu_seconds=JOB_CPU_SECONDS,
+            timeout=JOB_TIMEOUT,
+            initializer="app.render.preload:render_samples" if RENDER_WARMUP else None,
+            prestart=RENDER_WARMUP,
+        )
+    return _pool
+
+
+def is_warm() -> bool:
+    """Whether the pool is ready to serve renders without warm-up cost."""
+    return not RENDER_WARMUP or (_pool is not None and _pool.warm.is_set())
+
+
+async def warm_up():
+    """Start the pool and wait until every worker has rendered its samples."""
+    started = time.perf_counter()
+    pool = get_pool()
+    await asyncio.get_running_loop().run_in_executor(None, pool.warm.wait)
+    stats["warmup_seconds"] = round(time.perf_counter() - started, 2)
+    # Warning level: the server leaves the root logger at its default level
+    logging.warning(
+        f"Render warm-up finished in {stats['warmup_seconds']:.2f}s ({POOL_WORKERS} workers)"
+    )
+
+
+@contextlib.asynccontextmanager
+async def lifespan():
+    """App lifespan hook: warm the pool in the background, stop it on shutdown."""
+    task = asyncio.create_task(warm_up()) if RENDER_WARMUP else None
+    try:
+        yield
+    finally:
+        if task is not None:
+            task.cancel()
+        shutdown()
+
+
+async def _render_admitted(
+    turn: asyncio.Future, session: str | None, doc_type: str, fmt: str, data: dict
+) -> bytes:
+    breaker = breakers[doc_type]
+    try:
+        await turn
+        future = get_pool().submit_with_timeout(
+            DEADLINES[doc_type], render, doc_type, fmt, data
+        )
+        content = await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        breaker.abandon()
+        raise
+    except Exception:
+        breaker.record(False)
+        raise
+    else:
+        breaker.record(True)
+        return content
+    finally:
+        admission.release(turn, session)
+
+
+async def render_async(
+    doc_type: str,
+    fmt: str,
+    data: dict,
+    session: str | None = None,
+    priority: int = INTERACTIVE,
+) -> bytes:
+    """Render a document payload on the pool without blocking the event loop.
+
+    Identical concurrent requests (same type, format and payload) share one
+    render and all receive the same bytes. New renders go through the
+    document type's circuit breaker and admission control, and raise
+    ``Overloaded`` (or its ``CircuitOpen`` subclass) when they are rejected.
+    Malformed payloads raise here, before admission, so they never count as
+    failures against the breaker.
+    """
+    key = idempotency_key(doc_type, fmt, data)
+    future = _in_flight.get(key)
+    if future is not None:
+        stats["coalesced"] += 1
+    else:
+        get_renderer(doc_type).normalize(data)
+        breaker = breakers[doc_type]
+        breaker.allow()
+        try:
+            turn = admission.reserve(session, priority)
+        except Exception:
+            breaker.abandon()
+            raise
+        future = asyncio.ensure_future(_render_admitted(turn, session, doc_type, fmt, data))
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+        stats["renders"] += 1
+    # Shielded so one caller giving up does not cancel the render for the rest
+    return await asyncio.shield(future)
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,57 @@
+"""Imported once by the render fork server so every worker starts warm.
+
+Importing this module loads ReportLab, openpyxl and the four document
+renderers, and touches the lazily initialised pieces a first render would
+otherwise pay for: standard font metrics, the sample stylesheet, the logo
+image decoder and the XLSX writer. ``render_samples`` goes further and is
+run by every worker as it starts.
+"""
+
+import io
+import logging
+import time
+
+import openpyxl.styles  # noqa: F401
+import reportlab.platypus  # noqa: F401
+from openpyxl import Workbook
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+
+from app.render import FORMATS, asset_path, invoice, quotation, statement, warehouse_receipt, render
+
+# One tiny synthetic document per type, with a single row each
+SAMPLES = {
+    "statement": {"account_number": "0", "transactions": [statement.TRANSACTION_DEFAULTS]},
+    "invoice": {"invoice_number": "0", "items": [invoice.ITEM_DEFAULTS]},
+    "quotation": {"quote_number": "0", "items": [quotation.ITEM_DEFAULTS]},
+    "warehouse_receipt": {
+        "receipt_number": "0",
+        "dimensions": [warehouse_receipt.DIMENSION_DEFAULTS],
+    },
+}
+
+
+def warm():
+    for font in ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique"):
+        pdfmetrics.getFont(font)
+    getSampleStyleSheet()
+    logo_path = asset_path(quotation.DEFAULTS["logo_url"])
+    if logo_path:
+        ImageReader(str(logo_path)).getSize()
+    Workbook().save(io.BytesIO())
+
+
+def render_samples() -> float:
+    """Render every sample in every format so the first real export is not the slowest."""
+    started = time.perf_counter()
+    for doc_type, data in SAMPLES.items():
+        for fmt in FORMATS:
+            try:
+                render(doc_type, fmt, data)
+            except Exception as e:
+                logging.exception(f"Warm-up render of {doc_type} {fmt} failed: {e}")
+    return time.perf_counter() - started
+
+
+warm()
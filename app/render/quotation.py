@@ -0,0 +1,355 @@
+"""Quotation (Cotización) PDF and Excel layouts."""
+
+import io
+
+from app.render import asset_path
+from app.render.totals import as_float, quotation_totals
+
+DEFAULTS = {
+    "company_name": "Nosglobal Logistic",
+    "company_logo_url": "/nosglobal-logo.png",
+    "company_address": "Miami, FL",
+    "company_phone": "+58 424-4966616",
+    "company_email": "info@nosglobal.com",
+    "quote_number": "",
+    "quote_date": "",
+    "valid_until": "",
+    "client_name": "",
+    "client_company": "",
+    "client_address": "",
+    "client_email": "",
+    "client_phone": "",
+    "items": [],
+    "tax_rate": 0.0,
+    "shipping_cost": 0.0,
+    "discount_global": 0.0,
+    "notes": "",
+    "terms_conditions": "",
+    "payment_terms": "",
+    "logo_url": "/nosglobal-logo.png",
+}
+
+ITEM_DEFAULTS = {
+    "description": "",
+    "quantity": 1,
+    "unit_price": 0.0,
+    "discount": 0.0,
+    "notes": "",
+}
+
+
+def normalize(data: dict) -> dict:
+    """Fill in defaults and recompute line amounts of a quotation payload."""
+    doc = {**DEFAULTS, **data}
+    for field in ["tax_rate", "shipping_cost", "discount_global"]:
+        doc[field] = as_float(doc[field])
+    items = []
+    for item in doc["items"] or []:
+        item = {**ITEM_DEFAULTS, **item}
+        item["quantity"] = int(as_float(item["quantity"]))
+        item["unit_price"] = as_float(item["unit_price"])
+        item["discount"] = as_float(item["discount"])
+        item["amount"] = (item["quantity"] * item["unit_price"]) - item["discount"]
+        items.append(item)
+    doc["items"] = items
+    return doc
+
+
+def build_pdf(doc: dict) -> bytes:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    buffer = io.BytesIO()
+    pdf = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        rightMargin=40,
+        leftMargin=40,
+        topMargin=40,
+        bottomMargin=40,
+    )
+
+    elements = []
+    styles = getSampleStyleSheet()
+    totals = quotation_totals(
+        doc["items"], doc["tax_rate"], doc["shipping_cost"], doc["discount_global"]
+    )
+
+    # Header section with logo and quotation info
+    header_data = []
+    logo_path = asset_path(doc["logo_url"])
+
+    company_info = Paragraph(
+        f"<b>{doc['company_name']}</b><br/>{doc['company_address']}<br/>{doc['company_phone']}",
+        styles["Normal"],
+    )
+    quote_info = Paragraph(
+        f"<b style='font-size:20; color:purple'>COTIZACIÓN</b><br/><b>No. {doc['quote_number']}</b><br/>Fecha: {doc['quote_date']}<br/>Válida hasta: {doc['valid_until']}",
+        styles["Normal"],
+    )
+    if logo_path:
+        logo = Image(str(logo_path), width=0.8 * inch, height=0.8 * inch)
+        header_data.append([logo, company_info, quote_info])
+    else:
+        header_data.append([company_info, quote_info])
+
+    header_table = Table(
+        header_data, colWidths=[1.5 * inch, 2.5 * inch, 2.5 * inch]
+    )
+    header_table.setStyle(
+        TableStyle(
+            [
+                ("ALIGN", (0, 0), (0, 0), "LEFT"),
+                ("ALIGN", (1, 0), (1, 0), "LEFT"),
+                ("ALIGN", (2, 0), (2, 0), "RIGHT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+    )
+    elements.append(header_table)
+    elements.append(Spacer(1, 20))
+
+    # Client section
+    client_text = f"<b>PARA:</b><br/><b>{doc['client_name']}</b><br/>"
+    if doc["client_company"]:
+        client_text += f"{doc['client_company']}<br/>"
+    if doc["client_address"]:
+        client_text += f"{doc['client_address']}<br/>"
+    if doc["client_email"]:
+        client_text += f"Email: {doc['client_email']}<br/>"
+    if doc["client_phone"]:
+        client_text += f"Teléfono: {doc['client_phone']}<br/>"
+
+    client_para = Paragraph(client_text, styles["Normal"])
+    elements.append(client_para)
+    elements.append(Spacer(1, 20))
+
+    # Items table
+    items_data = [
+        ["DESCRIPCIÓN", "CANT.", "PRECIO", "DESC.", "TOTAL"]
+    ]
+
+    for item in doc["items"]:
+        discount_display = f"-${item['discount']:.2f}" if item["discount"] > 0 else "-"
+        items_data.append(
+            [
+                item["description"],
+                str(item["quantity"]),
+                f"${item['unit_price']:.2f}",
+                discount_display,
+                f"${item['amount']:.2f}",
+            ]
+        )
+
+    items_table = Table(
+        items_data, colWidths=[3 * inch, 0.6 * inch, 0.8 * inch, 0.8 * inch, 1 * inch]
+    )
+    items_table.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.Color(0.9, 0.9, 0.9)),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+                ("ALIGN", (0, 0), (0, -1), "LEFT"),
+                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, 0), 9),
+                ("FONTSIZE", (0, 1), (-1, -1), 9),
+                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
+                ("TOPPADDING", (0, 1), (-1, -1), 8),
+                ("BOTTOMPADDING", (0, 1), (-1, -1), 8),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ]
+        )
+    )
+    elements.append(items_table)
+    elements.append(Spacer(1, 20))
+
+    # Totals section
+    totals_data = [
+        ["Subtotal:", f"${totals['subtotal']:.2f}"],
+    ]
+
+    if doc["discount_global"] > 0:
+        totals_data.append(["Descuento:", f"-${doc['discount_global']:.2f}"])
+
+    if doc["tax_rate"] > 0:
+        totals_data.append(
+            [f"Impuestos ({doc['tax_rate']}%):", f"${totals['tax_amount']:.2f}"]
+        )
+
+    if doc["shipping_cost"] > 0:
+        totals_data.append(["Envío:", f"${doc['shipping_cost']:.2f}"])
+
+    totals_data.append(["TOTAL:", f"${totals['total']:.2f}"])
+
+    totals_table = Table(totals_data, colWidths=[4.6 * inch, 1.6 * inch])
+    totals_table.setStyle(
+        TableStyle(
+            [
+                ("ALIGN", (0, 0), (0, -1), "RIGHT"),
+                ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+                ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+                ("FONTSIZE", (0, -1), (-1, -1), 12),
+                ("TOPPADDING", (0, -1), (-1, -1), 10),
+                ("TEXTCOLOR", (0, -1), (-1, -1), colors.Color(0.5, 0, 0.5)),
+            ]
+        )
+    )
+    elements.append(totals_table)
+    elements.append(Spacer(1, 20))
+
+    # Additional sections
+    if doc["notes"]:
+        notes_para = Paragraph(
+            f"<b>NOTAS:</b><br/>{doc['notes']}", styles["Normal"]
+        )
+        elements.append(notes_para)
+        elements.append(Spacer(1, 12))
+
+    if doc["payment_terms"]:
+        payment_para = Paragraph(
+            f"<b>TÉRMINOS DE PAGO:</b><br/>{doc['payment_terms']}",
+            styles["Normal"],
+        )
+        elements.append(payment_para)
+        elements.append(Spacer(1, 12))
+
+    if doc["terms_conditions"]:
+        terms_para = Paragraph(
+            f"<b>TÉRMINOS Y CONDICIONES:</b><br/>{doc['terms_conditions']}",
+            styles["Normal"],
+        )
+        elements.append(terms_para)
+
+    # Build PDF
+    pdf.build(elements)
+    return buffer.getvalue()
+
+
+def build_excel(doc: dict) -> bytes:
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Cotización"
+    totals = quotation_totals(
+        doc["items"], doc["tax_rate"], doc["shipping_cost"], doc["discount_global"]
+    )
+
+    # Styles
+    title_font = Font(bold=True, size=16, color="800080")
+    header_font = Font(bold=True, size=11)
+    bold_font = Font(bold=True)
+    gray_fill = PatternFill(
+        start_color="EEEEEE", end_color="EEEEEE", fill_type="solid"
+    )
+    purple_fill = PatternFill(
+        start_color="E6E6FA", end_color="E6E6FA", fill_type="solid"
+    )
+
+    # Title
+    ws["A1"] = "COTIZACIÓN"
+    ws["A1"].font = title_font
+    ws.merge_cells("A1:E1")
+
+    # Company info
+    ws["A3"] = doc["company_name"]
+    ws["A3"].font = bold_font
+    ws["A4"] = doc["company_address"]
+    ws["A5"] = doc["company_phone"]
+
+    # Quotation info
+    ws["D3"] = "Número:"
+    ws["E3"] = doc["quote_number"]
+    ws["D4"] = "Fecha:"
+    ws["E4"] = doc["quote_date"]
+    ws["D5"] = "Válida hasta:"
+    ws["E5"] = doc["valid_until"]
+    ws["D3"].font = bold_font
+    ws["D4"].font = bold_font
+    ws["D5"].font = bold_font
+
+    # Client section
+    row = 7
+    ws[f"A{row}"] = "CLIENTE:"
+    ws[f"A{row}"].font = bold_font
+    row += 1
+    ws[f"A{row}"] = doc["client_name"]
+    ws[f"A{row}"].font = bold_font
+
+    if doc["client_company"]:
+        row += 1
+        ws[f"A{row}"] = doc["client_company"]
+
+    if doc["client_address"]:
+        row += 1
+        ws[f"A{row}"] = doc["client_address"]
+
+    if doc["client_email"]:
+        row += 1
+        ws[f"A{row}"] = f"Email: {doc['client_email']}"
+
+    if doc["client_phone"]:
+        row += 1
+        ws[f"A{row}"] = f"Teléfono: {doc['client_phone']}"
+
+    # Items table
+    row += 2
+    headers = ["DESCRIPCIÓN", "CANTIDAD", "PRECIO", "DESCUENTO", "TOTAL"]
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=row, column=col, value=header)
+        cell.font = header_font
+        cell.fill = gray_fill
+
+    row += 1
+    for item in doc["items"]:
+        ws.cell(row=row, column=1, value=item["description"])
+        ws.cell(row=row, column=2, value=item["quantity"])
+        ws.cell(row=row, column=3, value=item["unit_price"])
+        ws.cell(row=row, column=4, value=item["discount"])
+        ws.cell(row=row, column=5, value=item["amount"])
+        row += 1
+
+    # Totals
+    row += 1
+    ws.cell(row=row, column=4, value="Subtotal:").font = bold_font
+    ws.cell(row=row, column=5, value=totals["subtotal"])
+
+    if doc["discount_global"] > 0:
+        row += 1
+        ws.cell(row=row, column=4, value="Descuento:").font = bold_font
+        ws.cell(row=row, column=5, value=-doc["discount_global"])
+
+    if doc["tax_rate"] > 0:
+        row += 1
+        ws.cell(
+            row=row, column=4, value=f"Impuestos ({doc['tax_rate']}%):"
+        ).font = bold_font
+        ws.cell(row=row, column=5, value=totals["tax_amount"])
+
+    if doc["shipping_cost"] > 0:
+        row += 1
+        ws.cell(row=row, column=4, value="Envío:").font = bold_font
+        ws.cell(row=row, column=5, value=doc["shipping_cost"])
+
+    row += 1
+    total_cell_label = ws.cell(row=row, column=4, value="TOTAL:")
+    total_cell_label.font = Font(bold=True, size=12, color="800080")
+    total_cell_value = ws.cell(row=row, column=5, value=totals["total"])
+    total_cell_value.font = Font(bold=True, size=12, color="800080")
+    total_cell_value.fill = purple_fill
+
+    # Column widths
+    ws.column_dimensions["A"].width = 40
+    ws.column_dimensions["B"].width = 12
+    ws.column_dimensions["C"].width = 12
+    ws.column_dimensions["D"].width = 18
+    ws.column_dimensions["E"].width = 15
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
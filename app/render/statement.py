@@ -0,0 +1,267 @@
+"""Account Statement (Estado de Cuenta) PDF and Excel layouts."""
+
+import io
+
+from app.render.totals import aging_buckets, as_float, total_due
+
+DEFAULTS = {
+    "provider_name": "Nosglobal Logistic",
+    "provider_address": "Av. Principal 1000, Torre A, Piso 5",
+    "provider_city_state_zip": "Caracas, Distrito Capital 1010",
+    "provider_phone": "+58 424-4966616",
+    "client_name": "",
+    "client_address": "",
+    "client_city": "",
+    "client_state": "",
+    "client_country": "",
+    "account_number": "",
+    "terms": "",
+    "statement_date": "",
+    "transactions": [],
+}
+
+TRANSACTION_DEFAULTS = {
+    "date": "",
+    "invoice_no": "",
+    "reference": "",
+    "description": "",
+    "amount": 0.0,
+    "paid": 0.0,
+}
+
+
+def normalize(data: dict) -> dict:
+    """Fill in defaults and coerce numeric fields of a statement payload."""
+    doc = {**DEFAULTS, **data}
+    transactions = []
+    for t in doc["transactions"] or []:
+        t = {**TRANSACTION_DEFAULTS, **t}
+        t["amount"] = as_float(t["amount"])
+        t["paid"] = as_float(t["paid"])
+        transactions.append(t)
+    doc["transactions"] = transactions
+    return doc
+
+
+def build_pdf(doc: dict) -> bytes:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    buffer = io.BytesIO()
+    pdf = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        rightMargin=30,
+        leftMargin=30,
+        topMargin=30,
+        bottomMargin=30,
+    )
+    elements = []
+    styles = getSampleStyleSheet()
+    header_data = [
+        [
+            Paragraph(
+                f"<b>{doc['provider_name']}</b><br/>{doc['provider_address']}<br/>{doc['provider_city_state_zip']}<br/>Tel: {doc['provider_phone']}",
+                styles["Normal"],
+            ),
+            Paragraph(f"<b>ESTADO DE CUENTA</b>", styles["Heading1"]),
+        ]
+    ]
+    t_header = Table(header_data, colWidths=[4 * inch, 3 * inch])
+    t_header.setStyle(
+        TableStyle(
+            [
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+            ]
+        )
+    )
+    elements.append(t_header)
+    elements.append(Spacer(1, 20))
+    info_data = [
+        [
+            Paragraph(
+                f"<b>{doc['client_name']}</b><br/>{doc['client_address']}<br/>{doc['client_city']} {doc['client_state']}<br/>{doc['client_country']}",
+                styles["Normal"],
+            ),
+            Table(
+                [
+                    ["NÚMERO DE CUENTA", doc["account_number"]],
+                    ["TÉRMINOS", doc["terms"]],
+                    ["FECHA ESTADO", doc["statement_date"]],
+                ],
+                style=TableStyle(
+                    [
+                        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                        ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
+                        ("FONTSIZE", (0, 0), (-1, -1), 8),
+                        ("PADDING", (0, 0), (-1, -1), 4),
+                    ]
+                ),
+            ),
+        ]
+    ]
+    t_info = Table(info_data, colWidths=[4.5 * inch, 2.5 * inch])
+    t_info.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")]))
+    elements.append(t_info)
+    elements.append(Spacer(1, 20))
+    elements.append(
+        Paragraph(
+            f"A CONTINUACION LE MOSTRAMOS UNA LISTA DE NOTAS DE ENTREGA PENDIENTES DE PAGO A {doc['statement_date']}",
+            styles["Normal"],
+        )
+    )
+    elements.append(Spacer(1, 10))
+    trans_data = [
+        [
+            "FECHA",
+            "NOTA DE ENTREGA",
+            "CUENTA",
+            "DESCRIPCIÓN",
+            "CANTIDAD",
+            "PAGADO",
+            "DEBIDO",
+        ]
+    ]
+    for t in doc["transactions"]:
+        trans_data.append(
+            [
+                t["date"],
+                t["invoice_no"],
+                t["reference"],
+                Paragraph(t["description"], styles["Normal"]),
+                f"{t['amount']:,.2f}",
+                f"{t['paid']:,.2f}",
+                f"{t['amount'] - t['paid']:,.2f}",
+            ]
+        )
+    t_trans = Table(
+        trans_data,
+        colWidths=[
+            1 * inch,
+            0.8 * inch,
+            1 * inch,
+            2.2 * inch,
+            0.8 * inch,
+            0.8 * inch,
+            0.9 * inch,
+        ],
+    )
+    t_trans.setStyle(
+        TableStyle(
+            [
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+                ("ALIGN", (4, 1), (-1, -1), "RIGHT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("PADDING", (0, 0), (-1, -1), 4),
+            ]
+        )
+    )
+    elements.append(t_trans)
+    elements.append(Spacer(1, 20))
+    aging = aging_buckets(doc["transactions"], doc["statement_date"])
+    aging_data = [
+        ["CURRENCY", "-30", "+30", "+60", "+90", "TOTAL DEBIDO"],
+        [
+            "USD",
+            f"{aging['current']:,.2f}",
+            f"{aging['30']:,.2f}",
+            f"{aging['60']:,.2f}",
+            f"{aging['90']:,.2f}",
+            f"{total_due(doc['transactions']):,.2f}",
+        ],
+    ]
+    t_aging = Table(
+        aging_data,
+        colWidths=[
+            1 * inch,
+            1 * inch,
+            1 * inch,
+            1 * inch,
+            1 * inch,
+            1.5 * inch,
+        ],
+    )
+    t_aging.setStyle(
+        TableStyle(
+            [
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+                ("FONTSIZE", (0, 0), (-1, -1), 9),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ]
+        )
+    )
+    elements.append(t_aging)
+    pdf.build(elements)
+    return buffer.getvalue()
+
+
+def build_excel(doc: dict) -> bytes:
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Estado de Cuenta"
+    ws["A1"] = doc["provider_name"]
+    ws["A2"] = doc["provider_address"]
+    ws["A3"] = doc["provider_city_state_zip"]
+    ws["E1"] = "ESTADO DE CUENTA"
+    ws["E1"].font = Font(bold=True, size=14)
+    ws["A6"] = "CLIENTE:"
+    ws["A7"] = doc["client_name"]
+    ws["A8"] = doc["client_address"]
+    ws["A9"] = f"{doc['client_city']} {doc['client_state']}"
+    ws["A10"] = doc["client_country"]
+    ws["E6"] = "NÚMERO DE CUENTA"
+    ws["F6"] = doc["account_number"]
+    ws["E7"] = "TÉRMINOS"
+    ws["F7"] = doc["terms"]
+    ws["E8"] = "FECHA"
+    ws["F8"] = doc["statement_date"]
+    headers = [
+        "FECHA",
+        "NOTA DE ENTREGA",
+        "CUENTA",
+        "DESCRIPCIÓN",
+        "CANTIDAD",
+        "PAGADO",
+        "DEBIDO",
+    ]
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=13, column=col, value=header)
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill(
+            start_color="CCCCCC", end_color="CCCCCC", fill_type="solid"
+        )
+    row = 14
+    for t in doc["transactions"]:
+        ws.cell(row=row, column=1, value=t["date"])
+        ws.cell(row=row, column=2, value=t["invoice_no"])
+        ws.cell(row=row, column=3, value=t["reference"])
+        ws.cell(row=row, column=4, value=t["description"])
+        ws.cell(row=row, column=5, value=t["amount"])
+        ws.cell(row=row, column=6, value=t["paid"])
+        ws.cell(row=row, column=7, value=t["amount"] - t["paid"])
+        row += 1
+    row += 2
+    aging = aging_buckets(doc["transactions"], doc["statement_date"])
+    ws.cell(row=row, column=1, value="AGING")
+    ws.cell(row=row + 1, column=1, value="Current")
+    ws.cell(row=row + 1, column=2, value=aging["current"])
+    ws.cell(row=row + 1, column=3, value="30 Days")
+    ws.cell(row=row + 1, column=4, value=aging["30"])
+    ws.cell(row=row + 1, column=5, value="60 Days")
+    ws.cell(row=row + 1, column=6, value=aging["60"])
+    ws.cell(row=row + 1, column=7, value="Total Due")
+    ws.cell(row=row + 1, column=8, value=total_due(doc["transactions"]))
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,169 @@
+"""Month-end statement run: one ESTADO DE CUENTA per client from a ledger.
+
+Usage::
+
+    python -m app.render.statement_run ledger.csv --statement-date 2024-05-31 -o estados/
+
+The ledger (CSV or XLSX) has one transaction per row with an
+``account_number`` column, the transaction columns of a statement
+(``date``, ``invoice_no``, ``reference``, ``description``, ``amount``,
+``paid``) and optionally the client columns (``client_name``,
+``client_address``, ``client_city``, ``client_state``, ``client_country``,
+``terms``). Rows are grouped by account in a single pass and every account
+is rendered with the regular statement layout on a process pool.
+
+Completed accounts are appended to a checkpoint file in the output
+directory, so running the same command again after an interruption only
+renders the accounts that are still missing.
+"""
+
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+from app.render import render
+from app.render.cli import run_bounded
+from app.render.statement import TRANSACTION_DEFAULTS
+
+CLIENT_FIELDS = [
+    "client_name",
+    "client_address",
+    "client_city",
+    "client_state",
+    "client_country",
+    "terms",
+]
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value).strip()
+
+
+def read_ledger(path: Path):
+    """Yield ledger rows as dicts of strings from a CSV or XLSX file."""
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [_cell(h) for h in next(rows, [])]
+            for values in rows:
+                yield {h: _cell(v) for h, v in zip(header, values) if h}
+        finally:
+            wb.close()
+    else:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                yield {k.strip(): _cell(v) for k, v in row.items() if k}
+
+
+def group_by_account(rows, statement_date: str) -> dict[str, dict]:
+    """Build one statement payload per ``account_number`` in a single pass."""
+    statements: dict[str, dict] = {}
+    for row in rows:
+        account = row.get("account_number", "")
+        if not account:
+            continue
+        statement = statements.get(account)
+        if statement is None:
+            statement = statements[account] = {
+                "account_number": account,
+                "statement_date": statement_date,
+                "transactions": [],
+                **{field: "" for field in CLIENT_FIELDS},
+            }
+        for field in CLIENT_FIELDS:
+            if not statement[field] and row.get(field):
+                statement[field] = row[field]
+        statement["transactions"].append(
+            {field: row.get(field, default) for field, default in TRANSACTION_DEFAULTS.items()}
+        )
+    return statements
+
+
+def render_statement(data: dict, fmt: str, path: str) -> str:
+    """Render one client's statement and move it into place atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(render("statement", fmt, data))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_checkpoint(path: Path) -> set[str]:
+    if not path.exists():
+        return set()
+    return {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+
+def run(ledger: str, statement_date: str, output_dir: str, fmt: str, workers: int) -> int:
+    """Render every pending account and return the number of failures."""
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = out / f".statement_run_{statement_date}_{fmt}.done"
+    done = load_checkpoint(checkpoint_path)
+
+    statements = group_by_account(read_ledger(Path(ledger)), statement_date)
+    pending = [account for account in statements if account not in done]
+    print(
+        f"{len(statements)} cuentas, {len(statements) - len(pending)} ya generadas, "
+        f"{len(pending)} pendientes",
+        file=sys.stderr,
+    )
+
+    jobs = (
+        (
+            account,
+            (statements[account], fmt, str(out / f"Statement_{account}_{statement_date}.{fmt}")),
+        )
+        for account in pending
+    )
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool, open(
+        checkpoint_path, "a", encoding="utf-8"
+    ) as checkpoint:
+        for account, future in run_bounded(pool, render_statement, jobs, workers * 4):
+            try:
+                print(future.result())
+            except Exception as e:
+                failures += 1
+                print(f"{account}: {e}", file=sys.stderr)
+                continue
+            checkpoint.write(f"{account}\n")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.render.statement_run",
+        description="Generate the month-end account statement of every client in a ledger.",
+    )
+    parser.add_argument("ledger", help="CSV or XLSX ledger with all clients' transactions")
+    parser.add_argument(
+        "--statement-date",
+        default=date.today().strftime("%Y-%m-%d"),
+        help="statement date used for the aging buckets (YYYY-MM-DD)",
+    )
+    parser.add_argument("-o", "--output-dir", default=".", help="directory for the statements")
+    parser.add_argument("-f", "--format", choices=["pdf", "xlsx"], default="pdf")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=os.cpu_count() or 1, help="render worker processes"
+    )
+    args = parser.parse_args(argv)
+    failures = run(args.ledger, args.statement_date, args.output_dir, args.format, args.workers)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
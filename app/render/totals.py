@@ -0,0 +1,118 @@
+"""Document math shared by the renderers.
+
+Everything here works on plain dict rows so it can run in processes that
+never import Reflex or pydantic. The line amount and summary helpers only
+use arithmetic, so the forms also apply them to Reflex vars to show the same
+figures while a number is being typed (see app.components.drafts).
+"""
+
+from datetime import date, datetime
+from functools import lru_cache
+
+
+def as_float(value) -> float:
+    """Coerce a payload value to float, treating blanks as zero."""
+    if value == "" or value is None:
+        return 0.0
+    return float(value)
+
+
+@lru_cache(maxsize=4096)
+def parse_iso_date(value: str) -> date | None:
+    """Parse a ``YYYY-MM-DD`` string, or return None when blank or invalid.
+
+    Cached, since a statement repeats the same few dates across its rows.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def parse_date(value: str) -> date:
+    """Parse a ``YYYY-MM-DD`` string, falling back to today like the UI does."""
+    return parse_iso_date(value) or date.today()
+
+
+def aging_bucket(statement_date: date, invoice_date: date) -> str:
+    """Return the aging bucket key for an invoice on a statement."""
+    days_diff = (statement_date - invoice_date).days
+    if days_diff < 30:
+        return "current"
+    elif days_diff < 60:
+        return "30"
+    elif days_diff < 90:
+        return "60"
+    return "90"
+
+
+def aging_buckets(transactions: list[dict], statement_date: str) -> dict[str, float]:
+    buckets = {"current": 0.0, "30": 0.0, "60": 0.0, "90": 0.0}
+    stmt_date = parse_date(statement_date)
+    for t in transactions:
+        key = aging_bucket(stmt_date, parse_date(t["date"]))
+        buckets[key] += t["amount"] - t["paid"]
+    return buckets
+
+
+def total_due(transactions: list[dict]) -> float:
+    return sum([t["amount"] - t["paid"] for t in transactions])
+
+
+def invoice_line_amount(quantity, unit_price, discount):
+    """An invoice line's amount: the discount is per unit."""
+    return quantity * (unit_price - discount)
+
+
+def quotation_line_amount(quantity, unit_price, discount):
+    """A quotation line's amount: the discount is for the whole line."""
+    return quantity * unit_price - discount
+
+
+def invoice_totals(items: list[dict], tax_rate: float) -> dict[str, float]:
+    return invoice_summary(sum([item["amount"] for item in items]), tax_rate)
+
+
+def invoice_summary(subtotal: float, tax_rate: float) -> dict[str, float]:
+    """Invoice totals from the sum of its item amounts."""
+    tax_amount = subtotal * (tax_rate / 100)
+    return {"subtotal": subtotal, "tax_amount": tax_amount, "total": subtotal + tax_amount}
+
+
+def quotation_totals(
+    items: list[dict], tax_rate: float, shipping_cost: float, discount_global: float
+) -> dict[str, float]:
+    subtotal = sum([item["amount"] for item in items])
+    return quotation_summary(subtotal, tax_rate, shipping_cost, discount_global)
+
+
+def quotation_summary(
+    subtotal: float, tax_rate: float, shipping_cost: float, discount_global: float
+) -> dict[str, float]:
+    """Quotation totals from the sum of its item amounts."""
+    subtotal_after_discount = subtotal - discount_global
+    tax_amount = subtotal_after_discount * (tax_rate / 100)
+    return {
+        "subtotal": subtotal,
+        "discount_total": discount_global,
+        "subtotal_after_discount": subtotal_after_discount,
+        "tax_amount": tax_amount,
+        "total": subtotal_after_discount + tax_amount + shipping_cost,
+    }
+
+
+def cubic_feet(largo: float, ancho: float, alto: float) -> float:
+    """Volume in cubic feet from dimensions in inches."""
+    if largo > 0 and ancho > 0 and alto > 0:
+        return (largo * ancho * alto) / 1728  # Convert cubic inches to cubic feet
+    return 0.0
+
+
+def warehouse_totals(dimensions: list[dict]) -> dict[str, float]:
+    return {
+        "total_bultos": sum([d["bultos"] for d in dimensions]),
+        "calculated_peso_bruto": sum([d["pounds"] for d in dimensions]),
+        "calculated_volumen": sum([d["cubic_feet"] for d in dimensions]),
+    }
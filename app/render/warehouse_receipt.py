@@ -0,0 +1,375 @@
+"""Warehouse Receipt (Recibo de Almacén) PDF and Excel layouts."""
+
+import io
+import logging
+
+from app.render import asset_path
+from app.render.totals import as_float, cubic_feet, warehouse_totals
+
+LEGAL_DISCLAIMER = (
+    "Nuestra empresa no se hace responsable por pérdida o daños totales y/o parciales de mercancía "
+    "que NO SE ENCUENTRE ASEGURADA. El seguro únicamente aplicará bajo previa inspección de "
+    "los artículos y aprobación de los mismos. Igualmente, Nosglobal Logistic no se hace responsable de "
+    "paquetes perdidos en tránsito desde su proveedor hasta nuestros almacenes, ni de paquetes que "
+    "no contengan el servicio de firma requerida. Por tal razón, recomendamos que sus envíos sean "
+    "manejados por empresas que puedan proveerle un número de rastreo (tracking) para de este "
+    "modo tener un mayor control de su mercancía. Les recomendamos los pesos promedio por caja "
+    "es de un máximo de 90 Lbs. Cajas que sobrepase los pesos permitidos, La Compañía no se hace "
+    "responsable por daños en el manejo de su carga. Los equipos electrónicos como Televisores se "
+    "reciben solamente como mercancía general."
+)
+
+DEFAULTS = {
+    "receipt_number": "",
+    "warehouse_location": "",
+    "receipt_date": "",
+    "company_name": "Nosglobal Logistic",
+    "company_logo_url": "/nosglobal-logo.png",
+    "peso_bruto": 0.0,
+    "volumen": 0.0,
+    "peso_tasable": 0.0,
+    "oficina": "",
+    "remitente": "",
+    "referencia": "",
+    "destinatario": "",
+    "no_pedido": "",
+    "entregado_por": "",
+    "tracking_number": "",
+    "factura": "",
+    "descripcion": "",
+    "dimensions": [],
+    "legal_disclaimer": LEGAL_DISCLAIMER,
+}
+
+DIMENSION_DEFAULTS = {
+    "bultos": 1,
+    "largo": 0.0,
+    "ancho": 0.0,
+    "alto": 0.0,
+    "pounds": 0.0,
+    "pt": 0.0,
+    "referencia": "",
+}
+
+
+def normalize(data: dict) -> dict:
+    """Fill in defaults and recompute volumes of a warehouse receipt payload."""
+    doc = {**DEFAULTS, **data}
+    for field in ["peso_bruto", "volumen", "peso_tasable"]:
+        doc[field] = as_float(doc[field])
+    dimensions = []
+    for d in doc["dimensions"] or []:
+        d = {**DIMENSION_DEFAULTS, **d}
+        d["bultos"] = int(as_float(d["bultos"]))
+        for field in ["largo", "ancho", "alto", "pounds", "pt"]:
+            d[field] = as_float(d[field])
+        d["cubic_feet"] = cubic_feet(d["largo"], d["ancho"], d["alto"])
+        dimensions.append(d)
+    doc["dimensions"] = dimensions
+    return doc
+
+
+def build_pdf(doc: dict) -> bytes:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    buffer = io.BytesIO()
+    pdf = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        rightMargin=40,
+        leftMargin=40,
+        topMargin=40,
+        bottomMargin=40,
+    )
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Header with logo support
+    logo_path = asset_path(doc["company_logo_url"])
+    left_content = []
+
+    # Add logo if it exists
+    if logo_path:
+        try:
+            logo = Image(str(logo_path), width=0.8*inch, height=0.8*inch)
+            left_content.append([logo])
+        except Exception as e:
+            logging.warning(f"Could not load logo: {e}")
+
+    # Add company name
+    left_content.append([Paragraph(f"<b>{doc['company_name']}</b>", styles["Normal"])])
+
+    # Create nested table for left column if logo exists
+    if len(left_content) > 1:
+        left_table = Table(left_content, colWidths=[1.5 * inch])
+        left_table.setStyle(TableStyle([
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 0),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+        ]))
+        left_cell = left_table
+    else:
+        left_cell = Paragraph(f"<b>{doc['company_name']}</b>", styles["Normal"])
+
+    header_data = [
+        [
+            left_cell,
+            Paragraph(
+                f"<font size=18><b>RECIBO DE ALMACÉN</b></font><br/><br/>"
+                f"<font size=16><b>{doc['receipt_number']}</b></font><br/><br/>"
+                f"<font size=12><b>{doc['warehouse_location']}</b></font>",
+                styles["Normal"],
+            ),
+        ]
+    ]
+    t_header = Table(header_data, colWidths=[4 * inch, 3 * inch])
+    t_header.setStyle(
+        TableStyle(
+            [
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("ALIGN", (1, 0), (1, 0), "RIGHT"),
+            ]
+        )
+    )
+    elements.append(t_header)
+    elements.append(Spacer(1, 30))
+
+    # Details section
+    details_data = [
+        ["Fecha", doc["receipt_date"], "Oficina", doc["oficina"]],
+        ["Remitente", doc["remitente"], "Referencia", doc["referencia"]],
+        ["Destinatario", doc["destinatario"], "No. Pedido", doc["no_pedido"]],
+        ["Entregado por", doc["entregado_por"], "Factura", doc["factura"]],
+        ["Tracking", doc["tracking_number"], "", ""],
+        ["Descripción", doc["descripcion"], "", ""],
+    ]
+    t_details = Table(
+        details_data, colWidths=[1.5 * inch, 2 * inch, 1.5 * inch, 2 * inch]
+    )
+    t_details.setStyle(
+        TableStyle(
+            [
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("BACKGROUND", (0, 0), (-1, -1), colors.Color(0.96, 0.96, 0.96)),  # Light grey background
+                ("FONTSIZE", (0, 0), (-1, -1), 9),
+                ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+                ("FONTNAME", (2, 0), (2, -1), "Helvetica-Bold"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("PADDING", (0, 0), (-1, -1), 6),
+            ]
+        )
+    )
+    elements.append(t_details)
+    elements.append(Spacer(1, 30))
+
+    # Dimensions table
+    elements.append(Paragraph("<b>Dimensiones de Paquetes</b>", styles["Heading4"]))
+    elements.append(Spacer(1, 10))
+
+    dim_headers = [
+        "Bultos",
+        "Largo",
+        "Ancho",
+        "Alto",
+        "Pounds",
+        "Cubic Feet",
+        "PT",
+        "Referencia",
+    ]
+    dim_data = [dim_headers]
+    for d in doc["dimensions"]:
+        dim_data.append(
+            [
+                str(d["bultos"]),
+                f"{d['largo']:.1f}" if d["largo"] > 0 else "X",
+                f"{d['ancho']:.1f}" if d["ancho"] > 0 else "X",
+                f"{d['alto']:.1f}" if d["alto"] > 0 else "X",
+                f"{d['pounds']:.1f} lbs",
+                f"{d['cubic_feet']:.3f}",
+                str(d["pt"]) if d["pt"] > 0 else "",
+                d["referencia"],
+            ]
+        )
+    t_dimensions = Table(
+        dim_data,
+        colWidths=[
+            0.6 * inch,
+            0.7 * inch,
+            0.7 * inch,
+            0.7 * inch,
+            0.9 * inch,
+            1 * inch,
+            0.6 * inch,
+            1.3 * inch,
+        ],
+    )
+    t_dimensions.setStyle(
+        TableStyle(
+            [
+                # Remove full grid, use only horizontal lines for row separation
+                ("LINEBELOW", (0, 0), (-1, 0), 1, colors.grey),  # Bold line under header
+                ("LINEBELOW", (0, 1), (-1, -1), 0.25, colors.Color(0.9, 0.9, 0.9)),  # Light lines under rows
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                ("FONTSIZE", (0, 0), (-1, -1), 9),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("PADDING", (0, 0), (-1, -1), 6),
+            ]
+        )
+    )
+    elements.append(t_dimensions)
+    elements.append(Spacer(1, 30))
+
+    # Archive section
+    elements.append(Paragraph("<b>Archivo</b>", styles["Heading4"]))
+    elements.append(Spacer(1, 5))
+
+    # Create a styled box for the archive message
+    archive_data = [["No se han encontrado registros"]]
+    t_archive = Table(archive_data, colWidths=[7 * inch])
+    t_archive.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.Color(0.96, 0.96, 0.96)),
+                ("FONTSIZE", (0, 0), (-1, -1), 9),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.Color(0.5, 0.5, 0.5)),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("PADDING", (0, 0), (-1, -1), 8),
+                ("BOX", (0, 0), (-1, -1), 0.5, colors.Color(0.85, 0.85, 0.85)),
+            ]
+        )
+    )
+    elements.append(t_archive)
+    elements.append(Spacer(1, 30))
+
+    # Legal disclaimer with top border
+    disclaimer_data = [[Paragraph(f"<font size=7>{doc['legal_disclaimer']}</font>", styles["Normal"])]]
+    t_disclaimer = Table(disclaimer_data, colWidths=[7 * inch])
+    t_disclaimer.setStyle(
+        TableStyle(
+            [
+                ("LINEABOVE", (0, 0), (-1, 0), 1, colors.Color(0.85, 0.85, 0.85)),
+                ("TOPPADDING", (0, 0), (-1, -1), 15),
+                ("LEFTPADDING", (0, 0), (-1, -1), 0),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 0),
+            ]
+        )
+    )
+    elements.append(t_disclaimer)
+
+    pdf.build(elements)
+    return buffer.getvalue()
+
+
+def build_excel(doc: dict) -> bytes:
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Recibo de Almacen"
+    totals = warehouse_totals(doc["dimensions"])
+
+    title_font = Font(bold=True, size=16)
+    header_font = Font(bold=True)
+    gray_fill = PatternFill(
+        start_color="EEEEEE", end_color="EEEEEE", fill_type="solid"
+    )
+
+    # Header
+    ws["A1"] = doc["company_name"]
+    ws["A1"].font = title_font
+    ws["E1"] = f"RECIBO DE ALMACÉN {doc['receipt_number']}"
+    ws["E1"].font = title_font
+    ws["E2"] = doc["warehouse_location"]
+    ws["E2"].font = header_font
+
+    # Summary
+    ws["A4"] = "Bultos"
+    ws["B4"] = "Peso Bruto"
+    ws["C4"] = "Volumen"
+    ws["D4"] = "Peso Tasable"
+    for cell in ["A4", "B4", "C4", "D4"]:
+        ws[cell].font = header_font
+        ws[cell].fill = gray_fill
+
+    ws["A5"] = totals["total_bultos"]
+    ws["B5"] = f"{totals['calculated_peso_bruto']:.2f} pound(s)"
+    ws["C5"] = f"{totals['calculated_volumen']:.3f} cubic feet"
+    ws["D5"] = f"{doc['peso_tasable']:.2f} pound(s)"
+
+    # Details
+    row = 7
+    details = [
+        ["Fecha", doc["receipt_date"]],
+        ["Oficina", doc["oficina"]],
+        ["Remitente", doc["remitente"]],
+        ["Referencia", doc["referencia"]],
+        ["Destinatario", doc["destinatario"]],
+        ["No. Pedido", doc["no_pedido"]],
+        ["Entregado por", doc["entregado_por"]],
+        ["Tracking", doc["tracking_number"]],
+        ["Factura", doc["factura"]],
+        ["Descripción", doc["descripcion"]],
+    ]
+    for label, value in details:
+        ws.cell(row=row, column=1, value=label).font = header_font
+        ws.cell(row=row, column=2, value=value)
+        row += 1
+
+    # Dimensions table
+    row += 2
+    headers = [
+        "Bultos",
+        "Largo",
+        "Ancho",
+        "Alto",
+        "Pounds",
+        "Cubic Feet",
+        "PT",
+        "Referencia",
+    ]
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=row, column=col, value=header)
+        cell.font = header_font
+        cell.fill = gray_fill
+
+    row += 1
+    for d in doc["dimensions"]:
+        ws.cell(row=row, column=1, value=d["bultos"])
+        ws.cell(
+            row=row, column=2, value=d["largo"] if d["largo"] > 0 else "X"
+        )
+        ws.cell(
+            row=row, column=3, value=d["ancho"] if d["ancho"] > 0 else "X"
+        )
+        ws.cell(
+            row=row, column=4, value=d["alto"] if d["alto"] > 0 else "X"
+        )
+        ws.cell(row=row, column=5, value=d["pounds"])
+        ws.cell(row=row, column=6, value=d["cubic_feet"])
+        ws.cell(row=row, column=7, value=d["pt"])
+        ws.cell(row=row, column=8, value=d["referencia"])
+        row += 1
+
+    # Archive section
+    row += 2
+    ws.cell(row=row, column=1, value="ARCHIVO:").font = header_font
+    row += 1
+    ws.cell(row=row, column=1, value="No se han encontrado registros")
+
+    # Adjust column widths
+    ws.column_dimensions["A"].width = 20
+    ws.column_dimensions["B"].width = 30
+    ws.column_dimensions["C"].width = 15
+    ws.column_dimensions["D"].width = 15
+    ws.column_dimensions["E"].width = 25
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
@@ -0,0 +1,277 @@
+"""Watch-folder daemon: render document requests dropped into an inbox.
+
+Usage::
+
+    python -m app.render.watch buzon/ -o salida/ -j 4
+
+Systems that cannot call the batch API drop JSON/NDJSON files with
+document requests (``{"type", "format", "data"}``, the same payloads as
+``python -m app.render``) into the inbox. Each file is claimed by renaming
+it into ``<inbox>/processing``, rendered on a worker pool with the regular
+layouts, and then moved to ``<inbox>/done`` or ``<inbox>/failed`` (with a
+``.errors.txt`` next to it).
+
+Every move is an atomic rename. A claimed file is renamed with the time it
+was claimed, and output names are derived from that name, so dropping a file
+with the same name again never overwrites earlier output, while a restart
+only re-renders the files left in ``processing`` and overwrites their
+partial output instead of duplicating it. If a worker process dies, the pool
+is rebuilt and the files it was rendering are queued again (up to
+``MAX_CRASHES`` times each). Writers should create files under another name
+(e.g. ``.tmp``) and rename them to ``.json`` when complete; files modified in
+the last ``--settle`` seconds are left alone as a safety net.
+"""
+
+import argparse
+import logging
+import os
+import signal
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+
+from app.render import DOCUMENT_TYPES, parse_request, render
+from app.render.cli import iter_requests
+
+SUFFIXES = (".json", ".ndjson")
+# Worker crashes a file may cause before it is moved to failed
+MAX_CRASHES = 3
+
+
+def output_name(stem: str, index: int, count: int, doc_type: str, fmt: str, data: dict) -> str:
+    """Deterministic output file name for request ``index`` of input ``stem``."""
+    prefix, key = DOCUMENT_TYPES[doc_type]
+    suffix = f"_{index}" if count > 1 else ""
+    return f"{prefix}_{data.get(key, '')}_{stem}{suffix}.{fmt}"
+
+
+def process_file(path: str, outbox: str) -> tuple[int, list[str]]:
+    """Render every request in one claimed input file; runs inside a pool worker.
+
+    Returns the number of documents written and the error messages of the
+    requests that failed.
+    """
+    source = Path(path)
+    with open(source, encoding="utf-8") as f:
+        payloads = list(iter_requests(f))
+    written, errors = 0, []
+    for index, (payload, error) in enumerate(payloads, 1):
+        try:
+            if error:
+                raise error
+            doc_type, fmt, data = parse_request(payload)
+            target = Path(outbox) / output_name(
+                source.stem, index, len(payloads), doc_type, fmt, data
+            )
+            tmp_path = target.with_name(f".{target.name}.tmp")
+            tmp_path.write_bytes(render(doc_type, fmt, data))
+            os.replace(tmp_path, target)
+            written += 1
+        except Exception as e:
+            errors.append(f"{index}: {e}")
+    return written, errors
+
+
+def _ignore_sigint():
+    # Ctrl+C reaches the whole process group; only the watcher reacts to it
+    # so in-flight files can finish instead of failing with KeyboardInterrupt.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class Watcher:
+    """Polls an inbox and keeps a bounded number of files rendering at once."""
+
+    def __init__(self, inbox: str, outbox: str, workers: int, interval: float, settle: float):
+        self.inbox = Path(inbox)
+        self.outbox = Path(outbox)
+        self.processing = self.inbox / "processing"
+        self.done = self.inbox / "done"
+        self.failed = self.inbox / "failed"
+        self.workers = workers
+        self.interval = interval
+        self.settle = settle
+        self.max_pending = workers * 4
+        self.stopping = False
+        self.started = time.monotonic()
+        self.stats = {"files": 0, "documents": 0, "failed_files": 0, "failed_documents": 0}
+        self.crashes: Counter[Path] = Counter()
+        for folder in (self.outbox, self.processing, self.done, self.failed):
+            folder.mkdir(parents=True, exist_ok=True)
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def claim(self, limit: int) -> list[Path]:
+        """Move up to ``limit`` settled inbox files into ``processing``."""
+        now = time.time()
+        candidates = []
+        with os.scandir(self.inbox) as entries:
+            for entry in entries:
+                if not entry.name.endswith(SUFFIXES) or not entry.is_file():
+                    continue
+                try:
+                    if now - entry.stat().st_mtime < self.settle:
+                        continue
+                except FileNotFoundError:
+                    continue
+                candidates.append(entry.name)
+        claimed = []
+        for name in sorted(candidates)[:limit]:
+            target = self.processing / f"{datetime.now():%Y%m%d-%H%M%S-%f}_{name}"
+            try:
+                os.rename(self.inbox / name, target)
+            except FileNotFoundError:
+                continue  # claimed by another watcher
+            claimed.append(target)
+        return claimed
+
+    def finish(self, path: Path, written: int, errors: list[str]):
+        self.stats["files"] += 1
+        self.stats["documents"] += written
+        if not errors:
+            os.replace(path, self.done / path.name)
+            return
+        self.stats["failed_files"] += 1
+        self.stats["failed_documents"] += len(errors)
+        error_path = self.failed / f"{path.name}.errors.txt"
+        error_path.write_text("\n".join(errors) + "\n", encoding="utf-8")
+        os.replace(path, self.failed / path.name)
+        logging.error(f"{path.name}: {len(errors)} solicitudes fallidas, ver {error_path}")
+
+    def report(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        stats = self.stats
+        logging.info(
+            f"{stats['files']} archivos, {stats['documents']} documentos "
+            f"({stats['files'] / elapsed:.1f} archivos/s, "
+            f"{stats['documents'] / elapsed:.1f} documentos/s), "
+            f"{stats['failed_files']} archivos fallidos"
+        )
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_sigint)
+
+    def _requeue(self, paths: list[Path]) -> list[Path]:
+        """Files to render again after a worker crash; the rest are failed.
+
+        A crash only counts against a file that was rendering alone; files
+        caught in a crash together are retried one at a time to find out
+        which one caused it.
+        """
+        requeued = []
+        for path in paths:
+            self.crashes[path] += len(paths) == 1
+            if self.crashes[path] < MAX_CRASHES:
+                requeued.append(path)
+            else:
+                del self.crashes[path]
+                self.finish(path, 0, [f"El proceso de generación terminó {MAX_CRASHES} veces"])
+        return requeued
+
+    def run(self, report_every: float = 60.0):
+        """Process files until SIGINT/SIGTERM, then drain in-flight work."""
+        # Files left in processing by a previous run were never moved out,
+        # so they are rendered again before new inbox files are claimed.
+        backlog = sorted(self.processing.iterdir())
+        if backlog:
+            logging.info(f"Reanudando {len(backlog)} archivos pendientes de la corrida anterior")
+        pending = {}
+        last_report = time.monotonic()
+        pool = self._new_pool()
+        try:
+            while not self.stopping or pending:
+                claimed, crashed = [], []
+                if not self.stopping and len(pending) < self.max_pending:
+                    free = self.max_pending - len(pending)
+                    if backlog and backlog[0] in self.crashes:
+                        if not pending:
+                            claimed, backlog = backlog[:1], backlog[1:]
+                    else:
+                        claimed, backlog = backlog[:free], backlog[free:]
+                        if len(claimed) < free:
+                            claimed += self.claim(free - len(claimed))
+                    for index, path in enumerate(claimed):
+                        try:
+                            pending[pool.submit(process_file, str(path), str(self.outbox))] = path
+                        except BrokenProcessPool:
+                            crashed = claimed[index:]
+                            break
+
+                if pending and not crashed:
+                    full = len(pending) >= self.max_pending
+                    done, _ = wait(
+                        pending,
+                        timeout=self.interval if full or not claimed else 0,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        path = pending.pop(future)
+                        try:
+                            written, errors = future.result()
+                        except BrokenProcessPool:
+                            crashed.append(path)
+                            continue
+                        except Exception as e:
+                            written, errors = 0, [str(e)]
+                        self.crashes.pop(path, None)
+                        self.finish(path, written, errors)
+                elif not pending and not claimed:
+                    time.sleep(self.interval)
+
+                if crashed:
+                    # Every file on the broken pool has to be rendered again
+                    crashed += pending.values()
+                    pending.clear()
+                    logging.error(
+                        f"Un proceso de generación terminó inesperadamente; "
+                        f"reiniciando y reintentando {len(crashed)} archivos"
+                    )
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self._new_pool()
+                    backlog = self._requeue(crashed) + backlog
+
+                if time.monotonic() - last_report >= report_every:
+                    self.report()
+                    last_report = time.monotonic()
+        finally:
+            pool.shutdown()
+        self.report()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.render.watch",
+        description="Render document requests dropped as JSON/NDJSON files into an inbox folder.",
+    )
+    parser.add_argument("inbox", help="folder polled for .json/.ndjson request files")
+    parser.add_argument("-o", "--output-dir", required=True, help="folder for the generated files")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=os.cpu_count() or 1, help="render worker processes"
+    )
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between inbox scans")
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=1.0,
+        help="skip files modified less than this many seconds ago",
+    )
+    parser.add_argument(
+        "--report-every", type=float, default=60.0, help="seconds between throughput logs"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    watcher = Watcher(args.inbox, args.output_dir, args.workers, args.interval, args.settle)
+    signal.signal(signal.SIGINT, watcher.stop)
+    signal.signal(signal.SIGTERM, watcher.stop)
+    logging.info(f"Vigilando {watcher.inbox} -> {watcher.outbox} con {args.workers} procesos")
+    watcher.run(args.report_every)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
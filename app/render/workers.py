@@ -0,0 +1,265 @@
+"""Supervised render worker processes.
+
+``WorkerPool`` is a drop-in ``Executor`` for the render pool that manages
+each worker's whole lifecycle:
+
+* workers are forked from a fork server that has already imported and
+  warmed ``app.render.preload``, so a replacement starts in milliseconds;
+* a worker is recycled after ``max_jobs`` renders or once its resident
+  memory passes ``max_rss_mb``, which keeps ReportLab's slow growth in check,
+  and its replacement is started and initialized straight away;
+* each worker runs under an address-space rlimit, and every job gets a CPU
+  time rlimit of ``cpu_seconds``;
+* a job that exceeds ``timeout`` seconds of wall time has its worker killed
+  and replaced, and fails with ``TimeoutError``;
+* an optional ``initializer`` (``"module:function"``, resolved inside the
+  worker so the parent never imports it) runs in every new worker before it
+  takes jobs,
+  and ``prestart`` starts all workers up front; ``warm`` is set once each of
+  them is initialized.
+
+Each worker is driven by one supervisor thread over a pipe, so a hung or
+crashed worker only affects the job it was running.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import threading
+from concurrent.futures import Executor, Future
+
+PRELOAD = ["__main__", "app.render.preload"]
+
+_context = None
+
+
+def get_context():
+    """Fork server context whose template process has the renderers preloaded."""
+    global _context
+    if _context is None:
+        _context = multiprocessing.get_context("forkserver")
+        # "__main__" keeps children from re-importing the parent's main module
+        _context.set_forkserver_preload(PRELOAD)
+    return _context
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _worker_main(conn, memory_limit_mb: int, cpu_seconds: int, initializer: str | None):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    if initializer is not None:
+        try:
+            module, _, name = initializer.partition(":")
+            getattr(importlib.import_module(module), name)()
+        except Exception as e:
+            logging.exception(f"Render worker initializer failed: {e}")
+    conn.send("ready")
+    _, cpu_hard = resource.getrlimit(resource.RLIMIT_CPU)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        fn, args, kwargs = job
+        if cpu_seconds:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = int(usage.ru_utime + usage.ru_stime)
+            resource.setrlimit(resource.RLIMIT_CPU, (used + cpu_seconds, cpu_hard))
+        try:
+            ok, value = True, fn(*args, **kwargs)
+        except BaseException as e:
+            ok, value = False, e
+        try:
+            conn.send((ok, value, _rss_bytes()))
+        except Exception:
+            conn.send((False, RuntimeError(repr(value)), _rss_bytes()))
+
+
+class WorkerLost(RuntimeError):
+    """The worker died (e.g. killed by its CPU rlimit) while running a job."""
+
+
+class _Worker:
+    def __init__(self, pool: "WorkerPool"):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = get_context().Process(
+            target=_worker_main,
+            args=(child_conn, pool.memory_limit_mb, pool.cpu_seconds, pool.initializer),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        if not self.conn.poll(pool.timeout):
+            self.kill()
+            raise TimeoutError("Render worker did not start in time")
+        try:
+            self.conn.recv()
+        except EOFError:
+            self.process.join(1)
+            raise WorkerLost(f"Render worker exited with code {self.process.exitcode}") from None
+
+    def run(self, fn, args, kwargs, timeout: float | None):
+        self.jobs += 1
+        self.conn.send((fn, args, kwargs))
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"Render exceeded {timeout:g}s")
+        try:
+            return self.conn.recv()
+        except EOFError:
+            self.process.join(1)
+            raise WorkerLost(f"Render worker exited with code {self.process.exitcode}") from None
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(5)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool(Executor):
+    def __init__(
+        self,
+        workers: int,
+        max_jobs: int = 500,
+        max_rss_mb: int = 512,
+        memory_limit_mb: int = 2048,
+        cpu_seconds: int = 60,
+        timeout: float | None = 120.0,
+        initializer: str | None = None,
+        prestart: bool = False,
+    ):
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self.initializer = initializer
+        self.prestart = prestart
+        self.stats = {"started": 0, "recycled": 0, "killed": 0}
+        self.warm = threading.Event()
+        self._initialized = 0
+        self._lock = threading.Lock()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._supervise, name=f"render-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return self.submit_with_timeout(self.timeout, fn, *args, **kwargs)
+
+    def submit_with_timeout(self, timeout: float | None, fn, /, *args, **kwargs) -> Future:
+        """Like ``submit`` but with a job-specific wall-time limit."""
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new renders after shutdown")
+        future = Future()
+        self._queue.put((future, fn, args, kwargs, timeout))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._shutdown = True
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _start_worker(self, first: bool) -> _Worker:
+        worker = _Worker(self)
+        self.stats["started"] += 1
+        if first:
+            with self._lock:
+                self._initialized += 1
+                if self._initialized == len(self._threads):
+                    self.warm.set()
+        return worker
+
+    def _replace_worker(self) -> _Worker | None:
+        """Start and initialize a replacement now, not when the next job arrives."""
+        if self._shutdown:
+            return None
+        try:
+            return self._start_worker(first=False)
+        except Exception as e:
+            # The next job retries the start
+            logging.exception(f"Render worker failed to start: {e}")
+            return None
+
+    def _supervise(self):
+        worker: _Worker | None = None
+        first = True
+        if self.prestart:
+            try:
+                worker = self._start_worker(first)
+                first = False
+            except Exception as e:
+                logging.exception(f"Render worker failed to start: {e}")
+        while (item := self._queue.get()) is not None:
+            future, fn, args, kwargs, timeout = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if worker is None:
+                    worker = self._start_worker(first)
+                    first = False
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            try:
+                ok, value, rss = worker.run(fn, args, kwargs, timeout)
+            except (TimeoutError, WorkerLost, OSError) as e:
+                worker.kill()
+                self.stats["killed"] += 1
+                future.set_exception(e)
+                worker = self._replace_worker()
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+            if (
+                worker.jobs >= self.max_jobs
+                or rss > self.max_rss_mb * 1024 * 1024
+                or isinstance(value, MemoryError)
+            ):
+                worker.stop()
+                self.stats["recycled"] += 1
+                worker = self._replace_worker()
+        if worker is not None:
+            worker.stop()
@@ -0,0 +1,92 @@
+"""Row-level edits for the documents' line-item lists.
+
+Reflex re-sends a list var whole whenever any part of it changes, so
+editing one row in place costs every row on every keystroke. The states
+instead keep each list as a base snapshot and record edited rows in a
+companion dict keyed by row ``id`` (the list's *patches*), so a keystroke
+only re-sends the rows edited since the last snapshot.
+
+The UI overlays each row's patch on its base row with ``patched``; rows stay
+keyed by ``id``, so React never has to reconcile them by position (the
+source of the ``removeChild`` errors). Patches are folded back into the list
+on structural changes (add/remove) and once ``FOLD_AT`` rows are pending.
+
+The full list itself lives in a backend var and only the current page of
+``PAGE_SIZE`` rows is a client var, so what a session sends to the browser
+stays the same size however long the document grows. Events address rows by
+their index in the full list.
+
+Rows are slotted dataclasses with short random ids (``new_id``), and the page
+is sent by column (one list per field) rather than as a list of objects that
+repeat every field name; ``unpack`` turns it back into rows in the browser.
+"""
+
+import dataclasses
+import os
+import secrets
+from typing import Any, TypeVar
+
+import reflex as rx
+
+Row = TypeVar("Row")
+
+# Pending patched rows that trigger folding them back into the list
+FOLD_AT = 32
+
+# Rows per page sent to the client
+PAGE_SIZE = int(os.environ.get("FORM_PAGE_SIZE", "100"))
+
+
+def new_id() -> str:
+    """A random 8-character row id, unique enough within one document."""
+    return secrets.token_urlsafe(6)
+
+
+def _unwrap(value):
+    # Reflex hands out mutation-tracking proxies; work on the plain objects
+    return getattr(value, "__wrapped__", value)
+
+
+def merged(rows: list[Row], patches: dict[str, Row]) -> list[Row]:
+    """The rows with their pending patches applied, in order."""
+    rows, patches = _unwrap(rows), _unwrap(patches)
+    return [_unwrap(patches.get(row.id, row)) for row in rows]
+
+
+def checkout(rows: list[Row], patches: dict[str, Row], idx: int) -> Row:
+    """Return an editable copy of row ``idx`` with its pending patch applied."""
+    row = _unwrap(_unwrap(rows)[idx])
+    return dataclasses.replace(_unwrap(_unwrap(patches).get(row.id, row)))
+
+
+def page_start(offset: int, total: int) -> int:
+    """Clamp ``offset`` to the start of a page within ``total`` rows."""
+    last = max(total - 1, 0) // PAGE_SIZE * PAGE_SIZE
+    return min(max(offset, 0), last) // PAGE_SIZE * PAGE_SIZE
+
+
+def page(rows: list[Row], offset: int) -> dict[str, list[Any]]:
+    """The rows of the page starting at ``offset``, by column."""
+    rows = [_unwrap(row) for row in _unwrap(rows)[offset : offset + PAGE_SIZE]]
+    if not rows:
+        return {}
+    return {
+        field.name: [getattr(row, field.name) for row in rows]
+        for field in dataclasses.fields(rows[0])
+    }
+
+
+def unpack(columns: rx.Var, row_type: type) -> rx.Var:
+    """Client-side rows of a page sent by column (see ``page``)."""
+    return rx.Var(
+        _js_expr=(
+            "((c) => (c.id ?? []).map((_, i) =>"
+            f" Object.fromEntries(Object.keys(c).map((k) => [k, c[k][i]]))))({columns!s})"
+        ),
+        _var_data=columns._get_all_var_data(),
+    ).to(list[row_type])
+
+
+def patched(row: rx.Var, patches: rx.Var) -> rx.Var:
+    """Client-side view of a row with its pending patch, if any, applied."""
+    return row.to(dict).merge(patches.get(row.id, {}).to(dict)).to(row._var_type)
@@ -0,0 +1,212 @@
+"""In-memory state manager that evicts idle sessions.
+
+Reflex's memory and disk state managers keep every session's state in memory
+for as long as the process lives (or for an hour after its last event), so
+memory tracks every visitor of the day rather than the people still working
+on a document. ``IdleStateManager`` evicts a session once it has seen no
+event for ``SESSION_IDLE_TTL`` seconds. If ``SESSION_STORE_DIR`` is set (the
+default is a folder in Reflex's states directory; empty turns it off), the
+session's states are first written there as one compressed snapshot, and
+the next event for that session loads them back as if they had never left.
+Snapshots unused for ``SESSION_STORE_TTL`` seconds are deleted.
+
+The Redis state manager already expires sessions in Redis and is left alone.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import logging
+import os
+import pickle
+import time
+import zlib
+from collections.abc import AsyncIterator
+from hashlib import md5
+from pathlib import Path
+
+from reflex.state import BaseState, _split_substate_key
+from reflex.istate.manager import StateModificationContext
+from reflex.istate.manager.disk import StateManagerDisk
+from reflex.istate.manager.memory import StateManagerMemory
+from reflex.utils import prerequisites
+from reflex.utils.exceptions import StateSchemaMismatchError
+from typing_extensions import Unpack
+
+SESSION_IDLE_TTL = float(os.environ.get("SESSION_IDLE_TTL", "900"))
+SESSION_STORE_DIR = os.environ.get(
+    "SESSION_STORE_DIR", str(prerequisites.get_states_dir() / "sessions")
+)
+SESSION_STORE_TTL = float(os.environ.get("SESSION_STORE_TTL", str(24 * 60 * 60)))
+# zlib level for snapshots: row columns compress well even at low levels
+SESSION_STORE_LEVEL = int(os.environ.get("SESSION_STORE_LEVEL", "3"))
+
+stats = {"active": 0, "evicted": 0, "stored": 0, "rehydrated": 0, "store_errors": 0}
+
+
+def snapshot(root: BaseState) -> bytes:
+    """Serialize every state in ``root``'s tree into one compressed blob."""
+    blobs = {}
+    pending = [root]
+    while pending:
+        state = pending.pop()
+        blobs[state.get_full_name()] = state._serialize()
+        pending.extend(state.substates.values())
+    return zlib.compress(pickle.dumps(blobs), SESSION_STORE_LEVEL)
+
+
+def restore(fresh: BaseState, data: bytes) -> BaseState:
+    """Rebuild the state tree of ``fresh`` from a ``snapshot``.
+
+    States missing from the snapshot, or whose schema changed since it was
+    taken, keep their fresh instance.
+    """
+    blobs = pickle.loads(zlib.decompress(data))
+
+    def load(fresh_state: BaseState) -> BaseState:
+        state = fresh_state
+        blob = blobs.get(fresh_state.get_full_name())
+        if blob is not None:
+            with contextlib.suppress(StateSchemaMismatchError):
+                state = BaseState._deserialize(data=blob)
+        state.substates = {}
+        for name, fresh_substate in fresh_state.substates.items():
+            substate = load(fresh_substate)
+            substate.parent_state = state
+            state.substates[name] = substate
+        return state
+
+    return load(fresh)
+
+
+@dataclasses.dataclass
+class IdleStateManager(StateManagerMemory):
+    """Memory state manager evicting sessions idle for ``idle_ttl`` seconds."""
+
+    idle_ttl: float = SESSION_IDLE_TTL
+    # Where evicted sessions are kept, None to drop them
+    store_dir: Path | None = Path(SESSION_STORE_DIR) if SESSION_STORE_DIR else None
+    store_ttl: float = SESSION_STORE_TTL
+
+    _last_touched: dict[str, float] = dataclasses.field(default_factory=dict, init=False)
+    _sweeper: asyncio.Task | None = dataclasses.field(default=None, init=False)
+
+    def _path(self, token: str) -> Path:
+        return self.store_dir / f"{md5(token.encode()).hexdigest()}.pkl.z"
+
+    def _write(self, token: str, data: bytes):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(token)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def _store(self, token: str, state: BaseState):
+        self._write(token, snapshot(state))
+
+    def _read(self, token: str) -> bytes | None:
+        path = self._path(token)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        path.unlink(missing_ok=True)
+        return data
+
+    def _purge_store(self):
+        cutoff = time.time() - self.store_ttl
+        for path in self.store_dir.glob("*.pkl.z"):
+            with contextlib.suppress(FileNotFoundError):
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+
+    async def get_state(self, token: str) -> BaseState:
+        token = _split_substate_key(token)[0]
+        self._last_touched[token] = time.monotonic()
+        if token not in self.states and self.store_dir is not None:
+            data = await asyncio.to_thread(self._read, token)
+            # Another event may have created the state while the file was read
+            if data is not None and token not in self.states:
+                try:
+                    self.states[token] = restore(self.state(_reflex_internal_init=True), data)
+                    stats["rehydrated"] += 1
+                except Exception as e:
+                    stats["store_errors"] += 1
+                    logging.exception(f"Could not restore session state: {e}")
+        state = await super().get_state(token)
+        stats["active"] = len(self.states)
+        return state
+
+    @contextlib.asynccontextmanager
+    async def modify_state(
+        self, token: str, **context: Unpack[StateModificationContext]
+    ) -> AsyncIterator[BaseState]:
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep(), name="IdleStateManager|sweep")
+        # Touched before waiting for the lock, so the sweeper leaves it be
+        self._last_touched[_split_substate_key(token)[0]] = time.monotonic()
+        async with super().modify_state(token, **context) as state:
+            yield state
+
+    async def evict(self, token: str, idle_since: float | None = None):
+        """Drop a session's state from memory, storing it first if configured.
+
+        With ``idle_since`` (a ``time.monotonic()`` value), a session touched
+        since then, for instance by an event that was waiting for its lock,
+        is kept.
+        """
+
+        def touched() -> bool:
+            return idle_since is not None and self._last_touched.get(token, 0) >= idle_since
+
+        lock = self._states_locks.get(token)
+        async with lock if lock is not None else contextlib.nullcontext():
+            state = self.states.get(token)
+            if state is None or touched():
+                return
+            if self.store_dir is not None:
+                # The state stays registered until it is on disk, so an event
+                # arriving meanwhile waits for the lock and still finds it
+                try:
+                    await asyncio.to_thread(self._store, token, state)
+                    stats["stored"] += 1
+                except Exception as e:
+                    stats["store_errors"] += 1
+                    logging.exception(f"Could not store idle session state: {e}")
+                    return
+                if touched():
+                    # An event is waiting for this session: keep it in memory
+                    await asyncio.to_thread(self._read, token)
+                    return
+            self.states.pop(token, None)
+            self._last_touched.pop(token, None)
+            self._states_locks.pop(token, None)
+            stats["evicted"] += 1
+            stats["active"] = len(self.states)
+
+    async def _sweep(self):
+        """Evict idle sessions and purge stale snapshots, until cancelled."""
+        while True:
+            await asyncio.sleep(min(max(self.idle_ttl / 4, 1), 60))
+            cutoff = time.monotonic() - self.idle_ttl
+            for token, touched in list(self._last_touched.items()):
+                if touched < cutoff:
+                    await self.evict(token, idle_since=cutoff)
+            if self.store_dir is not None and self.store_dir.exists():
+                await asyncio.to_thread(self._purge_store)
+
+    async def close(self):
+        """Store every session still in memory, so a restart resumes them."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sweeper
+        for token in list(self.states):
+            await self.evict(token)
+
+
+def install(app):
+    """Replace the app's memory or disk state manager with an ``IdleStateManager``."""
+    manager = app.state_manager
+    if isinstance(manager, (StateManagerMemory, StateManagerDisk)):
+        app._state_manager = IdleStateManager(state=manager.state)
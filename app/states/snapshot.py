@@ -0,0 +1,104 @@
+"""Compact serialization of the document states for the state manager.
+
+With the Redis state manager every event loads each touched state and
+stores it again, pickled. Pickled one object at a time, a 1,000-row list
+repeats the row class and field names for every row and rebuilds each row
+through the dataclass's pure-Python ``__setstate__`` on load.
+
+States mixing in ``CompactRows`` store their rows by column instead: the
+full list and the pending patches become one list per field, stamped with
+``FORMAT`` and the row's field names, and the page sent to the client is not
+stored at all since it is rebuilt from the full list. A snapshot in another
+format or with other row fields fails to load with
+``StateSchemaMismatchError``, so the state manager starts that session from
+a fresh state, as it does whenever a state's own vars change.
+
+``python -m app.states.statebench`` measures the gain.
+"""
+
+import dataclasses
+from collections import deque
+from functools import cache
+from typing import Any, NamedTuple
+
+from reflex.utils.exceptions import StateSchemaMismatchError
+
+from app.states import rows
+
+# Bump when the snapshot layout below changes
+FORMAT = 1
+
+_KEY = "_compact_rows"
+
+
+class RowSet(NamedTuple):
+    """Where a state keeps one kind of row (see app.states.rows)."""
+
+    row_type: type
+    # Backend var with the full list
+    rows: str
+    # Var with the pending row patches, by id
+    patches: str
+    # Var with the page sent to the client, and its offset
+    page: str
+    offset: str
+
+
+@cache
+def _fields(row_type: type) -> tuple[str, ...]:
+    return tuple(field.name for field in dataclasses.fields(row_type))
+
+
+def pack(row_type: type, items) -> tuple[list[Any], ...]:
+    """The rows as one list per field of ``row_type``."""
+    return tuple([getattr(row, name) for row in items] for name in _fields(row_type))
+
+
+def unpack(row_type: type, fields: tuple[str, ...], columns) -> list:
+    """Rebuild the rows stored by ``pack`` with the given field names."""
+    if fields != _fields(row_type):
+        raise StateSchemaMismatchError(f"{row_type.__name__} fields changed")
+    items = [object.__new__(row_type) for _ in columns[0]] if columns else []
+    # Fill the slots a column at a time, skipping __init__ (about 3x faster)
+    for name, column in zip(fields, columns):
+        deque(map(getattr(row_type, name).__set__, items, column), maxlen=0)
+    return items
+
+
+class CompactRows:
+    """Mixin storing a state's rows by column when it is pickled.
+
+    The state lists its rows in a ``_row_sets: ClassVar[tuple[RowSet, ...]]``.
+    """
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_backend_vars"] = backend = dict(state["_backend_vars"])
+        packed = []
+        for row_set in self._row_sets:
+            patches = list(state.pop(row_set.patches).values())
+            state.pop(row_set.page)
+            packed.append(
+                (
+                    pack(row_set.row_type, backend.pop(row_set.rows)),
+                    pack(row_set.row_type, patches),
+                )
+            )
+        fields = [_fields(row_set.row_type) for row_set in self._row_sets]
+        state[_KEY] = (FORMAT, fields, packed)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        if _KEY in state:
+            version, fields, packed = state.pop(_KEY)
+            if version != FORMAT or len(fields) != len(self._row_sets):
+                raise StateSchemaMismatchError(f"Unsupported snapshot format {version}")
+            backend = state["_backend_vars"]
+            for row_set, row_fields, (items, patches) in zip(self._row_sets, fields, packed):
+                items = unpack(row_set.row_type, row_fields, items)
+                backend[row_set.rows] = items
+                state[row_set.patches] = {
+                    row.id: row for row in unpack(row_set.row_type, row_fields, patches)
+                }
+                state[row_set.page] = rows.page(items, state[row_set.offset])
+        super().__setstate__(state)
@@ -0,0 +1,110 @@
+"""Measure what the document states cost the Redis state manager per event.
+
+Usage::
+
+    python -m app.states.statebench [-r 1000] [-n 50]
+
+Each document state is filled with ``-r`` rows (every 7th one edited) and
+saved to and loaded back from an in-process stand-in for Redis ``-n`` times,
+the way ``StateManagerRedis`` does around every event. The stored size and
+the time per save and load are reported for Reflex's stock pickling of the
+state and for the compact snapshot of app.states.snapshot.
+"""
+
+import argparse
+import asyncio
+import pickle
+import sys
+import time
+
+from reflex.state import BaseState
+
+from app.states.invoice_state import InvoiceState
+from app.states.quotation_state import QuotationState
+from app.states.statement_state import StatementState
+from app.states.warehouse_receipt_state import WarehouseReceiptState
+
+# State, event adding a row, event editing a row, a text field of the row
+DOCUMENTS = [
+    (StatementState, "add_transaction", "update_transaction", "description"),
+    (InvoiceState, "add_item", "update_item", "description"),
+    (QuotationState, "add_item", "update_item", "description"),
+    (WarehouseReceiptState, "add_dimension", "update_dimension", "referencia"),
+]
+
+
+class FakeRedis:
+    """The subset of ``redis.asyncio.Redis`` the state manager saves and loads with."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+
+    async def set(self, key: str, value: bytes, ex: int | None = None):
+        self.data[key] = bytes(value)
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+
+def build(state_cls: type[BaseState], add: str, update: str, field: str, size: int):
+    root = state_cls.get_root_state()(_reflex_internal_init=True)
+    state = root.get_substate(state_cls.get_full_name().split(".")[1:])
+    for _ in range(size):
+        getattr(state_cls, add).fn(state)
+    for idx in range(0, size, 7):
+        getattr(state_cls, update).fn(state, idx, field, f"Fila {idx}")
+    return state
+
+
+def _stock_dumps(state: BaseState) -> bytes:
+    return pickle.dumps((state._to_schema(), BaseState.__getstate__(state)))
+
+
+async def round_trips(redis: FakeRedis, state: BaseState, dumps, loads, runs: int):
+    """Best time of a save followed by a load, and the stored size."""
+    key = f"bench_{state.get_full_name()}"
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        await redis.set(key, dumps(state))
+        loads(await redis.get(key))
+        best = min(best, time.perf_counter() - start)
+    return best, len(redis.data[key])
+
+
+async def run(size: int, runs: int):
+    redis = FakeRedis()
+    print(f"{'':24}{'stock pickle':>22}{'compact':>22}")
+    for state_cls, add, update, field in DOCUMENTS:
+        state = build(state_cls, add, update, field, size)
+        stock = await round_trips(redis, state, _stock_dumps, pickle.loads, runs)
+        compact = await round_trips(
+            redis,
+            state,
+            BaseState._serialize,
+            lambda data: BaseState._deserialize(data=data),
+            runs,
+        )
+        print(
+            f"{state_cls.__name__:24}"
+            + "".join(
+                f"{nbytes / 1024:9.1f} KiB {best * 1000:6.2f} ms"
+                for best, nbytes in (stock, compact)
+            )
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.states.statebench",
+        description="Report the size and save+load time of the document states.",
+    )
+    parser.add_argument("-r", "--rows", type=int, default=1000, help="rows per document")
+    parser.add_argument("-n", "--runs", type=int, default=50, help="round trips (best is kept)")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.rows, args.runs))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
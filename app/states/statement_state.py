@@ -1,28 +1,18 @@
 import reflex as rx
-from typing import Any
+from typing import Any, ClassVar
 from datetime import datetime, date
-from pathlib import Path
-import uuid
-import os
+import dataclasses
 import logging
-from pydantic import BaseModel
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Table,
-    TableStyle,
-    Paragraph,
-    Spacer,
-    Image,
-)
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from app.render import filename as render_filename, statement as statement_render
+from app.render.totals import aging_bucket, parse_iso_date
+from app.render.admission import Overloaded
+from app.render.pool import render_async
+from app.states import rows
+from app.states.snapshot import CompactRows, RowSet
 
 
-class Transaction(BaseModel):
+@dataclasses.dataclass(slots=True, kw_only=True)
+class Transaction:
     id: str
     date: str
     invoice_no: str
@@ -31,8 +21,13 @@ class Transaction(BaseModel):
     amount: float
     paid: float
 
+    @property
+    def invoice_date(self) -> date:
+        # parse_iso_date is cached, so re-reading a row's date stays cheap
+        return parse_iso_date(self.date) or date.today()
 
-class StatementState(rx.State):
+
+class StatementState(CompactRows, rx.State):
     """State for the Account Statement document."""
 
     is_loading: bool = False
@@ -48,63 +43,129 @@ class StatementState(rx.State):
     account_number: str = ""
     terms: str = ""
     statement_date: str = ""
-    transactions: list[Transaction] = []
+    # Full list of transactions; the client only gets the current page,
+    # by column, in transactions
+    _transactions: list[Transaction] = []
+    transactions: dict[str, list] = {}
+    transactions_offset: int = 0
+    # Rows edited since transactions was last re-sent, by id (see app.states.rows)
+    transaction_patches: dict[str, Transaction] = {}
+    # Stored by column when the state is persisted (see app.states.snapshot)
+    _row_sets: ClassVar[tuple[RowSet, ...]] = (
+        RowSet(
+            Transaction,
+            "_transactions",
+            "transaction_patches",
+            "transactions",
+            "transactions_offset",
+        ),
+    )
+
+    # Running balance over the transactions, kept in step by the transaction
+    # events so the total never re-reads the whole list.
+    _total_due: float = 0.0
+    # Balance per aging bucket, kept in step the same way; every row is
+    # rebucketed only when the statement date changes.
+    _aging: dict[str, float] = {"current": 0.0, "30": 0.0, "60": 0.0, "90": 0.0}
+    # Bucket each row's balance is currently counted in, by row id
+    _buckets: dict[str, str] = {}
 
     @rx.event
     def on_load(self):
         """Initialize date on client load to avoid hydration mismatch."""
         if not self.statement_date:
             self.statement_date = datetime.now().strftime("%Y-%m-%d")
+            self._rebucket()
 
     @rx.var
-    def total_due(self) -> float:
-        return sum([t.amount - t.paid for t in self.transactions])
+    def summary(self) -> dict[str, float]:
+        """Balance due and its aging buckets (current, 30, 60, 90) in one var."""
+        return {"total_due": self._total_due, **self._aging}
 
-    @rx.var
-    def aging_buckets(self) -> dict[str, float]:
-        current = 0.0
-        days_30 = 0.0
-        days_60 = 0.0
-        days_90 = 0.0
+    @rx.event
+    def set_field(self, field: str, value: str):
+        self._set_field(field, value)
 
-        # Use today's date if statement_date is empty
-        if not self.statement_date:
-            stmt_date = date.today()
+    @rx.event
+    def set_fields(self, fields: dict[str, Any]):
+        """Apply several fields in one event (autofill, paste, API prefill)."""
+        for field, value in fields.items():
+            if field in statement_render.DEFAULTS and field != "transactions":
+                self._set_field(field, value)
+            else:
+                logging.warning(f"Ignoring unknown field {field}")
+
+    def _set_field(self, field: str, value: Any):
+        setattr(self, field, value)
+        if field == "statement_date":
+            self._rebucket()
+
+    def _statement_day(self) -> date:
+        # Use today's date if statement_date is empty or invalid
+        return parse_iso_date(self.statement_date) or date.today()
+
+    def _track_transaction(self, transaction: Transaction, sign: int):
+        """Add (sign=1) or remove (sign=-1) a transaction's contribution to the totals."""
+        balance = transaction.amount - transaction.paid
+        self._total_due += sign * balance
+        if sign > 0:
+            bucket = aging_bucket(self._statement_day(), transaction.invoice_date)
+            self._buckets[transaction.id] = bucket
         else:
-            try:
-                stmt_date = datetime.strptime(self.statement_date, "%Y-%m-%d").date()
-            except ValueError:
-                stmt_date = date.today()
+            bucket = self._buckets.pop(transaction.id)
+        aging = dict(self._aging)
+        aging[bucket] += sign * balance
+        if not self._transactions:
+            self._total_due = 0.0
+            aging = dict.fromkeys(aging, 0.0)
+        self._aging = aging
 
-        for t in self.transactions:
-            if not t.date:
-                inv_date = date.today()
-            else:
-                try:
-                    inv_date = datetime.strptime(t.date, "%Y-%m-%d").date()
-                except ValueError:
-                    inv_date = date.today()
-            days_diff = (stmt_date - inv_date).days
-            balance = t.amount - t.paid
-            if days_diff < 30:
-                current += balance
-            elif days_diff < 60:
-                days_30 += balance
-            elif days_diff < 90:
-                days_60 += balance
-            else:
-                days_90 += balance
-        return {"current": current, "30": days_30, "60": days_60, "90": days_90}
+    def _rebucket(self):
+        """Recount every row's balance against the current statement date."""
+        stmt_date = self._statement_day()
+        aging = dict.fromkeys(self._aging, 0.0)
+        buckets = {}
+        for t in rows.merged(self._transactions, self.transaction_patches):
+            buckets[t.id] = bucket = aging_bucket(stmt_date, t.invoice_date)
+            aging[bucket] += t.amount - t.paid
+        self._aging = aging
+        self._buckets = buckets
+
+    def _patch_transaction(self, transaction: Transaction):
+        """Record an edited row so only the edited rows are re-sent."""
+        self.transaction_patches[transaction.id] = transaction
+        if len(self.transaction_patches) >= rows.FOLD_AT:
+            self._fold_transactions()
+
+    def _fold_transactions(self):
+        """Fold the pending row patches back into the transactions list."""
+        if self.transaction_patches:
+            self._transactions = rows.merged(self._transactions, self.transaction_patches)
+            self.transaction_patches = {}
+            self._show_transactions()
+
+    def _show_transactions(self, offset: int | None = None):
+        """Re-send the page of transactions starting at ``offset`` (default: the current page)."""
+        if offset is None:
+            offset = self.transactions_offset
+        self.transactions_offset = rows.page_start(offset, len(self._transactions))
+        self.transactions = rows.page(self._transactions, self.transactions_offset)
+
+    @rx.var
+    def transaction_count(self) -> int:
+        return len(self._transactions)
 
     @rx.event
-    def set_field(self, field: str, value: str):
-        setattr(self, field, value)
+    def page_transactions(self, step: int):
+        """Show the previous (-1) or next (1) page of transactions."""
+        self._show_transactions(self.transactions_offset + step * rows.PAGE_SIZE)
 
     @rx.event
     def add_transaction(self):
-        self.transactions.append(
+        self._fold_transactions()
+        self._transactions.append(
             Transaction(
-                id=str(uuid.uuid4()),
+                id=rows.new_id(),
                 date=datetime.now().strftime("%Y-%m-%d"),
                 invoice_no="",
                 reference="",
@@ -113,206 +174,77 @@ class StatementState(rx.State):
                 paid=0.0,
             )
         )
+        self._track_transaction(self._transactions[-1], 1)
+        self._show_transactions(len(self._transactions) - 1)
 
     @rx.event
     def update_transaction(self, idx: int, field: str, value: Any):
-        if 0 <= idx < len(self.transactions):
-            transaction = self.transactions[idx]
-            if field in ["amount", "paid"]:
-                try:
-                    if value == "" or value is None:
-                        val = 0.0
-                    else:
-                        val = float(value)
-                    setattr(transaction, field, val)
-                except ValueError as e:
-                    logging.warning(f"Invalid value for field {field}: {value}")
-                    # Don't update state on invalid input
-            else:
-                setattr(transaction, field, value)
-            
-            # Create a new list to ensure Reflex detects the change correctly
-            self.transactions = list(self.transactions)
+        self._update_transaction(idx, {field: value})
+
+    @rx.event
+    def update_transaction_fields(self, idx: int, fields: dict[str, Any]):
+        """Apply several fields of one row in one event (e.g. a pasted row)."""
+        self._update_transaction(idx, fields)
+
+    def _update_transaction(self, idx: int, fields: dict[str, Any]):
+        if 0 <= idx < len(self._transactions):
+            transaction = rows.checkout(self._transactions, self.transaction_patches, idx)
+            before = dataclasses.replace(transaction)
+            for field, value in fields.items():
+                if field in ["amount", "paid"]:
+                    try:
+                        if value == "" or value is None:
+                            val = 0.0
+                        else:
+                            val = float(value)
+                        setattr(transaction, field, val)
+                    except ValueError as e:
+                        logging.warning(f"Invalid value for field {field}: {value}")
+                        # Don't update state on invalid input
+                else:
+                    setattr(transaction, field, value)
+            # Editing a reference or description leaves the summary alone
+            if (transaction.amount, transaction.paid, transaction.date) != (
+                before.amount,
+                before.paid,
+                before.date,
+            ):
+                self._track_transaction(before, -1)
+                self._track_transaction(transaction, 1)
+            self._patch_transaction(transaction)
 
     @rx.event
     def remove_transaction(self, idx: int):
-        if 0 <= idx < len(self.transactions):
-            self.transactions.pop(idx)
-            # Create a new list to ensure Reflex detects the change correctly
-            self.transactions = list(self.transactions)
+        if 0 <= idx < len(self._transactions):
+            self._fold_transactions()
+            self._track_transaction(self._transactions.pop(idx), -1)
+            self._show_transactions()
+
+    def _document_payload(self) -> dict[str, Any]:
+        payload = {
+            field: getattr(self, field)
+            for field in statement_render.DEFAULTS
+            if field != "transactions"
+        }
+        payload["transactions"] = [
+            dataclasses.asdict(row) for row in rows.merged(self._transactions, self.transaction_patches)
+        ]
+        return payload
 
     @rx.event
     async def export_pdf(self):
         self.is_loading = True
-        filename = f"Statement_{self.account_number}_{uuid.uuid4().hex[:6]}.pdf"
-        upload_dir = Path(".web/public")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        file_path = upload_dir / filename
+        payload = self._document_payload()
+        filename = render_filename("statement", "pdf", payload)
         try:
-            doc = SimpleDocTemplate(
-                str(file_path),
-                pagesize=letter,
-                rightMargin=30,
-                leftMargin=30,
-                topMargin=30,
-                bottomMargin=30,
-            )
-            elements = []
-            styles = getSampleStyleSheet()
-            header_data = [
-                [
-                    Paragraph(
-                        f"<b>{self.provider_name}</b><br/>{self.provider_address}<br/>{self.provider_city_state_zip}<br/>Tel: {self.provider_phone}",
-                        styles["Normal"],
-                    ),
-                    Paragraph(f"<b>ESTADO DE CUENTA</b>", styles["Heading1"]),
-                ]
-            ]
-            t_header = Table(header_data, colWidths=[4 * inch, 3 * inch])
-            t_header.setStyle(
-                TableStyle(
-                    [
-                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                        ("ALIGN", (1, 0), (1, 0), "RIGHT"),
-                    ]
-                )
-            )
-            elements.append(t_header)
-            elements.append(Spacer(1, 20))
-            info_data = [
-                [
-                    Paragraph(
-                        f"<b>{self.client_name}</b><br/>{self.client_address}<br/>{self.client_city} {self.client_state}<br/>{self.client_country}",
-                        styles["Normal"],
-                    ),
-                    Table(
-                        [
-                            ["NÚMERO DE CUENTA", self.account_number],
-                            ["TÉRMINOS", self.terms],
-                            ["FECHA ESTADO", self.statement_date],
-                        ],
-                        style=TableStyle(
-                            [
-                                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                                ("BACKGROUND", (0, 0), (0, -1), colors.lightgrey),
-                                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                                ("PADDING", (0, 0), (-1, -1), 4),
-                            ]
-                        ),
-                    ),
-                ]
-            ]
-            t_info = Table(info_data, colWidths=[4.5 * inch, 2.5 * inch])
-            t_info.setStyle(TableStyle([("VALIGN", (0, 0), (-1, -1), "TOP")]))
-            elements.append(t_info)
-            elements.append(Spacer(1, 20))
-            elements.append(
-                Paragraph(
-                    f"A CONTINUACION LE MOSTRAMOS UNA LISTA DE NOTAS DE ENTREGA PENDIENTES DE PAGO A {self.statement_date}",
-                    styles["Normal"],
-                )
-            )
-            elements.append(Spacer(1, 10))
-            trans_data = [
-                [
-                    "FECHA",
-                    "NOTA DE ENTREGA",
-                    "CUENTA",
-                    "DESCRIPCIÓN",
-                    "CANTIDAD",
-                    "PAGADO",
-                    "DEBIDO",
-                ]
-            ]
-            for t in self.transactions:
-                trans_data.append(
-                    [
-                        t.date,
-                        t.invoice_no,
-                        t.reference,
-                        Paragraph(t.description, styles["Normal"]),
-                        f"{t.amount:,.2f}",
-                        f"{t.paid:,.2f}",
-                        f"{t.amount - t.paid:,.2f}",
-                    ]
-                )
-            t_trans = Table(
-                trans_data,
-                colWidths=[
-                    1 * inch,
-                    0.8 * inch,
-                    1 * inch,
-                    2.2 * inch,
-                    0.8 * inch,
-                    0.8 * inch,
-                    0.9 * inch,
-                ],
-            )
-            t_trans.setStyle(
-                TableStyle(
-                    [
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                        ("FONTSIZE", (0, 0), (-1, -1), 8),
-                        ("ALIGN", (4, 1), (-1, -1), "RIGHT"),
-                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                        ("PADDING", (0, 0), (-1, -1), 4),
-                    ]
-                )
-            )
-            elements.append(t_trans)
-            elements.append(Spacer(1, 20))
-            aging = self.aging_buckets
-            aging_data = [
-                ["CURRENCY", "-30", "+30", "+60", "+90", "TOTAL DEBIDO"],
-                [
-                    "USD",
-                    f"{aging['current']:,.2f}",
-                    f"{aging['30']:,.2f}",
-                    f"{aging['60']:,.2f}",
-                    f"{aging['90']:,.2f}",
-                    f"{self.total_due:,.2f}",
-                ],
-            ]
-            t_aging = Table(
-                aging_data,
-                colWidths=[
-                    1 * inch,
-                    1 * inch,
-                    1 * inch,
-                    1 * inch,
-                    1 * inch,
-                    1.5 * inch,
-                ],
+            pdf_data = await render_async(
+                "statement", "pdf", payload, session=self.router.session.client_token
             )
-            t_aging.setStyle(
-                TableStyle(
-                    [
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                        ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
-                        ("FONTSIZE", (0, 0), (-1, -1), 9),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ]
-                )
-            )
-            elements.append(t_aging)
-            doc.build(elements)
             self.is_loading = False
-            if not file_path.exists():
-                raise FileNotFoundError(f"PDF file was not created: {file_path}")
-
-            # Read file data and pass directly to download
-            with open(file_path, "rb") as f:
-                pdf_data = f.read()
-
-            # Clean up temporary file
-            try:
-                file_path.unlink()
-            except Exception as e:
-                logging.warning(f"Could not delete temporary file: {e}")
-
             return rx.download(data=pdf_data, filename=filename)
+        except Overloaded as e:
+            self.is_loading = False
+            return rx.toast.warning(str(e))
         except Exception as e:
             self.is_loading = False
             logging.exception(f"PDF Generation Error: {e}")
@@ -321,81 +253,18 @@ class StatementState(rx.State):
     @rx.event
     async def export_excel(self):
         self.is_loading = True
-        filename = f"Statement_{self.account_number}_{uuid.uuid4().hex[:6]}.xlsx"
-        upload_dir = Path(".web/public")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        file_path = upload_dir / filename
+        payload = self._document_payload()
+        filename = render_filename("statement", "xlsx", payload)
         try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Estado de Cuenta"
-            ws["A1"] = self.provider_name
-            ws["A2"] = self.provider_address
-            ws["A3"] = self.provider_city_state_zip
-            ws["E1"] = "ESTADO DE CUENTA"
-            ws["E1"].font = Font(bold=True, size=14)
-            ws["A6"] = "CLIENTE:"
-            ws["A7"] = self.client_name
-            ws["A8"] = self.client_address
-            ws["A9"] = f"{self.client_city} {self.client_state}"
-            ws["A10"] = self.client_country
-            ws["E6"] = "NÚMERO DE CUENTA"
-            ws["F6"] = self.account_number
-            ws["E7"] = "TÉRMINOS"
-            ws["F7"] = self.terms
-            ws["E8"] = "FECHA"
-            ws["F8"] = self.statement_date
-            headers = [
-                "FECHA",
-                "NOTA DE ENTREGA",
-                "CUENTA",
-                "DESCRIPCIÓN",
-                "CANTIDAD",
-                "PAGADO",
-                "DEBIDO",
-            ]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=13, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(
-                    start_color="CCCCCC", end_color="CCCCCC", fill_type="solid"
-                )
-            row = 14
-            for t in self.transactions:
-                ws.cell(row=row, column=1, value=t.date)
-                ws.cell(row=row, column=2, value=t.invoice_no)
-                ws.cell(row=row, column=3, value=t.reference)
-                ws.cell(row=row, column=4, value=t.description)
-                ws.cell(row=row, column=5, value=t.amount)
-                ws.cell(row=row, column=6, value=t.paid)
-                ws.cell(row=row, column=7, value=t.amount - t.paid)
-                row += 1
-            row += 2
-            aging = self.aging_buckets
-            ws.cell(row=row, column=1, value="AGING")
-            ws.cell(row=row + 1, column=1, value="Current")
-            ws.cell(row=row + 1, column=2, value=aging["current"])
-            ws.cell(row=row + 1, column=3, value="30 Days")
-            ws.cell(row=row + 1, column=4, value=aging["30"])
-            ws.cell(row=row + 1, column=5, value="60 Days")
-            ws.cell(row=row + 1, column=6, value=aging["60"])
-            ws.cell(row=row + 1, column=7, value="Total Due")
-            ws.cell(row=row + 1, column=8, value=self.total_due)
-            wb.save(file_path)
+            excel_data = await render_async(
+                "statement", "xlsx", payload, session=self.router.session.client_token
+            )
             self.is_loading = False
-
-            # Read file data and pass directly to download
-            with open(file_path, "rb") as f:
-                excel_data = f.read()
-
-            # Clean up temporary file
-            try:
-                file_path.unlink()
-            except Exception as e:
-                logging.warning(f"Could not delete temporary file: {e}")
-
             return rx.download(data=excel_data, filename=filename)
+        except Overloaded as e:
+            self.is_loading = False
+            return rx.toast.warning(str(e))
         except Exception as e:
             self.is_loading = False
             logging.exception(f"Excel Generation Error: {e}")
-            return rx.toast.error(f"Error generating Excel: {str(e)}")
\ No newline at end of file
+            return rx.toast.error(f"Error generating Excel: {str(e)}")
@@ -1,20 +1,17 @@
 import reflex as rx
-from typing import Any
+from typing import Any, ClassVar
 from datetime import datetime
-from pathlib import Path
-import uuid
+import dataclasses
 import logging
-from pydantic import BaseModel
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from app.render import filename as render_filename, warehouse_receipt as warehouse_receipt_render
+from app.render.admission import Overloaded
+from app.render.pool import render_async
+from app.states import rows
+from app.states.snapshot import CompactRows, RowSet
 
 
-class PackageDimension(BaseModel):
+@dataclasses.dataclass(slots=True, kw_only=True)
+class PackageDimension:
     id: str
     bultos: int = 1
     largo: float = 0.0  # Length in inches
@@ -26,7 +23,7 @@ class PackageDimension(BaseModel):
     referencia: str = ""
 
 
-class WarehouseReceiptState(rx.State):
+class WarehouseReceiptState(CompactRows, rx.State):
     """State for the Warehouse Receipt document."""
 
     is_loading: bool = False
@@ -57,21 +54,32 @@ class WarehouseReceiptState(rx.State):
     descripcion: str = ""
 
     # Package dimensions table
-    dimensions: list[PackageDimension] = []
+    # Full list of dimensions; the client only gets the current page,
+    # by column, in dimensions
+    _dimensions: list[PackageDimension] = []
+    dimensions: dict[str, list] = {}
+    dimensions_offset: int = 0
+    # Rows edited since dimensions was last re-sent, by id (see app.states.rows)
+    dimension_patches: dict[str, PackageDimension] = {}
+    # Stored by column when the state is persisted (see app.states.snapshot)
+    _row_sets: ClassVar[tuple[RowSet, ...]] = (
+        RowSet(
+            PackageDimension,
+            "_dimensions",
+            "dimension_patches",
+            "dimensions",
+            "dimensions_offset",
+        ),
+    )
 
     # Legal disclaimer
-    legal_disclaimer: str = (
-        "Nuestra empresa no se hace responsable por pérdida o daños totales y/o parciales de mercancía "
-        "que NO SE ENCUENTRE ASEGURADA. El seguro únicamente aplicará bajo previa inspección de "
-        "los artículos y aprobación de los mismos. Igualmente, Nosglobal Logistic no se hace responsable de "
-        "paquetes perdidos en tránsito desde su proveedor hasta nuestros almacenes, ni de paquetes que "
-        "no contengan el servicio de firma requerida. Por tal razón, recomendamos que sus envíos sean "
-        "manejados por empresas que puedan proveerle un número de rastreo (tracking) para de este "
-        "modo tener un mayor control de su mercancía. Les recomendamos los pesos promedio por caja "
-        "es de un máximo de 90 Lbs. Cajas que sobrepase los pesos permitidos, La Compañía no se hace "
-        "responsable por daños en el manejo de su carga. Los equipos electrónicos como Televisores se "
-        "reciben solamente como mercancía general."
-    )
+    legal_disclaimer: str = warehouse_receipt_render.LEGAL_DISCLAIMER
+
+    # Running sums over the dimensions, kept in step by the dimension events
+    # so the summary never re-reads the whole list.
+    _total_bultos: int = 0
+    _peso_bruto: float = 0.0
+    _volumen: float = 0.0
 
     @rx.event
     def on_load(self):
@@ -80,19 +88,36 @@ class WarehouseReceiptState(rx.State):
             self.receipt_date = datetime.now().strftime("%Y-%m-%d")
 
     @rx.var
-    def total_bultos(self) -> int:
-        return sum([d.bultos for d in self.dimensions])
-
-    @rx.var
-    def calculated_peso_bruto(self) -> float:
-        return sum([d.pounds for d in self.dimensions])
-
-    @rx.var
-    def calculated_volumen(self) -> float:
-        return sum([d.cubic_feet for d in self.dimensions])
+    def summary(self) -> dict[str, float]:
+        """Package count, weight and volume, keyed like warehouse_totals."""
+        return {
+            "total_bultos": self._total_bultos,
+            "calculated_peso_bruto": self._peso_bruto,
+            "calculated_volumen": self._volumen,
+        }
+
+    def _track_dimension(self, dimension: PackageDimension, sign: int):
+        """Add (sign=1) or remove (sign=-1) a dimension's contribution to the sums."""
+        self._total_bultos += sign * dimension.bultos
+        self._peso_bruto += sign * dimension.pounds
+        self._volumen += sign * dimension.cubic_feet
+        if not self._dimensions:
+            self._peso_bruto = self._volumen = 0.0
 
     @rx.event
     def set_field(self, field: str, value: str):
+        self._set_field(field, value)
+
+    @rx.event
+    def set_fields(self, fields: dict[str, Any]):
+        """Apply several fields in one event (autofill, paste, API prefill)."""
+        for field, value in fields.items():
+            if field in warehouse_receipt_render.DEFAULTS and field != "dimensions":
+                self._set_field(field, value)
+            else:
+                logging.warning(f"Ignoring unknown field {field}")
+
+    def _set_field(self, field: str, value: Any):
         if hasattr(self, field):
             if field in ["peso_bruto", "volumen", "peso_tasable"]:
                 try:
@@ -103,11 +128,41 @@ class WarehouseReceiptState(rx.State):
             else:
                 setattr(self, field, value)
 
+    def _patch_dimension(self, dimension: PackageDimension):
+        """Record an edited row so only the edited rows are re-sent."""
+        self.dimension_patches[dimension.id] = dimension
+        if len(self.dimension_patches) >= rows.FOLD_AT:
+            self._fold_dimensions()
+
+    def _fold_dimensions(self):
+        """Fold the pending row patches back into the dimensions list."""
+        if self.dimension_patches:
+            self._dimensions = rows.merged(self._dimensions, self.dimension_patches)
+            self.dimension_patches = {}
+            self._show_dimensions()
+
+    def _show_dimensions(self, offset: int | None = None):
+        """Re-send the page of dimensions starting at ``offset`` (default: the current page)."""
+        if offset is None:
+            offset = self.dimensions_offset
+        self.dimensions_offset = rows.page_start(offset, len(self._dimensions))
+        self.dimensions = rows.page(self._dimensions, self.dimensions_offset)
+
+    @rx.var
+    def dimension_count(self) -> int:
+        return len(self._dimensions)
+
+    @rx.event
+    def page_dimensions(self, step: int):
+        """Show the previous (-1) or next (1) page of dimensions."""
+        self._show_dimensions(self.dimensions_offset + step * rows.PAGE_SIZE)
+
     @rx.event
     def add_dimension(self):
-        self.dimensions.append(
+        self._fold_dimensions()
+        self._dimensions.append(
             PackageDimension(
-                id=str(uuid.uuid4()),
+                id=rows.new_id(),
                 bultos=1,
                 largo=0.0,
                 ancho=0.0,
@@ -118,266 +173,96 @@ class WarehouseReceiptState(rx.State):
                 referencia="",
             )
         )
+        self._track_dimension(self._dimensions[-1], 1)
+        self._show_dimensions(len(self._dimensions) - 1)
 
     @rx.event
     def remove_dimension(self, idx: int):
-        if 0 <= idx < len(self.dimensions):
-            self.dimensions.pop(idx)
-            # Create a new list to ensure Reflex detects the change correctly
-            self.dimensions = list(self.dimensions)
+        if 0 <= idx < len(self._dimensions):
+            self._fold_dimensions()
+            self._track_dimension(self._dimensions.pop(idx), -1)
+            self._show_dimensions()
 
     @rx.event
     def update_dimension(self, idx: int, field: str, value: Any):
-        if 0 <= idx < len(self.dimensions):
-            dimension = self.dimensions[idx]
-            if field in ["bultos", "largo", "ancho", "alto", "pounds", "pt"]:
-                try:
-                    if value == "" or value is None:
-                        val = 0.0
-                    else:
-                        val = float(value)
-                    
-                    if field == "bultos":
-                        dimension.bultos = int(val)
-                    elif field == "largo":
-                        dimension.largo = val
-                    elif field == "ancho":
-                        dimension.ancho = val
-                    elif field == "alto":
-                        dimension.alto = val
-                    elif field == "pounds":
-                        dimension.pounds = val
-                    elif field == "pt":
-                        dimension.pt = val
-
-                    # Calculate cubic feet automatically
-                    if dimension.largo > 0 and dimension.ancho > 0 and dimension.alto > 0:
-                        dimension.cubic_feet = (
-                            dimension.largo * dimension.ancho * dimension.alto
-                        ) / 1728  # Convert cubic inches to cubic feet
-                    else:
-                        dimension.cubic_feet = 0.0
-                        
-                except ValueError as e:
-                    logging.warning(f"Invalid value for field {field}: {value}")
-                    # Don't update state on invalid input to prevent UI glitches,
-                    # but allow the user to correct it.
-            elif field == "referencia":
-                dimension.referencia = str(value)
+        self._update_dimension(idx, {field: value})
 
-            # Create a new list to ensure Reflex detects the change correctly
-            # This is critical to prevent "NotFoundError: removeChild" errors
-            self.dimensions = list(self.dimensions)
+    @rx.event
+    def update_dimension_fields(self, idx: int, fields: dict[str, Any]):
+        """Apply several fields of one row in one event (e.g. a pasted row)."""
+        self._update_dimension(idx, fields)
+
+    def _update_dimension(self, idx: int, fields: dict[str, Any]):
+        if 0 <= idx < len(self._dimensions):
+            dimension = rows.checkout(self._dimensions, self.dimension_patches, idx)
+            before = dataclasses.replace(dimension)
+            for field, value in fields.items():
+                if field in ["bultos", "largo", "ancho", "alto", "pounds", "pt"]:
+                    try:
+                        if value == "" or value is None:
+                            val = 0.0
+                        else:
+                            val = float(value)
+
+                        if field == "bultos":
+                            dimension.bultos = int(val)
+                        elif field == "largo":
+                            dimension.largo = val
+                        elif field == "ancho":
+                            dimension.ancho = val
+                        elif field == "alto":
+                            dimension.alto = val
+                        elif field == "pounds":
+                            dimension.pounds = val
+                        elif field == "pt":
+                            dimension.pt = val
+
+                        # Calculate cubic feet automatically
+                        if dimension.largo > 0 and dimension.ancho > 0 and dimension.alto > 0:
+                            dimension.cubic_feet = (
+                                dimension.largo * dimension.ancho * dimension.alto
+                            ) / 1728  # Convert cubic inches to cubic feet
+                        else:
+                            dimension.cubic_feet = 0.0
+
+                    except ValueError as e:
+                        logging.warning(f"Invalid value for field {field}: {value}")
+                        # Don't update state on invalid input to prevent UI glitches,
+                        # but allow the user to correct it.
+                elif field == "referencia":
+                    dimension.referencia = str(value)
+            # Only re-sum (and re-send the summary) when a summed field changed
+            summed = ("bultos", "pounds", "cubic_feet")
+            if any(getattr(dimension, f) != getattr(before, f) for f in summed):
+                self._track_dimension(before, -1)
+                self._track_dimension(dimension, 1)
+            self._patch_dimension(dimension)
+
+    def _document_payload(self) -> dict[str, Any]:
+        payload = {
+            field: getattr(self, field)
+            for field in warehouse_receipt_render.DEFAULTS
+            if field != "dimensions"
+        }
+        payload["dimensions"] = [
+            dataclasses.asdict(row) for row in rows.merged(self._dimensions, self.dimension_patches)
+        ]
+        return payload
 
     @rx.event
     async def export_pdf(self):
         self.is_loading = True
-        filename = f"ReciboAlmacen_{self.receipt_number}_{uuid.uuid4().hex[:6]}.pdf"
-        upload_dir = Path(".web/public")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        file_path = upload_dir / filename
+        payload = self._document_payload()
+        filename = render_filename("warehouse_receipt", "pdf", payload)
         try:
-            doc = SimpleDocTemplate(
-                str(file_path),
-                pagesize=letter,
-                rightMargin=40,
-                leftMargin=40,
-                topMargin=40,
-                bottomMargin=40,
-            )
-            elements = []
-            styles = getSampleStyleSheet()
-
-            # Header with logo support
-            logo_path = Path(".web/public") / self.company_logo_url.lstrip("/")
-            left_content = []
-
-            # Add logo if it exists
-            if logo_path.exists():
-                try:
-                    logo = Image(str(logo_path), width=0.8*inch, height=0.8*inch)
-                    left_content.append([logo])
-                except Exception as e:
-                    logging.warning(f"Could not load logo: {e}")
-
-            # Add company name
-            left_content.append([Paragraph(f"<b>{self.company_name}</b>", styles["Normal"])])
-
-            # Create nested table for left column if logo exists
-            if len(left_content) > 1:
-                left_table = Table(left_content, colWidths=[1.5 * inch])
-                left_table.setStyle(TableStyle([
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                ]))
-                left_cell = left_table
-            else:
-                left_cell = Paragraph(f"<b>{self.company_name}</b>", styles["Normal"])
-
-            header_data = [
-                [
-                    left_cell,
-                    Paragraph(
-                        f"<font size=18><b>RECIBO DE ALMACÉN</b></font><br/><br/>"
-                        f"<font size=16><b>{self.receipt_number}</b></font><br/><br/>"
-                        f"<font size=12><b>{self.warehouse_location}</b></font>",
-                        styles["Normal"],
-                    ),
-                ]
-            ]
-            t_header = Table(header_data, colWidths=[4 * inch, 3 * inch])
-            t_header.setStyle(
-                TableStyle(
-                    [
-                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                        ("ALIGN", (1, 0), (1, 0), "RIGHT"),
-                    ]
-                )
-            )
-            elements.append(t_header)
-            elements.append(Spacer(1, 30))
-
-            # Details section
-            details_data = [
-                ["Fecha", self.receipt_date, "Oficina", self.oficina],
-                ["Remitente", self.remitente, "Referencia", self.referencia],
-                ["Destinatario", self.destinatario, "No. Pedido", self.no_pedido],
-                ["Entregado por", self.entregado_por, "Factura", self.factura],
-                ["Tracking", self.tracking_number, "", ""],
-                ["Descripción", self.descripcion, "", ""],
-            ]
-            t_details = Table(
-                details_data, colWidths=[1.5 * inch, 2 * inch, 1.5 * inch, 2 * inch]
-            )
-            t_details.setStyle(
-                TableStyle(
-                    [
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                        ("BACKGROUND", (0, 0), (-1, -1), colors.Color(0.96, 0.96, 0.96)),  # Light grey background
-                        ("FONTSIZE", (0, 0), (-1, -1), 9),
-                        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                        ("FONTNAME", (2, 0), (2, -1), "Helvetica-Bold"),
-                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                        ("PADDING", (0, 0), (-1, -1), 6),
-                    ]
-                )
-            )
-            elements.append(t_details)
-            elements.append(Spacer(1, 30))
-
-            # Dimensions table
-            elements.append(Paragraph("<b>Dimensiones de Paquetes</b>", styles["Heading4"]))
-            elements.append(Spacer(1, 10))
-
-            dim_headers = [
-                "Bultos",
-                "Largo",
-                "Ancho",
-                "Alto",
-                "Pounds",
-                "Cubic Feet",
-                "PT",
-                "Referencia",
-            ]
-            dim_data = [dim_headers]
-            for d in self.dimensions:
-                dim_data.append(
-                    [
-                        str(d.bultos),
-                        f"{d.largo:.1f}" if d.largo > 0 else "X",
-                        f"{d.ancho:.1f}" if d.ancho > 0 else "X",
-                        f"{d.alto:.1f}" if d.alto > 0 else "X",
-                        f"{d.pounds:.1f} lbs",
-                        f"{d.cubic_feet:.3f}",
-                        str(d.pt) if d.pt > 0 else "",
-                        d.referencia,
-                    ]
-                )
-            t_dimensions = Table(
-                dim_data,
-                colWidths=[
-                    0.6 * inch,
-                    0.7 * inch,
-                    0.7 * inch,
-                    0.7 * inch,
-                    0.9 * inch,
-                    1 * inch,
-                    0.6 * inch,
-                    1.3 * inch,
-                ],
-            )
-            t_dimensions.setStyle(
-                TableStyle(
-                    [
-                        # Remove full grid, use only horizontal lines for row separation
-                        ("LINEBELOW", (0, 0), (-1, 0), 1, colors.grey),  # Bold line under header
-                        ("LINEBELOW", (0, 1), (-1, -1), 0.25, colors.Color(0.9, 0.9, 0.9)),  # Light lines under rows
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                        ("FONTSIZE", (0, 0), (-1, -1), 9),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                        ("PADDING", (0, 0), (-1, -1), 6),
-                    ]
-                )
-            )
-            elements.append(t_dimensions)
-            elements.append(Spacer(1, 30))
-
-            # Archive section
-            elements.append(Paragraph("<b>Archivo</b>", styles["Heading4"]))
-            elements.append(Spacer(1, 5))
-
-            # Create a styled box for the archive message
-            archive_data = [["No se han encontrado registros"]]
-            t_archive = Table(archive_data, colWidths=[7 * inch])
-            t_archive.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, -1), colors.Color(0.96, 0.96, 0.96)),
-                        ("FONTSIZE", (0, 0), (-1, -1), 9),
-                        ("TEXTCOLOR", (0, 0), (-1, -1), colors.Color(0.5, 0.5, 0.5)),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("PADDING", (0, 0), (-1, -1), 8),
-                        ("BOX", (0, 0), (-1, -1), 0.5, colors.Color(0.85, 0.85, 0.85)),
-                    ]
-                )
-            )
-            elements.append(t_archive)
-            elements.append(Spacer(1, 30))
-
-            # Legal disclaimer with top border
-            disclaimer_data = [[Paragraph(f"<font size=7>{self.legal_disclaimer}</font>", styles["Normal"])]]
-            t_disclaimer = Table(disclaimer_data, colWidths=[7 * inch])
-            t_disclaimer.setStyle(
-                TableStyle(
-                    [
-                        ("LINEABOVE", (0, 0), (-1, 0), 1, colors.Color(0.85, 0.85, 0.85)),
-                        ("TOPPADDING", (0, 0), (-1, -1), 15),
-                        ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                        ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                    ]
-                )
+            pdf_data = await render_async(
+                "warehouse_receipt", "pdf", payload, session=self.router.session.client_token
             )
-            elements.append(t_disclaimer)
-
-            doc.build(elements)
             self.is_loading = False
-            if not file_path.exists():
-                raise FileNotFoundError(f"PDF file was not created: {file_path}")
-
-            # Read file data and pass directly to download
-            with open(file_path, "rb") as f:
-                pdf_data = f.read()
-
-            # Clean up temporary file
-            try:
-                file_path.unlink()
-            except Exception as e:
-                logging.warning(f"Could not delete temporary file: {e}")
-
             return rx.download(data=pdf_data, filename=filename)
+        except Overloaded as e:
+            self.is_loading = False
+            return rx.toast.warning(str(e))
         except Exception as e:
             self.is_loading = False
             logging.exception(f"PDF Generation Error: {e}")
@@ -386,124 +271,17 @@ class WarehouseReceiptState(rx.State):
     @rx.event
     async def export_excel(self):
         self.is_loading = True
-        filename = f"ReciboAlmacen_{self.receipt_number}_{uuid.uuid4().hex[:6]}.xlsx"
-        upload_dir = Path(".web/public")
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        file_path = upload_dir / filename
+        payload = self._document_payload()
+        filename = render_filename("warehouse_receipt", "xlsx", payload)
         try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Recibo de Almacen"
-
-            title_font = Font(bold=True, size=16)
-            header_font = Font(bold=True)
-            gray_fill = PatternFill(
-                start_color="EEEEEE", end_color="EEEEEE", fill_type="solid"
+            excel_data = await render_async(
+                "warehouse_receipt", "xlsx", payload, session=self.router.session.client_token
             )
-
-            # Header
-            ws["A1"] = self.company_name
-            ws["A1"].font = title_font
-            ws["E1"] = f"RECIBO DE ALMACÉN {self.receipt_number}"
-            ws["E1"].font = title_font
-            ws["E2"] = self.warehouse_location
-            ws["E2"].font = header_font
-
-            # Summary
-            ws["A4"] = "Bultos"
-            ws["B4"] = "Peso Bruto"
-            ws["C4"] = "Volumen"
-            ws["D4"] = "Peso Tasable"
-            for cell in ["A4", "B4", "C4", "D4"]:
-                ws[cell].font = header_font
-                ws[cell].fill = gray_fill
-
-            ws["A5"] = self.total_bultos
-            ws["B5"] = f"{self.calculated_peso_bruto:.2f} pound(s)"
-            ws["C5"] = f"{self.calculated_volumen:.3f} cubic feet"
-            ws["D5"] = f"{self.peso_tasable:.2f} pound(s)"
-
-            # Details
-            row = 7
-            details = [
-                ["Fecha", self.receipt_date],
-                ["Oficina", self.oficina],
-                ["Remitente", self.remitente],
-                ["Referencia", self.referencia],
-                ["Destinatario", self.destinatario],
-                ["No. Pedido", self.no_pedido],
-                ["Entregado por", self.entregado_por],
-                ["Tracking", self.tracking_number],
-                ["Factura", self.factura],
-                ["Descripción", self.descripcion],
-            ]
-            for label, value in details:
-                ws.cell(row=row, column=1, value=label).font = header_font
-                ws.cell(row=row, column=2, value=value)
-                row += 1
-
-            # Dimensions table
-            row += 2
-            headers = [
-                "Bultos",
-                "Largo",
-                "Ancho",
-                "Alto",
-                "Pounds",
-                "Cubic Feet",
-                "PT",
-                "Referencia",
-            ]
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=row, column=col, value=header)
-                cell.font = header_font
-                cell.fill = gray_fill
-
-            row += 1
-            for d in self.dimensions:
-                ws.cell(row=row, column=1, value=d.bultos)
-                ws.cell(
-                    row=row, column=2, value=d.largo if d.largo > 0 else "X"
-                )
-                ws.cell(
-                    row=row, column=3, value=d.ancho if d.ancho > 0 else "X"
-                )
-                ws.cell(
-                    row=row, column=4, value=d.alto if d.alto > 0 else "X"
-                )
-                ws.cell(row=row, column=5, value=d.pounds)
-                ws.cell(row=row, column=6, value=d.cubic_feet)
-                ws.cell(row=row, column=7, value=d.pt)
-                ws.cell(row=row, column=8, value=d.referencia)
-                row += 1
-
-            # Archive section
-            row += 2
-            ws.cell(row=row, column=1, value="ARCHIVO:").font = header_font
-            row += 1
-            ws.cell(row=row, column=1, value="No se han encontrado registros")
-
-            # Adjust column widths
-            ws.column_dimensions["A"].width = 20
-            ws.column_dimensions["B"].width = 30
-            ws.column_dimensions["C"].width = 15
-            ws.column_dimensions["D"].width = 15
-            ws.column_dimensions["E"].width = 25
-
-            wb.save(file_path)
             self.is_loading = False
-
-            # Read file data and pass directly to download
-            with open(file_path, "rb") as f:
-                excel_data = f.read()
-
-            # Clean up temporary file
-            try:
-                file_path.unlink()
-            except Exception as e:
-                logging.warning(f"Could not delete temporary file: {e}")
-
             return rx.download(data=excel_data, filename=filename)
+        except Overloaded as e:
+            self.is_loading = False
+            return rx.toast.warning(str(e))
         except Exception as e:
             self.is_loading = False
             logging.exception(f"Excel Generation Error: {e}")
@@ -0,0 +1,59 @@
+"""Admission control for pool renders."""
+
+import asyncio
+
+import pytest
+
+from app.render.admission import BATCH, Admission, Overloaded
+
+
+def test_queue_limit_rejects_interactive_but_not_batch():
+    async def main():
+        admission = Admission(max_running=1, max_queue=2, max_per_session=5)
+        running = admission.reserve()
+        assert running.done()
+        queued = [admission.reserve(), admission.reserve()]
+        with pytest.raises(Overloaded):
+            admission.reserve()
+        assert not admission.reserve(priority=BATCH).done()
+        assert admission.waiting == 3
+        assert admission.snapshot()["rejected"] == 1
+        admission.release(running)
+        assert queued[0].done() and not queued[1].done()
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiters_free_their_place_in_the_queue():
+    async def main():
+        admission = Admission(max_running=1, max_queue=2, max_per_session=5)
+        running = admission.reserve()
+        waiters = [admission.reserve(), admission.reserve()]
+        with pytest.raises(Overloaded):
+            admission.reserve()
+        for waiter in waiters:
+            waiter.cancel()
+            admission.release(waiter)
+        assert admission.waiting == 0
+        turn = admission.reserve()
+        assert admission.waiting == 1
+        # The cancelled turns are skipped when the running render finishes
+        admission.release(running)
+        assert turn.done() and not turn.cancelled()
+        assert admission.running == 1
+        assert admission.waiting == 0
+
+    asyncio.run(main())
+
+
+def test_per_session_limit():
+    async def main():
+        admission = Admission(max_running=4, max_queue=4, max_per_session=1)
+        turn = admission.reserve("ana")
+        with pytest.raises(Overloaded):
+            admission.reserve("ana")
+        admission.reserve("luis")
+        admission.release(turn, "ana")
+        admission.reserve("ana")
+
+    asyncio.run(main())
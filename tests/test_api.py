@@ -0,0 +1,68 @@
+"""Validation of the HTTP endpoints."""
+
+import io
+import json
+import zipfile
+
+import pytest
+from starlette.testclient import TestClient
+
+from app import api
+from app.render import pool
+from app.render.jobs import JobQueue
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "_job_queue", JobQueue(str(tmp_path / "jobs.sqlite3")))
+    return TestClient(api.api)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"type": "quotation", "data": "not a dict"},
+        {"type": "quotation", "data": {"items": [{"quantity": "x"}]}},
+        {"type": "invoice", "data": {"items": "abc"}},
+        {"type": "receipt", "data": {}},
+        ["not", "an", "object"],
+    ],
+)
+def test_submit_job_rejects_bad_payloads(client, payload):
+    response = client.post("/api/jobs", json=payload)
+    assert response.status_code == 400
+    assert response.json()["error"]
+    assert api._job_queue.depth() == 0
+
+
+def test_submit_job_queues_valid_payload(client):
+    payload = {"type": "quotation", "data": {"quote_number": "C-1", "items": [{"quantity": 2}]}}
+    response = client.post("/api/jobs", json=payload)
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    assert client.get(f"/api/jobs/{response.json()['id']}").json()["status"] == "queued"
+
+
+@pytest.fixture
+def render_pool(monkeypatch):
+    monkeypatch.setattr(pool, "RENDER_WARMUP", False)
+    yield
+    pool.shutdown()
+
+
+def test_batch_read_error_keeps_accepted_lines(client, render_pool, monkeypatch):
+    monkeypatch.setattr(api, "BATCH_MAX_LINE_BYTES", 200)
+    lines = [
+        json.dumps({"type": "invoice", "data": {"invoice_number": f"F-{i}"}}) for i in range(3)
+    ]
+    body = "\n".join(lines) + "\n" + "x" * 500
+    response = client.post("/api/render/batch", content=body)
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+        names = zf.namelist()
+        errors = zf.read("errors.txt").decode()
+    # Names end with a random suffix
+    assert sorted(name.rsplit("_", 1)[0] for name in names if name.endswith(".pdf")) == [
+        f"0000{i}_NotaDeEntrega_F-{i - 1}" for i in (1, 2, 3)
+    ]
+    assert errors == "request: NDJSON line too long"
@@ -0,0 +1,153 @@
+"""Leases of the SQLite export job queue."""
+
+import threading
+import time
+
+import pytest
+
+from app.render import jobs
+from app.render.workers import WorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return jobs.JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+
+@pytest.fixture(scope="module")
+def renderers():
+    pool = WorkerPool(1, timeout=60, prestart=True)
+    yield pool
+    pool.shutdown()
+
+
+def statement(rows):
+    transactions = [
+        {"date": "2024-05-01", "description": f"Movimiento {i}", "amount": 10} for i in range(rows)
+    ]
+    return {"account_number": "C-1", "transactions": transactions}
+
+
+def submit(queue, number="F-1"):
+    return queue.submit("invoice", "pdf", {"invoice_number": number})
+
+
+def test_submit_is_idempotent(queue):
+    job = submit(queue)
+    assert submit(queue)["id"] == job["id"]
+    assert submit(queue, "F-2")["id"] != job["id"]
+    assert queue.depth() == 2
+
+
+def test_lease_and_complete(queue):
+    job = submit(queue)
+    [leased] = queue.lease("w1")
+    assert leased["id"] == job["id"]
+    assert leased["data"] == {"invoice_number": "F-1"}
+    assert queue.lease("w2") == []
+    queue.complete(job["id"], "w1", "/tmp/nota.pdf")
+    status = queue.status(job["id"])
+    assert status["status"] == "done"
+    assert status["result_path"] == "/tmp/nota.pdf"
+    assert queue.depth() == 0
+    # A finished payload is not rendered again
+    assert submit(queue)["status"] == "done"
+
+
+def test_expired_lease_goes_to_another_worker(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "LEASE_SECONDS", 0.05)
+    job = submit(queue)
+    queue.lease("w1")
+    time.sleep(0.1)
+    [leased] = queue.lease("w2")
+    assert leased["id"] == job["id"]
+    assert leased["attempts"] == 2
+    # The first worker lost the job: it can neither renew nor complete it
+    assert not queue.renew(job["id"], "w1")
+    queue.complete(job["id"], "w1", "/tmp/stale.pdf")
+    assert queue.status(job["id"])["status"] == "running"
+
+
+def test_renew_keeps_the_lease(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "LEASE_SECONDS", 0.2)
+    job = submit(queue)
+    queue.lease("w1")
+    for _ in range(3):
+        time.sleep(0.1)
+        assert queue.renew(job["id"], "w1")
+    assert queue.lease("w2") == []
+
+
+def test_expired_lease_fails_after_max_attempts(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "LEASE_SECONDS", 0.0)
+    job = submit(queue)
+    for _ in range(jobs.MAX_ATTEMPTS):
+        assert queue.lease("w1")
+        time.sleep(0.01)
+    assert queue.lease("w1") == []
+    status = queue.status(job["id"])
+    assert status["status"] == "failed"
+    assert status["error"] == "lease expired"
+
+
+def test_fail_retries_with_backoff(queue):
+    job = submit(queue)
+    [leased] = queue.lease("w1")
+    queue.fail(job["id"], "w1", leased["attempts"], "boom")
+    status = queue.status(job["id"])
+    assert status["status"] == "queued"
+    assert status["error"] == "boom"
+    # Not available again until the backoff has passed
+    assert queue.lease("w1") == []
+
+
+
+def test_failed_attempt_is_retried_by_any_worker(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "BACKOFF_BASE_SECONDS", 0.05)
+    job = submit(queue)
+    [leased] = queue.lease("w1")
+    queue.fail(job["id"], "w1", leased["attempts"], "boom")
+    time.sleep(0.1)
+    [retried] = queue.lease("w2")
+    assert retried["id"] == job["id"]
+    assert retried["attempts"] == 2
+    queue.complete(job["id"], "w2", "/tmp/nota.pdf")
+    assert queue.status(job["id"])["status"] == "done"
+
+
+def test_run_job_writes_the_document(queue, renderers, tmp_path):
+    job = submit(queue)
+    jobs.run_job(queue, renderers, "w1", tmp_path, queue.lease("w1")[0])
+    status = queue.status(job["id"])
+    assert status["status"] == "done"
+    assert open(status["result_path"], "rb").read(4) == b"%PDF"
+
+
+def test_lease_is_renewed_while_rendering(queue, renderers, tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "LEASE_SECONDS", 0.3)
+    job = queue.submit("statement", "pdf", statement(2000))
+    [leased] = queue.lease("w1")
+    thread = threading.Thread(
+        target=jobs.run_job, args=(queue, renderers, "w1", tmp_path, leased)
+    )
+    thread.start()
+    time.sleep(0.6)
+    assert queue.lease("w2") == []
+    thread.join()
+    assert queue.status(job["id"])["status"] == "done"
+
+
+def test_render_past_its_deadline_is_killed_and_retried(queue, renderers, tmp_path, monkeypatch):
+    monkeypatch.setitem(jobs.DEADLINES, "statement", 0.2)
+    monkeypatch.setattr(jobs, "BACKOFF_BASE_SECONDS", 0.0)
+    job = queue.submit("statement", "pdf", statement(5000))
+    killed = renderers.stats["killed"]
+    started = time.monotonic()
+    jobs.run_job(queue, renderers, "w1", tmp_path, queue.lease("w1")[0])
+    assert time.monotonic() - started < 1.5
+    assert renderers.stats["killed"] == killed + 1
+    status = queue.status(job["id"])
+    assert status["status"] == "queued"
+    assert "exceeded" in status["error"]
+    # The lease was released, so the retry goes to whichever worker is free
+    assert queue.lease("w2")[0]["id"] == job["id"]
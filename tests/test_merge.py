@@ -0,0 +1,49 @@
+"""Merged PDFs with one bookmark per document."""
+
+import io
+
+from PyPDF2 import PdfReader
+from reportlab.pdfgen import canvas
+
+from app.render.merge import merge_in_parts
+
+
+def pdf(pages: int) -> bytes:
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer)
+    for page in range(pages):
+        c.drawString(72, 72, f"Página {page + 1}")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+DOCUMENTS = [(f"Doc {i}", pdf(i % 2 + 1)) for i in range(5)]
+
+
+def test_one_file_by_default(tmp_path):
+    output = tmp_path / "dia.pdf"
+    assert merge_in_parts(DOCUMENTS, output) == [(output, 5, 7)]
+    reader = PdfReader(output)
+    assert len(reader.pages) == 7
+    assert [item.title for item in reader.outline] == [title for title, _ in DOCUMENTS]
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_split_into_numbered_parts(tmp_path):
+    parts = merge_in_parts(iter(DOCUMENTS), tmp_path / "dia.pdf", max_documents=2)
+    assert parts == [
+        (tmp_path / "dia-1.pdf", 2, 3),
+        (tmp_path / "dia-2.pdf", 2, 3),
+        (tmp_path / "dia-3.pdf", 1, 1),
+    ]
+    assert [item.title for item in PdfReader(tmp_path / "dia-3.pdf").outline] == ["Doc 4"]
+
+
+def test_limit_not_reached_keeps_the_name(tmp_path):
+    output = tmp_path / "dia.pdf"
+    assert merge_in_parts(DOCUMENTS, output, max_documents=5) == [(output, 5, 7)]
+
+
+def test_nothing_to_merge(tmp_path):
+    assert merge_in_parts([], tmp_path / "dia.pdf") == []
@@ -0,0 +1,71 @@
+"""Input formats accepted by ``python -m app.render`` and the watch folder."""
+
+import io
+import json
+
+import pytest
+
+from app.render import parse_request
+from app.render.cli import iter_requests
+
+INVOICE = {"type": "invoice", "format": "pdf", "data": {"invoice_number": "F-1"}}
+RECEIPT = {"type": "warehouse_receipt", "format": "xlsx", "data": {"receipt_number": "WR-2"}}
+
+
+def payloads(text: str) -> list:
+    return list(iter_requests(io.StringIO(text)))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        json.dumps(INVOICE) + "\n" + json.dumps(RECEIPT) + "\n",
+        "\n" + json.dumps(INVOICE) + "\n\n" + json.dumps(RECEIPT),
+        json.dumps([INVOICE, RECEIPT]),
+        json.dumps([INVOICE, RECEIPT], indent=2),
+    ],
+    ids=["ndjson", "ndjson-blank-lines", "array-one-line", "array-pretty"],
+)
+def test_iter_requests_formats(text):
+    assert payloads(text) == [(INVOICE, None), (RECEIPT, None)]
+
+
+def test_iter_requests_pretty_object():
+    assert payloads(json.dumps(INVOICE, indent=2)) == [(INVOICE, None)]
+
+
+def test_iter_requests_empty():
+    assert payloads("") == []
+    assert payloads("\n  \n") == []
+
+
+def test_iter_requests_bad_ndjson_line_keeps_the_rest():
+    results = payloads(json.dumps(INVOICE) + "\n{oops\n" + json.dumps(RECEIPT) + "\n")
+    assert [payload for payload, _ in results] == [INVOICE, None, RECEIPT]
+    assert isinstance(results[1][1], json.JSONDecodeError)
+
+
+def test_iter_requests_invalid_document():
+    [(payload, error)] = payloads("[{oops")
+    assert payload is None
+    assert isinstance(error, json.JSONDecodeError)
+
+
+def test_parse_request():
+    assert parse_request(INVOICE) == ("invoice", "pdf", {"invoice_number": "F-1"})
+    assert parse_request({"type": "quotation"}) == ("quotation", "pdf", {})
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"type": "receipt"},
+        {"type": "invoice", "format": "docx"},
+        {},
+        {"type": "quotation", "data": "not a dict"},
+        {"type": "quotation", "data": [1]},
+    ],
+)
+def test_parse_request_rejects(payload):
+    with pytest.raises(ValueError):
+        parse_request(payload)
@@ -0,0 +1,106 @@
+"""Eviction of idle sessions and their restore on the next event."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.states import sessions
+from app.states.quotation_state import QuotationState
+from app.states.sessions import IdleStateManager
+
+PATH = QuotationState.get_full_name().split(".")[1:]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return IdleStateManager(
+        state=QuotationState.get_root_state(), idle_ttl=1000, store_dir=tmp_path
+    )
+
+
+async def set_client(manager, token, name):
+    async with manager.modify_state(token) as root:
+        substate = root.get_substate(PATH)
+        substate.client_name = name
+        QuotationState.add_item.fn(substate)
+
+
+async def client(manager, token):
+    async with manager.modify_state(token) as root:
+        substate = root.get_substate(PATH)
+        return substate.client_name, len(substate._items)
+
+
+def test_evict_and_restore(manager):
+    async def main():
+        await set_client(manager, "t", "Ana")
+        await manager.evict("t")
+        assert "t" not in manager.states
+        assert len(list(manager.store_dir.iterdir())) == 1
+        assert await client(manager, "t") == ("Ana", 1)
+        # The snapshot is consumed by the restore
+        assert list(manager.store_dir.iterdir()) == []
+
+    asyncio.run(main())
+
+
+def test_evict_without_store_drops_the_session(manager):
+    manager.store_dir = None
+
+    async def main():
+        await set_client(manager, "t", "Ana")
+        await manager.evict("t")
+        assert await client(manager, "t") == ("", 0)
+
+    asyncio.run(main())
+
+
+def test_touched_session_is_kept(manager):
+    async def main():
+        cutoff = time.monotonic()
+        await set_client(manager, "t", "Ana")
+        await manager.evict("t", idle_since=cutoff)
+        assert "t" in manager.states
+        assert list(manager.store_dir.iterdir()) == []
+
+    asyncio.run(main())
+
+
+def test_event_during_store_sees_the_state(manager, monkeypatch):
+    write = manager._write
+
+    def slow_write(token, data):
+        time.sleep(0.2)
+        write(token, data)
+
+    monkeypatch.setattr(manager, "_write", slow_write)
+
+    async def main():
+        await set_client(manager, "t", "Ana")
+        eviction = asyncio.create_task(manager.evict("t", idle_since=time.monotonic()))
+        await asyncio.sleep(0.05)
+        # Waits for the snapshot to be written, then finds the state in memory
+        assert await client(manager, "t") == ("Ana", 1)
+        await eviction
+        assert "t" in manager.states
+        assert list(manager.store_dir.iterdir()) == []
+
+    asyncio.run(main())
+
+
+def test_failed_store_keeps_the_session(manager, monkeypatch):
+    def broken_write(token, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(manager, "_write", broken_write)
+    errors = sessions.stats["store_errors"]
+
+    async def main():
+        await set_client(manager, "t", "Ana")
+        await manager.evict("t")
+        assert "t" in manager.states
+        assert await client(manager, "t") == ("Ana", 1)
+
+    asyncio.run(main())
+    assert sessions.stats["store_errors"] == errors + 1
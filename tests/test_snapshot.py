@@ -0,0 +1,65 @@
+"""Compact row snapshots of the document states."""
+
+import pytest
+from reflex.state import BaseState
+from reflex.utils.exceptions import StateSchemaMismatchError
+
+from app.states import snapshot
+from app.states.statebench import DOCUMENTS, build
+
+
+def rows(state):
+    return {
+        row_set.rows: (
+            list(getattr(state, row_set.rows)),
+            dict(getattr(state, row_set.patches)),
+            getattr(state, row_set.page),
+        )
+        for row_set in state._row_sets
+    }
+
+
+@pytest.mark.parametrize(
+    "state_cls, add, update, field", DOCUMENTS, ids=[d[0].__name__ for d in DOCUMENTS]
+)
+def test_round_trip(state_cls, add, update, field):
+    state = build(state_cls, add, update, field, 60)
+    assert any(getattr(state, row_set.patches) for row_set in state._row_sets)
+    loaded = BaseState._deserialize(data=state._serialize())
+    assert type(loaded) is state_cls
+    assert rows(loaded) == rows(state)
+
+
+def test_round_trip_empty():
+    state_cls, add, update, field = DOCUMENTS[0]
+    state = build(state_cls, add, update, field, 0)
+    loaded = BaseState._deserialize(data=state._serialize())
+    assert rows(loaded) == rows(state)
+
+
+def test_rows_are_stored_by_column():
+    state_cls, add, update, field = DOCUMENTS[1]
+    state = build(state_cls, add, update, field, 3)
+    packed = state.__getstate__()
+    [row_set] = state._row_sets
+    assert row_set.rows not in packed["_backend_vars"]
+    assert row_set.page not in packed
+    version, fields, _ = packed[snapshot._KEY]
+    assert version == snapshot.FORMAT
+    assert fields == [snapshot._fields(row_set.row_type)]
+
+
+def test_other_format_is_rejected(monkeypatch):
+    state_cls, add, update, field = DOCUMENTS[1]
+    data = build(state_cls, add, update, field, 3)._serialize()
+    monkeypatch.setattr(snapshot, "FORMAT", snapshot.FORMAT + 1)
+    with pytest.raises(StateSchemaMismatchError):
+        BaseState._deserialize(data=data)
+
+
+def test_changed_row_fields_are_rejected():
+    state_cls, add, update, field = DOCUMENTS[1]
+    [row_set] = state_cls._row_sets
+    columns = snapshot.pack(row_set.row_type, [])
+    with pytest.raises(StateSchemaMismatchError):
+        snapshot.unpack(row_set.row_type, ("id", "renamed"), columns)